@@ -1,38 +1,54 @@
 import os
 from flask import Flask
 from dotenv import load_dotenv
-from app.extensions import db, migrate, jwt  
-from app.config import DevelopmentConfig
-from app.routes.auth_routes import auth_bp
-from app.models import User, Ticket, Comment, AuditLog
-from app.routes.ticket import ticket_bp
-from app.routes.admin_routes import admin_bp
-from .extensions import ma
-
-
+from werkzeug.middleware.proxy_fix import ProxyFix
+from app.extensions import db, jwt, ma, migrate, response_cache, user_cache
 
 
+# Before app.config is first imported: its classes read the environment then
 load_dotenv()
 
-def create_app():
-    app = Flask(__name__)
+def create_app(test_config=None):
+    # Imported here so that importing the package (e.g. for app.extensions)
+    # does not pull in every model, schema and blueprint
+    from app import tasks  # noqa: F401  (registers the built-in jobs)
+    from app.commands import audit_cli, jobs_cli, tickets_cli
+    from app.db_routing import init_read_replica
+    from app.engine_tuning import configure_engines
+    from app.metrics import init_metrics
+    from app.rate_limit import init_rate_limit
+    from app.routes.admin_routes import admin_bp
+    from app.routes.auth_routes import auth_bp
+    from app.routes.ticket import ticket_bp
+    from app.search import include_object
 
+    app = Flask(__name__)
 
     config_name = os.getenv("FLASK_CONFIG") or "DevelopmentConfig"
     app.config.from_object(f"app.config.{config_name}")
+    if test_config:
+        app.config.update(test_config)
+    if app.config["PROXY_FIX_X_FOR"]:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
 
     ma.init_app(app)
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    configure_engines(app)
+    migrate.init_app(app, db, include_object=include_object)
     jwt.init_app(app)
+    user_cache.init_app(app)
+    response_cache.init_app(app)
+    init_read_replica(app)
+    init_metrics(app)
+    init_rate_limit(app)
 
-  
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(ticket_bp)
     app.register_blueprint(admin_bp)
-
-    from app.models import User, Ticket, Comment, AuditLog
+    app.cli.add_command(tickets_cli)
+    app.cli.add_command(audit_cli)
+    app.cli.add_command(jobs_cli)
 
     @app.route("/")
     def index():
@@ -0,0 +1,226 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_audit"
+
+
+def record_audit(action, actor_id, ticket_id=None, details=None):
+    """Record an audit entry as part of the current database transaction.
+
+    In ``sync`` mode the row is added to the session and written by the
+    handler's commit. In ``async`` mode the entry is held until that commit
+    succeeds and is then handed to the background AuditWriter; a rollback
+    drops it.
+    """
+    entry = {
+        "action": action,
+        "timestamp": datetime.utcnow(),
+        "details": details,
+        "actor_id": int(actor_id) if actor_id is not None else None,
+        "ticket_id": ticket_id,
+    }
+    if current_app.config["AUDIT_MODE"] == "async":
+        # Tie the entry to a transaction so a rollback is seen even if nothing else ran yet
+        session = db.session()
+        if not session.in_transaction():
+            session.begin()
+        session.info.setdefault(_PENDING_KEY, []).append(entry)
+    else:
+        db.session.add(AuditLog(**entry))
+
+
+def spill_path(app):
+    return app.config["AUDIT_SPILL_PATH"] or os.path.join(app.instance_path, "audit-spill.ndjson")
+
+
+def load_spill(session, path):
+    """Insert entries spilled by AuditWriter into the audit log; returns how many.
+
+    The file is renamed first, so writers spilling meanwhile start a new one.
+    """
+    if not os.path.exists(path):
+        return 0
+    loading = f"{path}.loading"
+    if not os.path.exists(loading):
+        os.replace(path, loading)
+    with open(loading, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    for entry in entries:
+        entry["timestamp"] = entry["timestamp"] and datetime.fromisoformat(entry["timestamp"])
+    if entries:
+        session.execute(AuditLog.__table__.insert(), entries)
+    session.commit()
+    os.remove(loading)
+    return len(entries)
+
+
+def get_audit_writer(app):
+    writer = app.extensions.get("audit_writer")
+    if writer is None:
+        writer = app.extensions["audit_writer"] = AuditWriter(
+            app,
+            batch_size=app.config["AUDIT_BATCH_SIZE"],
+            flush_interval=app.config["AUDIT_FLUSH_INTERVAL"],
+            max_queue=app.config["AUDIT_QUEUE_SIZE"],
+            enqueue_timeout=app.config["AUDIT_ENQUEUE_TIMEOUT"],
+            write_retries=app.config["AUDIT_WRITE_RETRIES"],
+            spill_path=spill_path(app),
+        )
+    return writer
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_pending_audit(session):
+    entries = session.info.pop(_PENDING_KEY, None)
+    if entries:
+        get_audit_writer(current_app._get_current_object()).submit(entries)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_audit(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+class AuditWriter:
+    """Background thread that inserts queued audit entries in batches.
+
+    The queue is bounded: when it stays full for ``enqueue_timeout`` seconds
+    the caller writes its entries itself, so a stalled writer slows requests
+    down instead of growing memory without limit. A failed insert is retried
+    ``write_retries`` times with backoff; if the database is still failing
+    the entries are appended to ``spill_path`` for ``flask audit load-spill``.
+    Only if that fails too are they lost, and counted in ``dropped``. The
+    thread is started on first use (after any gunicorn fork) and drained at
+    interpreter exit.
+    """
+
+    def __init__(self, app, batch_size=500, flush_interval=0.5, max_queue=10000,
+                 enqueue_timeout=0.05, write_retries=3, spill_path=None, retry_delay=0.1):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.write_retries = write_retries
+        self.spill_path = spill_path
+        self.retry_delay = retry_delay
+        # Entries that reached the spill file, and entries lost altogether
+        self.spilled = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, entries):
+        if self._closed:
+            self._write(entries)
+            return
+        self._ensure_started()
+        for i, entry in enumerate(entries):
+            try:
+                self._queue.put(entry, timeout=self.enqueue_timeout)
+            except queue.Full:
+                logger.warning("Audit queue full; writing %d entries inline", len(entries) - i)
+                self._write(entries[i:])
+                return
+
+    def flush(self):
+        """Block until everything submitted so far has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(entry)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch:
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, entries):
+        for attempt in range(self.write_retries + 1):
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as connection:
+                        connection.execute(AuditLog.__table__.insert(), entries)
+                return
+            except Exception:
+                if attempt == self.write_retries:
+                    logger.exception("Failed to write %d audit entries", len(entries))
+                else:
+                    time.sleep(self.retry_delay * 2 ** attempt)
+        self._spill(entries)
+
+    def _spill(self, entries):
+        lines = []
+        for entry in entries:
+            timestamp = entry["timestamp"] and entry["timestamp"].isoformat()
+            lines.append(json.dumps({**entry, "timestamp": timestamp}, separators=(",", ":")))
+        data = ("\n".join(lines) + "\n").encode()
+        try:
+            os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+            # One O_APPEND write, so lines from several workers don't interleave
+            fd = os.open(self.spill_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except Exception:
+            logger.exception("Lost %d audit entries: spilling to %s failed",
+                             len(entries), self.spill_path)
+            with self._lock:
+                self.dropped += len(entries)
+            return
+        logger.error("Spilled %d audit entries to %s; load them with `flask audit load-spill`",
+                     len(entries), self.spill_path)
+        with self._lock:
+            self.spilled += len(entries)
@@ -0,0 +1,168 @@
+"""Archival of aged AuditLog rows into monthly gzip NDJSON segments.
+
+The live table keeps recent rows only. ``archive_audit`` moves rows older
+than a cutoff, oldest first and in bounded batches (one short transaction
+each), into ``audit-YYYY-MM.ndjson.gz`` files. Every batch is appended to a
+segment as its own gzip member, so segments stay sorted by (timestamp, id)
+and are read back as a single stream. ``read_audit`` pages over archived and
+live rows in that same order.
+"""
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, select, tuple_
+
+from app.models import AuditLog
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".ndjson.gz"
+
+
+def serialize_audit(entry):
+    return {
+        "id": entry.id,
+        "action": entry.action,
+        "timestamp": entry.timestamp.isoformat() if entry.timestamp else None,
+        "details": entry.details,
+        "actor_id": entry.actor_id,
+        "ticket_id": entry.ticket_id,
+    }
+
+
+def archive_dir(app):
+    return app.config["AUDIT_ARCHIVE_DIR"] or os.path.join(app.instance_path, "audit-archive")
+
+
+def segment_path(directory, timestamp):
+    return os.path.join(directory, f"{SEGMENT_PREFIX}{timestamp:%Y-%m}{SEGMENT_SUFFIX}")
+
+
+def segments(directory, since=None, until=None):
+    """Segment paths overlapping [since, until), oldest month first."""
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+            continue
+        month = datetime.strptime(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)], "%Y-%m")
+        next_month = month.replace(year=month.year + month.month // 12,
+                                   month=month.month % 12 + 1)
+        if (since is None or next_month > since) and (until is None or month < until):
+            found.append((month, os.path.join(directory, name)))
+    return [path for _, path in sorted(found)]
+
+
+def _append(path, entries):
+    """Append entries as one gzip member; returns the file size before writing."""
+    with open(path, "ab") as raw:
+        size = raw.tell()
+        payload = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries)
+        raw.write(gzip.compress(payload.encode()))
+        raw.flush()
+        os.fsync(raw.fileno())
+    return size
+
+
+def archive_audit(session, directory, before, batch_size=5000, pause=0.0):
+    """Move rows with timestamp < ``before`` to segments; returns the number moved.
+
+    Each batch is written and fsynced before its rows are deleted. If the
+    delete fails the segments are truncated back, so a batch ends up either
+    live or archived.
+    """
+    os.makedirs(directory, exist_ok=True)
+    moved = 0
+    while True:
+        rows = session.execute(
+            select(*AuditLog.__table__.columns)
+            .where(AuditLog.timestamp < before)
+            .order_by(AuditLog.timestamp, AuditLog.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return moved
+
+        by_segment = {}
+        for row in rows:
+            by_segment.setdefault(segment_path(directory, row.timestamp), []).append(
+                serialize_audit(row))
+        written = {}
+        try:
+            for path, entries in by_segment.items():
+                written[path] = _append(path, entries)
+            session.execute(delete(AuditLog).where(AuditLog.id.in_([row.id for row in rows])))
+            session.commit()
+        except BaseException:
+            session.rollback()
+            for path, size in written.items():
+                if size == 0:
+                    os.remove(path)
+                    continue
+                with open(path, "r+b") as raw:
+                    raw.truncate(size)
+            raise
+        moved += len(rows)
+        if len(rows) < batch_size:
+            return moved
+        if pause:
+            # Let other writers take the database lock between batches
+            time.sleep(pause)
+
+
+def _archived(directory, since, until, after, matches):
+    for path in segments(directory, since, until):
+        with gzip.open(path, "rt") as lines:
+            for line in lines:
+                entry = json.loads(line)
+                timestamp = datetime.fromisoformat(entry["timestamp"])
+                if until is not None and timestamp >= until:
+                    # Segments are sorted, so nothing later in this one matches
+                    break
+                if since is not None and timestamp < since:
+                    continue
+                if after is not None and (timestamp, entry["id"]) <= after:
+                    continue
+                if matches(entry):
+                    yield entry
+
+
+def read_audit(session, directory, limit, since=None, until=None, after=None, **filters):
+    """Up to ``limit`` + 1 entries ordered by (timestamp, id), archive first.
+
+    ``after`` is the (timestamp, id) of the last entry of the previous page;
+    ``filters`` are equality filters on ticket_id, actor_id or action.
+    """
+    if after is not None:
+        # Months before the cursor need not be opened at all
+        since = max(since, after[0]) if since is not None else after[0]
+
+    def matches(entry):
+        return all(entry[name] == value for name, value in filters.items())
+
+    page = []
+    for entry in _archived(directory, since, until, after, matches):
+        page.append(entry)
+        if len(page) > limit:
+            return page
+
+    conditions = [getattr(AuditLog, name) == value for name, value in filters.items()]
+    if since is not None:
+        conditions.append(AuditLog.timestamp >= since)
+    if until is not None:
+        conditions.append(AuditLog.timestamp < until)
+    if page:
+        last = page[-1]
+        after = (datetime.fromisoformat(last["timestamp"]), last["id"])
+    if after is not None:
+        conditions.append(tuple_(AuditLog.timestamp, AuditLog.id) > tuple_(*after))
+    rows = session.execute(
+        select(*AuditLog.__table__.columns)
+        .where(*conditions)
+        .order_by(AuditLog.timestamp, AuditLog.id)
+        .limit(limit + 1 - len(page))
+    ).all()
+    return page + [serialize_audit(row) for row in rows]
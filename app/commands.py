@@ -0,0 +1,120 @@
+import signal
+import threading
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.audit import load_spill, spill_path
+from app.audit_archive import archive_audit, archive_dir
+from app.extensions import db
+from app.jobs import Worker
+from app.models import Job
+from app.ticket_events import prune_events
+from app.models.ticket_stat import (
+    compute_ticket_stats, rebuild_ticket_stats, stored_ticket_stats
+)
+
+tickets_cli = AppGroup("tickets", help="Ticket maintenance commands.")
+audit_cli = AppGroup("audit", help="Audit log maintenance commands.")
+jobs_cli = AppGroup("jobs", help="Background job commands.")
+
+
+@tickets_cli.command("rebuild-stats")
+@click.option("--check", is_flag=True,
+              help="Only compare the counters with the ticket table; exit 1 on drift.")
+def rebuild_stats(check):
+    """Recount ticket statistics from the ticket table."""
+    expected = compute_ticket_stats(db.session)
+    stored = stored_ticket_stats(db.session)
+    drift = {
+        key: (stored.get(key, 0), expected.get(key, 0))
+        for key in set(expected) | set(stored)
+        if stored.get(key, 0) != expected.get(key, 0)
+    }
+    for (user_id, status, priority), (have, want) in sorted(drift.items()):
+        click.echo(f"user={user_id} status={status} priority={priority}: "
+                   f"stored {have}, actual {want}")
+
+    if check:
+        if drift:
+            raise click.ClickException(f"{len(drift)} ticket stat counters are out of date")
+        click.echo("Ticket stats are consistent.")
+        return
+
+    rebuild_ticket_stats(db.session)
+    db.session.commit()
+    click.echo(f"Rebuilt ticket stats ({len(drift)} counters corrected).")
+
+
+@tickets_cli.command("prune-events")
+@click.option("--older-than-days", type=int, default=None,
+              help="Delete events older than this (default: TICKET_EVENTS_RETENTION_DAYS).")
+def prune_events_command(older_than_days):
+    """Trim the ticket event log behind /tickets/events and /tickets/changes."""
+    if older_than_days is None:
+        older_than_days = current_app.config["TICKET_EVENTS_RETENTION_DAYS"]
+    before = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = prune_events(db.session, before)
+    click.echo(f"Deleted {deleted} ticket events older than {before:%Y-%m-%d %H:%M}.")
+
+
+@audit_cli.command("load-spill")
+def load_spill_command():
+    """Insert audit entries the async writer spilled to AUDIT_SPILL_PATH."""
+    path = spill_path(current_app)
+    loaded = load_spill(db.session, path)
+    click.echo(f"Loaded {loaded} spilled audit entries from {path}.")
+
+
+@audit_cli.command("archive")
+@click.option("--older-than-days", type=int, default=None,
+              help="Archive rows older than this (default: AUDIT_RETENTION_DAYS).")
+@click.option("--batch-size", type=int, default=None,
+              help="Rows per transaction (default: AUDIT_ARCHIVE_BATCH_SIZE).")
+@click.option("--pause", type=float, default=0.0,
+              help="Seconds to wait between batches.")
+def archive(older_than_days, batch_size, pause):
+    """Move aged audit rows into monthly gzip NDJSON segments."""
+    config = current_app.config
+    if older_than_days is None:
+        older_than_days = config["AUDIT_RETENTION_DAYS"]
+    before = datetime.utcnow() - timedelta(days=older_than_days)
+    directory = archive_dir(current_app)
+    moved = archive_audit(db.session, directory, before,
+                          batch_size or config["AUDIT_ARCHIVE_BATCH_SIZE"], pause)
+    click.echo(f"Archived {moved} audit rows older than {before:%Y-%m-%d %H:%M} to {directory}.")
+
+
+@jobs_cli.command("worker")
+@click.option("--concurrency", type=int, default=None,
+              help="Jobs run at once (default: JOBS_CONCURRENCY).")
+@click.option("--burst", is_flag=True, help="Run the jobs that are due, then exit.")
+def worker(concurrency, burst):
+    """Run queued background jobs until interrupted."""
+    worker = Worker(current_app._get_current_object(), concurrency=concurrency)
+    if burst:
+        click.echo(f"Ran {worker.run_pending()} jobs.")
+        return
+
+    stop = threading.Event()
+    # Finish the running jobs on SIGTERM (e.g. a deploy) as well as on Ctrl-C
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    click.echo(f"Job worker {worker.name} running {worker.concurrency} at a time.")
+    worker.run(stop)
+
+
+@jobs_cli.command("prune")
+@click.option("--older-than-days", type=int, default=None,
+              help="Delete finished jobs older than this (default: JOBS_RETENTION_DAYS).")
+def prune_jobs(older_than_days):
+    """Delete done and failed jobs."""
+    if older_than_days is None:
+        older_than_days = current_app.config["JOBS_RETENTION_DAYS"]
+    before = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = db.session.execute(Job.__table__.delete().where(
+        Job.status.in_(["done", "failed"]), Job.finished_at < before)).rowcount
+    db.session.commit()
+    click.echo(f"Deleted {deleted} finished jobs.")
@@ -1,15 +1,182 @@
 import os
 
+
+def env_flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+def server_engine_options():
+    """Pool settings for client/server databases such as PostgreSQL."""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        # Recycle before typical server/proxy idle timeouts drop the connection
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+
 class BaseConfig:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///dev.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default-secret")
 
+    # run.py calls db.create_all() at startup; production schemas come from
+    # `flask db upgrade` instead, so workers boot without DDL checks
+    AUTO_CREATE_SCHEMA = env_flag("AUTO_CREATE_SCHEMA", "true")
+
+    # GET /tickets keyset pagination
+    TICKETS_PAGE_SIZE = int(os.getenv("TICKETS_PAGE_SIZE", "50"))
+    TICKETS_MAX_PAGE_SIZE = int(os.getenv("TICKETS_MAX_PAGE_SIZE", "200"))
+    TICKETS_BULK_MAX = int(os.getenv("TICKETS_BULK_MAX", "500"))
+
+    # Audit log writes: "sync" (in the request transaction) or "async" (batched
+    # by a background thread once the request transaction has committed)
+    AUDIT_MODE = os.getenv("AUDIT_MODE", "sync")
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+    AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_ENQUEUE_TIMEOUT = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT", "0.05"))
+    # Async entries whose insert still fails after AUDIT_WRITE_RETRIES retries go to
+    # this NDJSON file (default: <instance path>/audit-spill.ndjson) for `flask audit load-spill`
+    AUDIT_WRITE_RETRIES = int(os.getenv("AUDIT_WRITE_RETRIES", "3"))
+    AUDIT_SPILL_PATH = os.getenv("AUDIT_SPILL_PATH")
+    # `flask audit archive` moves rows older than AUDIT_RETENTION_DAYS into
+    # monthly gzip NDJSON segments here (default: <instance path>/audit-archive)
+    AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR")
+    AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+    AUDIT_ARCHIVE_BATCH_SIZE = int(os.getenv("AUDIT_ARCHIVE_BATCH_SIZE", "5000"))
+
+    # Password hashing (werkzeug method string). Changing the method rehashes
+    # each user's password on their next successful login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+    # Concurrent hashes per process, and running plus waiting before logins get 503
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+    # Background jobs (app/jobs.py, `flask jobs worker`). Failed jobs are
+    # retried after JOBS_BACKOFF_BASE * 2**(attempt - 1) seconds, capped at
+    # JOBS_BACKOFF_MAX. Running jobs renew their lease every third of
+    # JOBS_LEASE_SECONDS; a job whose worker died is picked up again after it.
+    JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "4"))
+    JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+    JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+    JOBS_BACKOFF_BASE = float(os.getenv("JOBS_BACKOFF_BASE", "5"))
+    JOBS_BACKOFF_MAX = float(os.getenv("JOBS_BACKOFF_MAX", "900"))
+    JOBS_LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", "600"))
+    JOBS_RETENTION_DAYS = int(os.getenv("JOBS_RETENTION_DAYS", "7"))
+
+    # Cached user profiles behind flask_jwt_extended.current_user
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))
+
+    # Cached GET /tickets and GET /admin/users responses: "memory" (per worker,
+    # so other workers can serve a stale page for up to RESPONSE_CACHE_TTL
+    # seconds), "redis" (shared, RESPONSE_CACHE_URL) or "none"
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "10"))
+
+    # GET /tickets/events (server-sent events). Each worker tails the ticket
+    # event log every TICKET_EVENTS_POLL_INTERVAL seconds while streams are
+    # open; streams end after TICKET_EVENTS_STREAM_SECONDS and the browser
+    # reconnects with Last-Event-ID, replaying up to TICKET_EVENTS_REPLAY_LIMIT
+    # missed events from the log.
+    TICKET_EVENTS_POLL_INTERVAL = float(os.getenv("TICKET_EVENTS_POLL_INTERVAL", "1.0"))
+    TICKET_EVENTS_HEARTBEAT = float(os.getenv("TICKET_EVENTS_HEARTBEAT", "15"))
+    TICKET_EVENTS_STREAM_SECONDS = float(os.getenv("TICKET_EVENTS_STREAM_SECONDS", "300"))
+    TICKET_EVENTS_RETRY_MS = int(os.getenv("TICKET_EVENTS_RETRY_MS", "2000"))
+    TICKET_EVENTS_REPLAY_LIMIT = int(os.getenv("TICKET_EVENTS_REPLAY_LIMIT", "1000"))
+    TICKET_EVENTS_QUEUE_SIZE = int(os.getenv("TICKET_EVENTS_QUEUE_SIZE", "256"))
+    # `flask tickets prune-events` drops log entries older than this; clients
+    # holding older positions get 410 (changes) or a reset event (events)
+    TICKET_EVENTS_RETENTION_DAYS = int(os.getenv("TICKET_EVENTS_RETENTION_DAYS", "30"))
+
+    # GET /tickets/changes: events per page
+    TICKET_CHANGES_PAGE_SIZE = int(os.getenv("TICKET_CHANGES_PAGE_SIZE", "500"))
+    TICKET_CHANGES_MAX_PAGE_SIZE = int(os.getenv("TICKET_CHANGES_MAX_PAGE_SIZE", "2000"))
+
+    # Optional read replica for @read_only handlers. Reads stay on the primary
+    # for REPLICA_STICKY_SECONDS after a user's own write (read-your-writes),
+    # tracked in a signed cookie so that it holds across workers.
+    SQLALCHEMY_BINDS = (
+        {"replica": os.environ["DATABASE_REPLICA_URL"]}
+        if os.getenv("DATABASE_REPLICA_URL") else {}
+    )
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    REPLICA_STICKY_SIZE = int(os.getenv("REPLICA_STICKY_SIZE", "10000"))
+
+    # Request/SQL instrumentation and GET /metrics (Prometheus text format).
+    # When off, no hooks or listeners are installed at all.
+    METRICS_ENABLED = env_flag("METRICS_ENABLED", "false")
+    # When set, /metrics needs "Authorization: Bearer <METRICS_TOKEN>"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_REQUIRE_TOKEN = False
+    # gunicorn workers share metrics through files here (set by gunicorn.conf.py)
+    METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+    METRICS_SYNC_INTERVAL = float(os.getenv("METRICS_SYNC_INTERVAL", "1.0"))
+    # Statements slower than this are logged with their parameters redacted
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+    # Token-bucket admission control, checked before any view runs. Budgets
+    # are (tokens per second, burst) per blueprint and per key: "ip" is the
+    # client address, "identity" the JWT subject (or, on /auth, the client
+    # address plus the username being tried). RATE_LIMIT_BACKEND is "memory"
+    # (per worker) or "sqlite" (one file shared by all workers on the host, in
+    # /dev/shm by default).
+    RATE_LIMIT_ENABLED = env_flag("RATE_LIMIT_ENABLED", "false")
+    # Refuse to rate limit without PROXY_FIX_X_FOR: behind a proxy every
+    # client would share the proxy's address and so one budget
+    RATE_LIMIT_REQUIRE_PROXY = False
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH")
+    RATE_LIMITS = {
+        "auth": {"ip": (1, 20), "identity": (0.1, 5)},
+        "ticket": {"identity": (20, 100)},
+        "admin": {"identity": (10, 50)},
+    }
+    # Number of proxies in front of the app (e.g. 1 on Render); their
+    # X-Forwarded-For entries are trusted for request.remote_addr
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", "0"))
+
+    # PRAGMAs applied to every new SQLite connection (see app/engine_tuning.py)
+    SQLITE_PRAGMAS = {}
+    # Start transactions of non-GET requests with BEGIN IMMEDIATE on SQLite, so
+    # concurrent writers wait on busy_timeout instead of failing mid-transaction
+    SQLITE_IMMEDIATE_WRITES = False
+
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
 
 class ProductionConfig(BaseConfig):
     DEBUG = False
+    AUTO_CREATE_SCHEMA = env_flag("AUTO_CREATE_SCHEMA", "false")
+    # On by default once the proxy hops in front of the app are configured
+    RATE_LIMIT_ENABLED = env_flag(
+        "RATE_LIMIT_ENABLED", "true" if BaseConfig.PROXY_FIX_X_FOR else "false")
+    # Set to 0 when clients connect to gunicorn directly, without a proxy
+    RATE_LIMIT_REQUIRE_PROXY = env_flag("RATE_LIMIT_REQUIRE_PROXY", "true")
+    METRICS_REQUIRE_TOKEN = True
+
+    if BaseConfig.SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        SQLITE_PRAGMAS = {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+            "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        }
+        SQLITE_IMMEDIATE_WRITES = True
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = server_engine_options()
+
+class TestingConfig(BaseConfig):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    JWT_SECRET_KEY = "test-secret-key"
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
 
 
 
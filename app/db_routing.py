@@ -0,0 +1,102 @@
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy.sql import Select
+
+from app.utils.lru import TTLCache
+
+REPLICA_BIND = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "replica_sticky"
+
+
+class RoutingSession(Session):
+    """Session that sends SELECTs from read-only handlers to the replica bind.
+
+    Everything else (flushes, DML, raw SQL, SELECT ... FOR UPDATE) and every
+    query outside a ``@read_only`` handler uses the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_request_context()
+            and g.get("use_replica")
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def init_read_replica(app):
+    # The replica mirrors the primary's tables and has no models of its own;
+    # drop the metadata Flask-SQLAlchemy made for the bind so create_all and
+    # drop_all only ever touch the primary.
+    app.extensions["sqlalchemy"].metadatas.pop(REPLICA_BIND, None)
+    if REPLICA_BIND not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return
+    app.extensions["replica_sticky"] = TTLCache(
+        maxsize=app.config["REPLICA_STICKY_SIZE"], ttl=app.config["REPLICA_STICKY_SECONDS"])
+    app.extensions["replica_sticky_signer"] = URLSafeTimedSerializer(
+        app.config["JWT_SECRET_KEY"], salt="replica-sticky")
+    app.after_request(_remember_writer)
+
+
+def _identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # No JWT was verified for this request
+        return None
+
+
+def _remember_writer(response):
+    # Read-your-writes: a user's reads stay on the primary for a short window
+    # after their own successful mutation, until the replica has caught up.
+    # The window travels in a signed cookie, so it holds whichever worker
+    # serves the next read; the per-worker cache covers clients that drop
+    # cookies.
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        identity = _identity()
+        if identity is not None:
+            extensions = current_app.extensions
+            extensions["replica_sticky"].set(identity, True)
+            response.set_cookie(
+                STICKY_COOKIE, extensions["replica_sticky_signer"].dumps(identity),
+                max_age=current_app.config["REPLICA_STICKY_SECONDS"],
+                secure=request.is_secure, httponly=True, samesite="Lax")
+    return response
+
+
+def _sticky(identity):
+    if current_app.extensions["replica_sticky"].get(identity) is not None:
+        return True
+    cookie = request.cookies.get(STICKY_COOKIE)
+    if cookie is None:
+        return False
+    try:
+        writer = current_app.extensions["replica_sticky_signer"].loads(
+            cookie, max_age=current_app.config["REPLICA_STICKY_SECONDS"])
+    except BadSignature:
+        return False
+    # Another user's cookie on a shared client doesn't count
+    return writer == identity
+
+
+def read_only(fn):
+    """Route this handler's SELECTs to the replica (when configured)."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        sticky = current_app.extensions.get("replica_sticky")
+        if sticky is not None:
+            identity = _identity()
+            g.use_replica = identity is None or not _sticky(identity)
+        return fn(*args, **kwargs)
+    return wrapper
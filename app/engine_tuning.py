@@ -0,0 +1,45 @@
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from app.extensions import db
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def configure_engines(app):
+    """Attach per-connection SQLite settings to the app's engines."""
+    pragmas = app.config["SQLITE_PRAGMAS"]
+    immediate_writes = app.config["SQLITE_IMMEDIATE_WRITES"]
+    if not (pragmas or immediate_writes):
+        return
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name != "sqlite":
+            continue
+        event.listen(engine, "connect", _pragma_setter(pragmas, immediate_writes))
+        if immediate_writes:
+            event.listen(engine, "begin", _begin)
+
+
+def _pragma_setter(pragmas, immediate_writes):
+    def set_pragmas(dbapi_connection, connection_record):
+        if immediate_writes:
+            # Let SQLAlchemy's "begin" event issue BEGIN instead of the driver
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return set_pragmas
+
+
+def _begin(connection):
+    # A deferred transaction that reads and then writes fails with SQLITE_BUSY
+    # as soon as another worker has committed; taking the write lock up front
+    # makes it wait for busy_timeout instead.
+    if has_request_context() and request.method not in SAFE_METHODS:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        connection.exec_driver_sql("BEGIN")
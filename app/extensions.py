@@ -1,9 +1,30 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
+from flask import jsonify
 from flask_marshmallow import Marshmallow
+from app.user_cache import UserCache
+from app.response_cache import ResponseCache
+from app.db_routing import RoutingSession
 
 ma = Marshmallow()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
+user_cache = UserCache()
+response_cache = ResponseCache()
+
+
+# Resolve the token's user through the cache, so flask_jwt_extended.current_user
+# is available on protected endpoints without a database roundtrip per request
+@jwt.user_lookup_loader
+def load_current_user(jwt_header, jwt_data):
+    try:
+        return user_cache.get(int(jwt_data["sub"]))
+    except (TypeError, ValueError):
+        return None
+
+
+@jwt.user_lookup_error_loader
+def current_user_not_found(jwt_header, jwt_data):
+    return jsonify({"msg": "User not found"}), 401
@@ -0,0 +1,266 @@
+"""Database-backed background jobs.
+
+Handlers call ``enqueue`` inside their own transaction, so a job exists only
+if the request's changes were committed. ``flask jobs worker`` claims due
+jobs, runs the registered function with the job's payload and retries
+failures with exponential backoff:
+
+    @job("search.reindex", concurrency=1)
+    def reindex():
+        ...
+
+    enqueue("search.reindex", idempotency_key="reindex-2026-10-18")
+"""
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.extensions import db
+from app.models import Job
+
+logger = logging.getLogger(__name__)
+
+JOBS = {}
+
+
+class JobSpec:
+    def __init__(self, name, func, max_attempts=None, concurrency=None):
+        self.name = name
+        self.func = func
+        self.max_attempts = max_attempts
+        # Most jobs of this name running at once, across all workers
+        self.concurrency = concurrency
+
+
+def job(name, max_attempts=None, concurrency=None):
+    """Register a function as a job; it is called with the payload as keyword arguments."""
+    def decorator(func):
+        JOBS[name] = JobSpec(name, func, max_attempts, concurrency)
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, idempotency_key=None, run_at=None, max_attempts=None):
+    """Queue a job in the current transaction and return its id.
+
+    With an idempotency key, enqueueing again (from a retried request, say)
+    returns the id of the job already queued under that key.
+    """
+    spec = JOBS.get(name)
+    if spec is None:
+        raise KeyError(f"Unknown job: {name}")
+    max_attempts = max_attempts or spec.max_attempts or current_app.config["JOBS_MAX_ATTEMPTS"]
+    row = {
+        "name": name,
+        "payload": json.dumps(payload or {}),
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_at": run_at or datetime.utcnow(),
+        "idempotency_key": idempotency_key,
+        "created_at": datetime.utcnow(),
+    }
+    session = db.session
+    if idempotency_key is None:
+        return session.execute(Job.__table__.insert().values(**row)).inserted_primary_key[0]
+
+    table = Job.__table__
+    existing = select(table.c.id).where(table.c.idempotency_key == idempotency_key)
+    dialect = session.connection().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        session.execute(insert(table).values(**row).on_conflict_do_nothing(
+            index_elements=[table.c.idempotency_key]))
+    elif session.scalar(existing) is None:
+        session.execute(table.insert().values(**row))
+    return session.scalar(existing)
+
+
+def backoff(attempts, base, maximum):
+    """Seconds to wait before retry number ``attempts``: doubling, capped, with jitter."""
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay + random.uniform(0, delay / 10)
+
+
+class Worker:
+    """Runs due jobs with up to ``concurrency`` threads.
+
+    A claimed job is leased for JOBS_LEASE_SECONDS. While it runs, a
+    heartbeat renews the lease every third of that, so only a job whose
+    worker died is claimed again once the lease runs out. Each claim gets
+    its own token in ``locked_by``, so a run that lost its lease can't
+    finish the job out from under the new one. Per-job concurrency limits
+    count running jobs in the database, so they hold across workers, though
+    two workers claiming at the same instant may both get one.
+    """
+
+    def __init__(self, app, concurrency=None, poll_interval=None, name=None):
+        config = app.config
+        self.app = app
+        self.concurrency = concurrency or config["JOBS_CONCURRENCY"]
+        self.poll_interval = poll_interval if poll_interval is not None \
+            else config["JOBS_POLL_INTERVAL"]
+        self.lease = timedelta(seconds=config["JOBS_LEASE_SECONDS"])
+        self.backoff_base = config["JOBS_BACKOFF_BASE"]
+        self.backoff_max = config["JOBS_BACKOFF_MAX"]
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._claim_lock = threading.Lock()
+
+    def _claimable(self, now):
+        return or_(
+            and_(Job.status == "queued", Job.run_at <= now),
+            # Lease expired: the worker that had it is gone
+            and_(Job.status == "running", Job.locked_at < now - self.lease),
+        )
+
+    def claim(self):
+        """Lease the next due job.
+
+        Returns (id, name, payload, attempts, max_attempts, lease token) or None.
+        """
+        with self._claim_lock, self.app.app_context():
+            session = db.session
+            now = datetime.utcnow()
+            limited = {name: spec.concurrency for name, spec in JOBS.items() if spec.concurrency}
+            running = Counter()
+            if limited:
+                running.update(dict(session.execute(
+                    select(Job.name, func.count())
+                    .where(Job.status == "running", Job.locked_at >= now - self.lease,
+                           Job.name.in_(list(limited)))
+                    .group_by(Job.name)
+                ).all()))
+            full = [name for name, limit in limited.items() if running[name] >= limit]
+
+            candidates = session.execute(
+                select(Job.id).where(self._claimable(now), Job.name.not_in(full))
+                .order_by(Job.run_at, Job.id).limit(self.concurrency)
+            ).scalars().all()
+            for job_id in candidates:
+                token = f"{self.name}:{uuid.uuid4().hex[:12]}"
+                claimed = session.execute(
+                    update(Job).where(Job.id == job_id, self._claimable(now)).values(
+                        status="running", locked_by=token, locked_at=now,
+                        attempts=Job.attempts + 1)
+                ).rowcount
+                session.commit()
+                if claimed:
+                    job = session.get(Job, job_id)
+                    return job.id, job.name, job.payload, job.attempts, job.max_attempts, token
+            return None
+
+    def execute(self, claimed):
+        """Run a claimed job; its own database work commits together with the "done" mark.
+
+        If the claim lost its lease meanwhile, the work is rolled back and the
+        job is left to the worker that holds it now. A job that commits by
+        itself (audit.archive commits per batch) keeps what it committed.
+        """
+        job_id, name, payload, attempts, max_attempts, token = claimed
+        spec = JOBS.get(name)
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, token, done),
+                                     name=f"job-heartbeat-{job_id}", daemon=True)
+        heartbeat.start()
+        try:
+            return self._execute(job_id, name, spec, payload, attempts, max_attempts, token)
+        finally:
+            done.set()
+            heartbeat.join()
+
+    def _execute(self, job_id, name, spec, payload, attempts, max_attempts, token):
+        with self.app.app_context():
+            session = db.session
+            try:
+                if spec is None:
+                    raise KeyError(f"Unknown job: {name}")
+                spec.func(**json.loads(payload))
+                if not self._finish(job_id, token, status="done",
+                                    finished_at=datetime.utcnow(), last_error=None):
+                    session.rollback()
+                    logger.warning("Job %s (%s) lost its lease; its work was rolled back",
+                                   job_id, name)
+                    return False
+                session.commit()
+                return True
+            except Exception:
+                session.rollback()
+                error = traceback.format_exc()
+                if attempts >= max_attempts:
+                    logger.error("Job %s (%s) failed after %d attempts", job_id, name, attempts)
+                    self._finish(job_id, token, status="failed", finished_at=datetime.utcnow(),
+                                 last_error=error)
+                else:
+                    delay = backoff(attempts, self.backoff_base, self.backoff_max)
+                    logger.warning("Job %s (%s) failed, retrying in %.0f s", job_id, name, delay)
+                    self._finish(job_id, token, status="queued",
+                                 run_at=datetime.utcnow() + timedelta(seconds=delay),
+                                 last_error=error)
+                session.commit()
+                return False
+
+    def _finish(self, job_id, token, **values):
+        # Only while this claim still holds the lease; returns whether it did
+        return db.session.execute(update(Job).where(
+            Job.id == job_id, Job.status == "running", Job.locked_by == token
+        ).values(locked_by=None, locked_at=None, **values)).rowcount
+
+    def _heartbeat(self, job_id, token, done):
+        interval = self.lease.total_seconds() / 3
+        while not done.wait(interval):
+            try:
+                with self.app.app_context():
+                    try:
+                        renewed = db.session.execute(update(Job).where(
+                            Job.id == job_id, Job.status == "running", Job.locked_by == token
+                        ).values(locked_at=datetime.utcnow())).rowcount
+                        db.session.commit()
+                    finally:
+                        db.session.remove()
+            except Exception:
+                # E.g. SQLite busy while the job writes; the next beat tries again
+                logger.exception("Renewing the lease of job %s failed", job_id)
+                continue
+            if not renewed:
+                logger.warning("Job %s lost its lease; another worker may run it", job_id)
+                return
+
+    def run_pending(self):
+        """Run due jobs one at a time in this thread until none are left; returns the count."""
+        count = 0
+        while (claimed := self.claim()) is not None:
+            self.execute(claimed)
+            count += 1
+        return count
+
+    def run(self, stop):
+        """Work until ``stop`` (a threading.Event) is set; running jobs are finished first."""
+        def loop():
+            while not stop.is_set():
+                try:
+                    claimed = self.claim()
+                except Exception:
+                    logger.exception("Claiming a job failed")
+                    claimed = None
+                if claimed is None:
+                    stop.wait(self.poll_interval)
+                else:
+                    self.execute(claimed)
+
+        threads = [threading.Thread(target=loop, name=f"job-worker-{i}")
+                   for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,334 @@
+import glob
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_request_context, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Prometheus histogram with a fixed label set, safe to share between threads."""
+
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Per-bucket counts plus +Inf, then the running sum
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def render(self, snapshot):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(snapshot.items()):
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+            lines.append(f"{self.name}_sum{suffix} {series[-1]}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histograms():
+    return {h.name: h for h in (
+        Histogram("http_request_duration_seconds", "Request latency by endpoint.",
+                  ("endpoint", "method", "status")),
+        Histogram("http_request_db_queries", "SQL statements executed per request.",
+                  ("endpoint", "status"), QUERY_COUNT_BUCKETS),
+        Histogram("http_request_db_seconds", "Time spent in SQL per request.",
+                  ("endpoint", "status")),
+        Histogram("db_query_duration_seconds", "Duration of single SQL statements.", ()),
+        Histogram("serialization_duration_seconds", "JSON encoding of response bodies.", ()),
+        Histogram("password_hash_duration_seconds",
+                  "Password hashing and verification, including pool wait.", ("operation",)),
+    )}
+
+
+# Counters kept elsewhere in the app, rendered from _counters(): name -> (help, label)
+COUNTERS = {
+    "response_cache_requests_total": ("Response cache lookups by result.", "result"),
+    "audit_entries_failed_total": (
+        "Async audit entries that could not be inserted, by where they ended up.", "outcome"),
+}
+
+
+class MetricsFiles:
+    """Shares this process's metrics with the other gunicorn workers.
+
+    Each worker writes a snapshot to ``<directory>/metrics-<pid>.json`` every
+    ``interval`` seconds, and /metrics adds up all the files, so any worker
+    can answer a scrape. Other workers' numbers may be up to ``interval``
+    seconds old. Files of workers that exited are kept so that counters
+    never go backwards; gunicorn.conf.py clears the directory at startup.
+    """
+
+    def __init__(self, app, directory, interval):
+        self.app = app
+        self.directory = directory
+        self.interval = interval
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        # After a fork the writer thread is gone; start one per worker
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="metrics-files", daemon=True).start()
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.write()
+            except Exception:
+                logger.exception("Writing %s failed", self._path(os.getpid()))
+
+    def write(self):
+        path = self._path(os.getpid())
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(_encode(_snapshot(self.app)), f, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+    def others(self):
+        own = self._path(os.getpid())
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            if path == own:
+                continue
+            try:
+                with open(path) as f:
+                    snapshots.append(_decode(json.load(f)))
+            except (OSError, ValueError):
+                # Being replaced right now; its numbers arrive with the next scrape
+                continue
+        return snapshots
+
+
+def _snapshot(app):
+    return {
+        "histograms": {name: h.snapshot() for name, h in app.extensions["metrics"].items()},
+        "counters": _counters(app),
+    }
+
+
+def _counters(app):
+    counters = {}
+    stats = app.extensions.get("response_cache_stats")
+    if stats is not None:
+        counters["response_cache_requests_total"] = {
+            "hit": stats["hits"], "miss": stats["misses"]}
+    writer = app.extensions.get("audit_writer")
+    if writer is not None:
+        counters["audit_entries_failed_total"] = {
+            "spilled": writer.spilled, "dropped": writer.dropped}
+    return counters
+
+
+def _encode(snapshot):
+    return {
+        "histograms": {name: [[list(labels), series] for labels, series in series_map.items()]
+                       for name, series_map in snapshot["histograms"].items()},
+        "counters": snapshot["counters"],
+    }
+
+
+def _decode(data):
+    return {
+        "histograms": {name: {tuple(labels): series for labels, series in items}
+                       for name, items in data["histograms"].items()},
+        "counters": data["counters"],
+    }
+
+
+def _merge(snapshots):
+    histograms, counters = {}, {}
+    for snapshot in snapshots:
+        for name, series_map in snapshot["histograms"].items():
+            merged = histograms.setdefault(name, {})
+            for labels, series in series_map.items():
+                if labels in merged:
+                    merged[labels] = [a + b for a, b in zip(merged[labels], series)]
+                else:
+                    merged[labels] = list(series)
+        for name, values in snapshot["counters"].items():
+            merged = counters.setdefault(name, {})
+            for label, value in values.items():
+                merged[label] = merged.get(label, 0) + value
+    return {"histograms": histograms, "counters": counters}
+
+
+def init_metrics(app):
+    """Register the instrumentation hooks and /metrics; a no-op unless METRICS_ENABLED."""
+    if not app.config["METRICS_ENABLED"]:
+        return
+    if app.config["METRICS_REQUIRE_TOKEN"] and not app.config["METRICS_TOKEN"]:
+        raise RuntimeError("METRICS_ENABLED needs METRICS_TOKEN in this configuration; "
+                           "/metrics would otherwise be open to anyone")
+    app.extensions["metrics"] = _histograms()
+    if app.config["METRICS_MULTIPROC_DIR"]:
+        app.extensions["metrics_files"] = MetricsFiles(
+            app, app.config["METRICS_MULTIPROC_DIR"], app.config["METRICS_SYNC_INTERVAL"])
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.json = TimedJSONProvider(app)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+
+    slow_query = app.config["SLOW_QUERY_MS"] / 1000
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _query_timer(app, slow_query))
+
+
+def observe(name, value, *labels):
+    metrics = current_app.extensions.get("metrics")
+    if metrics is not None:
+        metrics[name].observe(value, *labels)
+
+
+@contextmanager
+def timed(name, *labels):
+    """Observe the duration of the block in histogram ``name`` (if metrics are on)."""
+    metrics = current_app.extensions.get("metrics")
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics[name].observe(time.perf_counter() - start, *labels)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def response(self, *args, **kwargs):
+        start = time.perf_counter()
+        response = super().response(*args, **kwargs)
+        observe("serialization_duration_seconds", time.perf_counter() - start)
+        return response
+
+
+def _endpoint():
+    # The endpoint name, not the path, keeps label cardinality bounded
+    return request.endpoint or "unmatched"
+
+
+def _start_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_queries = 0
+    g.metrics_query_seconds = 0.0
+
+
+def _finish_request(response):
+    files = current_app.extensions.get("metrics_files")
+    if files is not None:
+        files.ensure_started()
+    if "metrics_start" in g:
+        metrics = current_app.extensions["metrics"]
+        endpoint, status = _endpoint(), str(response.status_code)
+        metrics["http_request_duration_seconds"].observe(
+            time.perf_counter() - g.metrics_start, endpoint, request.method, status)
+        metrics["http_request_db_queries"].observe(g.metrics_queries, endpoint, status)
+        metrics["http_request_db_seconds"].observe(g.metrics_query_seconds, endpoint, status)
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_query_start"] = time.perf_counter()
+
+
+def _query_timer(app, slow_query):
+    histogram = app.extensions["metrics"]["db_query_duration_seconds"]
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_query_start"]
+        histogram.observe(elapsed)
+        if has_request_context() and "metrics_start" in g:
+            g.metrics_queries += 1
+            g.metrics_query_seconds += elapsed
+        if elapsed >= slow_query:
+            logger.warning("Slow query (%.1f ms): %s; parameters: %s",
+                           elapsed * 1000, statement, redact(parameters))
+    return after_cursor_execute
+
+
+def redact(parameters):
+    """Describe bound parameters by type only, so values never reach the logs."""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(
+            parameters[0], (list, tuple, dict)):
+        return f"{len(parameters)} parameter sets like {redact(parameters[0])}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def render_metrics(app):
+    snapshots = [_snapshot(app)]
+    files = app.extensions.get("metrics_files")
+    if files is not None:
+        snapshots.extend(files.others())
+    merged = _merge(snapshots)
+
+    lines = []
+    for name, histogram in app.extensions["metrics"].items():
+        lines.extend(histogram.render(merged["histograms"].get(name, {})))
+    for name, values in merged["counters"].items():
+        help, label = COUNTERS[name]
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} counter")
+        for value_label, value in values.items():
+            lines.append(f'{name}{{{label}="{_escape(value_label)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    token = current_app.config["METRICS_TOKEN"]
+    if token and not hmac.compare_digest(
+            request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        return jsonify({"msg": "Unauthorized"}), 401
+    return Response(render_metrics(current_app._get_current_object()),
+                    mimetype="text/plain; version=0.0.4")
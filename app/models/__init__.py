@@ -4,3 +4,6 @@ from .user import User
 from .ticket import Ticket
 from .comment import Comment
 from .audit_log import AuditLog
+from .ticket_stat import TicketStat
+from .ticket_event import TicketEvent
+from .job import Job
@@ -9,3 +9,10 @@ class AuditLog(db.Model):
 
     actor_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     ticket_id = db.Column(db.Integer, db.ForeignKey('ticket.id'))
+
+    __table_args__ = (
+        db.Index('ix_audit_log_ticket_id_timestamp', 'ticket_id', 'timestamp'),
+        db.Index('ix_audit_log_actor_id_timestamp', 'actor_id', 'timestamp'),
+        # Archival and /admin/audit walk the log in time order
+        db.Index('ix_audit_log_timestamp', 'timestamp'),
+    )
@@ -1,5 +1,10 @@
+from collections import Counter
 from datetime import datetime
+
+from sqlalchemy import case, event, func, select
+from sqlalchemy.orm import Session
 from app.extensions import db
+from .ticket import Ticket
 
 class Comment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -8,3 +13,57 @@ class Comment(db.Model):
 
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     ticket_id = db.Column(db.Integer, db.ForeignKey('ticket.id'), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_comment_ticket_id_timestamp', 'ticket_id', 'timestamp'),
+        db.Index('ix_comment_user_id', 'user_id'),
+    )
+
+
+def refresh_ticket_activity(connection, ticket_ids=None):
+    """Recompute Ticket.comment_count and last_activity_at from the comment table."""
+    ticket, comment = Ticket.__table__, Comment.__table__
+    of_ticket = comment.c.ticket_id == ticket.c.id
+    stmt = ticket.update().values(
+        comment_count=select(func.count()).where(of_ticket).scalar_subquery(),
+        last_activity_at=func.coalesce(
+            select(func.max(comment.c.timestamp)).where(of_ticket).scalar_subquery(),
+            ticket.c.created_at,
+        ),
+        # A comment isn't an edit of the ticket; keep onupdate from moving it
+        updated_at=ticket.c.updated_at,
+    )
+    if ticket_ids is not None:
+        stmt = stmt.where(ticket.c.id.in_(ticket_ids))
+    connection.execute(stmt)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_ticket_activity(session, flush_context):
+    # Runs inside the flush, so the counters commit or roll back with the comments.
+    # The increments happen in SQL: concurrent comments on one ticket both count.
+    added, latest = Counter(), {}
+    for comment in session.new:
+        if isinstance(comment, Comment):
+            added[comment.ticket_id] += 1
+            latest[comment.ticket_id] = max(latest.get(comment.ticket_id, comment.timestamp),
+                                            comment.timestamp)
+    removed = {comment.ticket_id for comment in session.deleted if isinstance(comment, Comment)}
+    if not added and not removed:
+        return
+
+    connection = session.connection()
+    table = Ticket.__table__
+    for ticket_id, count in added.items():
+        timestamp = latest[ticket_id]
+        connection.execute(table.update().where(table.c.id == ticket_id).values(
+            comment_count=table.c.comment_count + count,
+            last_activity_at=case(
+                (table.c.last_activity_at >= timestamp, table.c.last_activity_at),
+                else_=timestamp,
+            ),
+            updated_at=table.c.updated_at,
+        ))
+    if removed:
+        # Rare; the latest remaining comment has to be looked up anyway
+        refresh_ticket_activity(connection, removed)
@@ -1,4 +1,6 @@
 from datetime import datetime
+
+from sqlalchemy import event
 from app.extensions import db
 
 
@@ -10,7 +12,38 @@ class Ticket(db.Model):
     priority = db.Column(db.String(20), default="medium")  # optional
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Kept in step with the comment table (see app/models/comment.py)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # Latest comment, or creation for a ticket without comments (see _start_activity)
+    last_activity_at = db.Column(db.DateTime)
 
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
-    comments = db.relationship('Comment', backref='ticket', lazy=True)
+    # Deleting a ticket deletes its comments through the ORM, so the flush hooks see them
+    comments = db.relationship('Comment', backref='ticket', lazy=True,
+                               cascade="all, delete-orphan")
+
+    # Match the GET /tickets access paths: newest first, optionally per owner or status
+    __table_args__ = (
+        db.Index('ix_ticket_created_at', 'created_at'),
+        db.Index('ix_ticket_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_ticket_status_priority_created_at', 'status', 'priority', 'created_at'),
+        # max(updated_at) for the GET /tickets ETag, across all tickets or per owner
+        db.Index('ix_ticket_updated_at', 'updated_at'),
+        db.Index('ix_ticket_user_id_updated_at', 'user_id', 'updated_at'),
+        # GET /tickets?sort=last_activity_at / ?sort=comment_count, across all tickets or per owner
+        db.Index('ix_ticket_last_activity_at', 'last_activity_at'),
+        db.Index('ix_ticket_user_id_last_activity_at', 'user_id', 'last_activity_at'),
+        db.Index('ix_ticket_comment_count', 'comment_count'),
+        db.Index('ix_ticket_user_id_comment_count', 'user_id', 'comment_count'),
+    )
+
+
+@event.listens_for(Ticket, "before_insert")
+def _start_activity(mapper, connection, ticket):
+    # One timestamp for both, so a ticket without comments was last active
+    # exactly when it was created
+    if ticket.created_at is None:
+        ticket.created_at = datetime.utcnow()
+    if ticket.last_activity_at is None:
+        ticket.last_activity_at = ticket.created_at
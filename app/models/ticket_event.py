@@ -0,0 +1,23 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class TicketEvent(db.Model):
+    """Append-only log of ticket changes, written in the same transaction as the change.
+
+    ``seq`` orders events across workers and is never reused (AUTOINCREMENT on
+    SQLite), so clients can resume from the last one they saw. ticket_id has
+    no foreign key: events outlive deleted tickets.
+    """
+
+    seq = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # created, updated, deleted
+    ticket_id = db.Column(db.Integer, nullable=False)
+    # Owner of the ticket, so streams can filter events to what the user may see
+    user_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_ticket_event_user_id_seq', 'user_id', 'seq'),
+        {"sqlite_autoincrement": True},
+    )
@@ -0,0 +1,148 @@
+from collections import Counter
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.extensions import db
+from .ticket import Ticket
+
+# user_id used for the rows that count tickets across all users
+ALL_USERS = 0
+
+
+class TicketStat(db.Model):
+    """Ticket counts per (owner, status, priority), kept in step with the ticket table."""
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    status = db.Column(db.String(20), primary_key=True)
+    priority = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+def _stat_key(user_id, status, priority):
+    return (int(user_id), status or "", priority or "")
+
+
+_STAT_ATTRS = ("user_id", "status", "priority")
+
+
+def _values(ticket, old):
+    """Return the ticket's stat key before (old=True) or after the pending flush."""
+    state = inspect(ticket)
+    values = []
+    for attr in _STAT_ATTRS:
+        history = state.attrs[attr].history
+        if old:
+            current = history.deleted or history.unchanged
+        else:
+            current = history.added or history.unchanged
+        if current:
+            values.append(current[0])
+        else:
+            # Neither loaded nor changed (active_history loads the old value
+            # before any change), so the stored value is both old and new
+            values.append(getattr(ticket, attr))
+    return _stat_key(*values)
+
+
+# Assigning to an expired attribute would otherwise lose its old value
+for _attr in _STAT_ATTRS:
+    event.listen(getattr(Ticket, _attr), "set", lambda *args: None, active_history=True)
+
+
+class _Deltas(Counter):
+    def add(self, key, delta):
+        self[key] += delta
+        self[(ALL_USERS,) + key[1:]] += delta
+
+
+def apply_ticket_stat_deltas(connection, deltas):
+    table = TicketStat.__table__
+    dialect = connection.dialect.name
+    for (user_id, status, priority), delta in deltas.items():
+        row = {"user_id": user_id, "status": status, "priority": priority, "count": delta}
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+            stmt = insert(table).values(**row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.status, table.c.priority],
+                set_={"count": table.c.count + delta},
+            )
+            connection.execute(stmt)
+            continue
+
+        result = connection.execute(
+            table.update()
+            .where(table.c.user_id == user_id, table.c.status == status,
+                   table.c.priority == priority)
+            .values(count=table.c.count + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_ticket_stat_changes(session, flush_context, instances):
+    # Old values have to be read before the UPDATE/DELETE statements run
+    deltas = session.info.setdefault("ticket_stat_deltas", _Deltas())
+    with session.no_autoflush:
+        _collect(session, deltas)
+
+
+def _collect(session, deltas):
+    for ticket in session.dirty:
+        if isinstance(ticket, Ticket) and session.is_modified(ticket):
+            before, after = _values(ticket, old=True), _values(ticket, old=False)
+            if before != after:
+                deltas.add(before, -1)
+                deltas.add(after, 1)
+    for ticket in session.deleted:
+        if isinstance(ticket, Ticket):
+            deltas.add(_values(ticket, old=True), -1)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_ticket_stats(session, flush_context):
+    # New tickets are counted here, once column defaults have been filled in.
+    # Runs inside the flush, so the counters commit or roll back with the tickets.
+    deltas = session.info.pop("ticket_stat_deltas", None) or _Deltas()
+    for ticket in session.new:
+        if isinstance(ticket, Ticket):
+            deltas.add(_values(ticket, old=False), 1)
+    changed = {key: delta for key, delta in deltas.items() if delta}
+    if changed:
+        apply_ticket_stat_deltas(session.connection(), changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_ticket_stat_changes(session, previous_transaction):
+    session.info.pop("ticket_stat_deltas", None)
+
+
+def compute_ticket_stats(session):
+    """Count tickets from scratch, keyed like TicketStat rows."""
+    rows = session.execute(
+        select(Ticket.user_id, Ticket.status, Ticket.priority, func.count())
+        .group_by(Ticket.user_id, Ticket.status, Ticket.priority)
+    ).all()
+    counts = _Deltas()
+    for user_id, status, priority, count in rows:
+        counts.add(_stat_key(user_id, status, priority), count)
+    return dict(counts)
+
+
+def stored_ticket_stats(session):
+    rows = session.execute(select(TicketStat).where(TicketStat.count != 0)).scalars()
+    return {(row.user_id, row.status, row.priority): row.count for row in rows}
+
+
+def rebuild_ticket_stats(session):
+    session.execute(TicketStat.__table__.delete())
+    expected = compute_ticket_stats(session)
+    if expected:
+        session.execute(TicketStat.__table__.insert(), [
+            {"user_id": user_id, "status": status, "priority": priority, "count": count}
+            for (user_id, status, priority), count in expected.items()
+        ])
+    return expected
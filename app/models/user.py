@@ -1,7 +1,7 @@
 from datetime import datetime
 from app.extensions import db
 
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.security import hash_password, needs_rehash, verify_password
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -18,7 +18,10 @@ class User(db.Model):
 
     # Password handling
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
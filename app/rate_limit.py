@@ -0,0 +1,151 @@
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+from flask_jwt_extended import decode_token
+
+TOO_MANY_REQUESTS = b'{"msg":"Too many requests"}\n'
+
+
+class MemoryBuckets:
+    """Token buckets in this process; each gunicorn worker enforces its own budget."""
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, now):
+        """Take one token; returns (allowed, tokens left)."""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                # Dropping the least recently used bucket only ever refills it
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+
+class SQLiteBuckets:
+    """Token buckets in a SQLite file shared by all workers on the host.
+
+    One UPSERT per check, so concurrent workers never race on a bucket. The
+    state is disposable: the file lives in /dev/shm when available and is
+    written without fsync.
+    """
+
+    TAKE_SQL = """
+        INSERT INTO bucket (key, tokens, updated, allowed) VALUES (:key, :burst - 1, :now, 1)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = min(:burst, tokens + (:now - updated) * :rate)
+                     - (min(:burst, tokens + (:now - updated) * :rate) >= 1),
+            allowed = min(:burst, tokens + (:now - updated) * :rate) >= 1,
+            updated = :now
+        RETURNING allowed, tokens
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS bucket "
+            "(key TEXT PRIMARY KEY, tokens REAL, updated REAL, allowed INTEGER)")
+        return connection
+
+    def _connection(self):
+        # Per thread, and reopened after a fork
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = self._connect()
+            local.pid = os.getpid()
+        return local.connection
+
+    def take(self, key, rate, burst, now):
+        allowed, tokens = self._connection().execute(
+            self.TAKE_SQL, {"key": key, "rate": rate, "burst": burst, "now": now}).fetchone()
+        return bool(allowed), tokens
+
+
+def default_sqlite_path():
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "support-ticket-api-ratelimit.db")
+
+
+def make_buckets(config):
+    kind = config["RATE_LIMIT_BACKEND"]
+    if kind == "memory":
+        return MemoryBuckets()
+    if kind == "sqlite":
+        return SQLiteBuckets(config["RATE_LIMIT_SQLITE_PATH"] or default_sqlite_path())
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {kind!r}")
+
+
+def init_rate_limit(app):
+    """Enforce RATE_LIMITS per blueprint; a no-op unless RATE_LIMIT_ENABLED."""
+    if not app.config["RATE_LIMIT_ENABLED"]:
+        return
+    if app.config["RATE_LIMIT_REQUIRE_PROXY"] and not app.config["PROXY_FIX_X_FOR"]:
+        raise RuntimeError("RATE_LIMIT_ENABLED needs PROXY_FIX_X_FOR (or "
+                           "RATE_LIMIT_REQUIRE_PROXY=0 without a proxy); otherwise every "
+                           "client shares the proxy's address and its budgets")
+    app.extensions["rate_limit"] = make_buckets(app.config)
+    app.before_request(_admit)
+
+
+def _identity(blueprint):
+    if blueprint == "auth":
+        # Before authentication the identity is the account being tried. Keyed
+        # per client too: a shared per-username bucket would let anyone lock a
+        # victim out by sending a few bad logins with their username.
+        data = request.get_json(silent=True)
+        username = data.get("username") if isinstance(data, dict) else None
+        if not isinstance(username, str):
+            return None
+        return f"{request.remote_addr}:{username.lower()}"
+    header = request.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme != "Bearer" or not token:
+        return None
+    try:
+        # Signature and expiry only; the user lookup waits until the request is admitted
+        return decode_token(token)[current_app.config["JWT_IDENTITY_CLAIM"]]
+    except Exception:
+        # The view reports bad tokens itself
+        return None
+
+
+def _admit():
+    budgets = current_app.config["RATE_LIMITS"].get(request.blueprint)
+    if not budgets:
+        return None
+    buckets = current_app.extensions["rate_limit"]
+    now = time.time()
+    for dimension, (rate, burst) in budgets.items():
+        if dimension == "ip":
+            value = request.remote_addr
+        else:
+            value = _identity(request.blueprint)
+        if value is None:
+            continue
+        allowed, tokens = buckets.take(f"{request.blueprint}:{dimension}:{value}",
+                                       rate, burst, now)
+        if not allowed:
+            response = current_app.response_class(
+                TOO_MANY_REQUESTS, status=429, mimetype="application/json")
+            response.headers["Retry-After"] = str(math.ceil((1 - tokens) / rate))
+            return response
+    return None
@@ -0,0 +1,168 @@
+import json
+import threading
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, make_response, request
+from werkzeug.http import parse_date, unquote_etag
+
+from app.utils.conditional import not_modified
+from app.utils.lru import TTLCache
+
+# Response headers that are part of a cached list page
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "X-Next-Cursor")
+
+
+class CacheBackend:
+    """Storage behind ResponseCache.
+
+    Values are JSON-serializable dicts. Generations are integer counters that
+    must never be evicted (a reset counter would revive stale entries), so a
+    Redis-compatible store maps them to GET/INCR on keys without expiry and
+    entries to SET with EX.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def generation(self, name):
+        raise NotImplementedError
+
+    def bump(self, name):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU; each worker caches and invalidates on its own."""
+
+    def __init__(self, maxsize, ttl):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value, ttl):
+        self._entries.set(key, value, ttl=ttl)
+
+    def generation(self, name):
+        return self._generations.get(name, 0)
+
+    def bump(self, name):
+        with self._lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+
+
+class RedisBackend(CacheBackend):
+    """Shared cache for all workers in any server speaking the Redis protocol."""
+
+    def __init__(self, url, prefix="response-cache:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the redis package")
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key):
+        raw = self._client.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(self._prefix + key, json.dumps(value), ex=ttl)
+
+    def generation(self, name):
+        return int(self._client.get(self._prefix + "gen:" + name) or 0)
+
+    def bump(self, name):
+        self._client.incr(self._prefix + "gen:" + name)
+
+
+def make_backend(config):
+    kind = config["RESPONSE_CACHE_BACKEND"]
+    if kind == "memory":
+        return MemoryBackend(config["RESPONSE_CACHE_SIZE"], config["RESPONSE_CACHE_TTL"])
+    if kind == "redis":
+        return RedisBackend(config["RESPONSE_CACHE_URL"])
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {kind!r}")
+
+
+class ResponseCache:
+    """Caches successful GET responses of list endpoints.
+
+    A key combines the endpoint, its query parameters, the caller's scope and
+    the current generation of every namespace the response depends on.
+    Mutation handlers call ``invalidate`` after committing, which bumps those
+    generations so older entries are never looked up again and age out.
+    """
+
+    def init_app(self, app):
+        app.extensions["response_cache"] = make_backend(app.config)
+        app.extensions["response_cache_stats"] = {"hits": 0, "misses": 0}
+
+    @property
+    def _backend(self):
+        return current_app.extensions["response_cache"]
+
+    def stats(self):
+        return dict(current_app.extensions["response_cache_stats"])
+
+    def _count(self, outcome):
+        # Approximate under concurrency; good enough for a hit ratio
+        current_app.extensions["response_cache_stats"][outcome] += 1
+
+    def cached(self, scope):
+        """Decorator; ``scope()`` returns (scope key, namespaces the response depends on)."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                backend = self._backend
+                if backend is None:
+                    return fn(*args, **kwargs)
+
+                scope_key, namespaces = scope()
+                generations = ",".join(str(backend.generation(n)) for n in namespaces)
+                # Escaped, so a value containing "&" or "=" can't pose as other parameters
+                params = urlencode(sorted(request.args.items(multi=True)))
+                key = f"{request.endpoint}|{scope_key}|{generations}|{params}"
+
+                entry = backend.get(key)
+                if entry is not None:
+                    self._count("hits")
+                    headers = entry["headers"]
+                    if "ETag" in headers:
+                        response = not_modified(unquote_etag(headers["ETag"])[0],
+                                                parse_date(headers.get("Last-Modified")))
+                        if response is not None:
+                            response.headers["X-Cache"] = "HIT"
+                            return response
+                    response = current_app.response_class(
+                        entry["body"], status=entry["status"], headers=entry["headers"])
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                self._count("misses")
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code == 200:
+                    backend.set(key, {
+                        "body": response.get_data(as_text=True),
+                        "status": response.status_code,
+                        "headers": {h: response.headers[h] for h in CACHED_HEADERS
+                                    if h in response.headers},
+                    }, current_app.config["RESPONSE_CACHE_TTL"])
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *namespaces):
+        backend = self._backend
+        if backend is not None:
+            for name in namespaces:
+                backend.bump(name)
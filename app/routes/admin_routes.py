@@ -1,9 +1,18 @@
+import json
 from functools import wraps
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import (
-    jwt_required, get_jwt_identity, verify_jwt_in_request, get_jwt
+from datetime import datetime
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import current_user, verify_jwt_in_request
+from sqlalchemy import select
+from app.models import db, User, Ticket, AuditLog, Job
+from app.extensions import response_cache, user_cache
+from app.audit_archive import archive_dir, read_audit, serialize_audit
+from app.db_routing import read_only
+from app.jobs import JOBS, enqueue
+from app.schemas.ticket_schema import ticket_row_serializer
+from app.utils.pagination import (
+    PaginationError, decode_cursor, encode_cursor, parse_datetime, parse_limit
 )
-from app.models import db, User
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -12,8 +21,7 @@ def role_required(allowed_roles):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
-            claims = get_jwt()
-            role = claims.get("role")
+            role = current_user.role
             if role not in allowed_roles:
                 return jsonify({"msg": "Forbidden: Admins only"}), 403
             return fn(*args, **kwargs)
@@ -23,6 +31,8 @@ def role_required(allowed_roles):
 # Get all users (admin only)
 @admin_bp.route("/users", methods=["GET"])
 @role_required(['admin'])
+@read_only
+@response_cache.cached(lambda: ("admin", ["users"]))
 def get_all_users():
     users = User.query.all()
     return jsonify([
@@ -48,6 +58,8 @@ def update_user(user_id):
     user.role = data.get("role", user.role)
 
     db.session.commit()
+    user_cache.invalidate(user_id)
+    response_cache.invalidate("users")
     return jsonify({"msg": "User updated successfully"}), 200
 
 # Delete a user (admin only)
@@ -60,4 +72,162 @@ def delete_user(user_id):
 
     db.session.delete(user)
     db.session.commit()
+    user_cache.invalidate(user_id)
+    response_cache.invalidate("users")
     return jsonify({"msg": "User deleted successfully"}), 200
+
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+def _stream_rows(stmt, serialize, fmt):
+    """Serialize rows as the server-side cursor yields them, one batch per chunk."""
+    def generate():
+        result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if fmt == "json":
+            yield "["
+        first = True
+        for partition in result.partitions():
+            lines = [json.dumps(serialize(row), separators=(",", ":")) for row in partition]
+            if fmt == "json":
+                chunk = ",".join(lines)
+                yield chunk if first else "," + chunk
+            else:
+                yield "\n".join(lines) + "\n"
+            first = False
+        if fmt == "json":
+            yield "]"
+
+    return Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt])
+
+
+def _export_format():
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        raise PaginationError("format must be one of: " + ", ".join(EXPORT_FORMATS))
+    return fmt
+
+
+# Export all tickets (admin only)
+@admin_bp.route("/export/tickets", methods=["GET"])
+@role_required(['admin'])
+def export_tickets():
+    try:
+        fmt = _export_format()
+        stmt = select(*ticket_row_serializer.columns).order_by(Ticket.id)
+        if request.args.get("created_after"):
+            stmt = stmt.where(Ticket.created_at >= parse_datetime(
+                request.args["created_after"], "created_after"))
+        if request.args.get("created_before"):
+            stmt = stmt.where(Ticket.created_at < parse_datetime(
+                request.args["created_before"], "created_before"))
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    return _stream_rows(stmt, ticket_row_serializer.serialize, fmt)
+
+
+# Export the audit log (admin only)
+@admin_bp.route("/export/audit", methods=["GET"])
+@role_required(['admin'])
+def export_audit():
+    try:
+        fmt = _export_format()
+        stmt = select(*AuditLog.__table__.columns).order_by(AuditLog.id)
+        if request.args.get("ticket_id"):
+            ticket_id = request.args.get("ticket_id", type=int)
+            if ticket_id is None:
+                raise PaginationError("ticket_id must be an integer")
+            stmt = stmt.where(AuditLog.ticket_id == ticket_id)
+        if request.args.get("since"):
+            stmt = stmt.where(AuditLog.timestamp >= parse_datetime(request.args["since"], "since"))
+        if request.args.get("until"):
+            stmt = stmt.where(AuditLog.timestamp < parse_datetime(request.args["until"], "until"))
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    return _stream_rows(stmt, serialize_audit, fmt)
+
+
+AUDIT_PAGE_SIZE = 100
+AUDIT_MAX_PAGE_SIZE = 1000
+
+
+# Audit entries by time range, live and archived (admin only)
+@admin_bp.route("/audit", methods=["GET"])
+@role_required(['admin'])
+@read_only
+def get_audit():
+    try:
+        filters = {}
+        for name in ("ticket_id", "actor_id"):
+            if request.args.get(name):
+                filters[name] = request.args.get(name, type=int)
+                if filters[name] is None:
+                    raise PaginationError(f"{name} must be an integer")
+        if request.args.get("action"):
+            filters["action"] = request.args["action"]
+        since = until = after = None
+        if request.args.get("since"):
+            since = parse_datetime(request.args["since"], "since")
+        if request.args.get("until"):
+            until = parse_datetime(request.args["until"], "until")
+        if request.args.get("cursor"):
+            after = tuple(decode_cursor(request.args["cursor"], datetime, int))
+        limit = parse_limit(request.args.get("limit"), AUDIT_PAGE_SIZE, AUDIT_MAX_PAGE_SIZE)
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    # Oldest first, so archived segments come before the live table
+    entries = read_audit(db.session, archive_dir(current_app), limit,
+                         since=since, until=until, after=after, **filters)
+    response = jsonify(entries[:limit])
+    if len(entries) > limit:
+        last = entries[limit - 1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["timestamp"], last["id"])
+    return response, 200
+
+
+def _serialize_job(job):
+    return {
+        "id": job.id,
+        "name": job.name,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_at": job.run_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "last_error": job.last_error,
+    }
+
+
+# Queue a background job, e.g. {"name": "search.reindex"} (admin only)
+@admin_bp.route("/jobs", methods=["POST"])
+@role_required(['admin'])
+def create_job():
+    data = request.get_json(silent=True) or {}
+    name = data.get("name")
+    if name not in JOBS:
+        return jsonify({"msg": "name must be one of: " + ", ".join(sorted(JOBS))}), 400
+    payload = data.get("payload") or {}
+    if not isinstance(payload, dict):
+        return jsonify({"msg": "payload must be an object"}), 400
+
+    # Retried requests with the same Idempotency-Key get the same job
+    job_id = enqueue(name, payload, idempotency_key=request.headers.get("Idempotency-Key"))
+    db.session.commit()
+    return jsonify(_serialize_job(db.session.get(Job, job_id))), 202
+
+
+# Job status (admin only)
+@admin_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@role_required(['admin'])
+def get_job(job_id):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"msg": "Job not found"}), 404
+    return jsonify(_serialize_job(job)), 200
@@ -1,11 +1,15 @@
 from flask import Blueprint, request, jsonify
 from marshmallow import ValidationError
 from app.models import db, User
-from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+from flask_jwt_extended import create_access_token, current_user, jwt_required
 from app.schemas.register_schema import RegisterSchema
+from app.security import HashPoolBusy
+from app.db_routing import read_only
+from app.utils.lazy import Lazy
+from app.extensions import response_cache
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
-register_schema = RegisterSchema()
+register_schema = Lazy(RegisterSchema)
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
@@ -32,9 +36,13 @@ def register():
 
     # Create and save user
     user = User(username=username, email=email, role=role)
-    user.set_password(password)
+    try:
+        user.set_password(password)
+    except HashPoolBusy:
+        return _hash_pool_busy()
     db.session.add(user)
     db.session.commit()
+    response_cache.invalidate("users")
 
     return jsonify({"msg": "User registered successfully"}), 201
 
@@ -50,8 +58,20 @@ def login():
         return jsonify({"msg": "Missing username or password"}), 400
 
     user = User.query.filter_by(username=username).first()
-    if not user or not user.check_password(password):
-        return jsonify({"msg": "Invalid credentials"}), 401
+    # End the transaction before the slow hash check: with SQLite's immediate
+    # writes a POST holds the database write lock while its transaction is open
+    db.session.close()
+    try:
+        if not user or not user.check_password(password):
+            return jsonify({"msg": "Invalid credentials"}), 401
+
+        # Hashing parameters changed since this password was stored
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.add(user)
+            db.session.commit()
+    except HashPoolBusy:
+        return _hash_pool_busy()
 
     access_token = create_access_token(
         identity=str(user.id),
@@ -62,20 +82,13 @@ def login():
 
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
+@read_only
 def me():
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)   
-    except ValueError:
-        return jsonify({"msg": "Invalid user id in token"}), 400
-
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"msg": "User not found"}), 404
-
-    return jsonify({
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "role": user.role
-    })
+    # Loaded once per request through the user cache (see app/extensions.py)
+    return jsonify(current_user._asdict())
+
+
+def _hash_pool_busy():
+    response = jsonify({"msg": "Too many authentication requests in progress, try again shortly"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
@@ -1,15 +1,59 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, verify_jwt_in_request
-from app.models import db, Ticket, AuditLog
-from app.schemas.ticket_schema import TicketSchema
+import time
+from queue import Empty
+from flask import Blueprint, Response, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user, verify_jwt_in_request
+from app.models import Comment, Ticket, TicketEvent, TicketStat
+from app.audit import record_audit
+from app.ticket_events import (
+    get_ticket_broker, head_seq, load_events, pruned_since, record_ticket_event
+)
+from app.search import search_statement
+from app.models.ticket_stat import ALL_USERS
+from app.schemas.ticket_schema import TicketSchema, ticket_row_serializer
+from app.schemas.comment_schema import CommentSchema
 from datetime import datetime
 from functools import wraps
-from app.extensions import db
+from app.extensions import db, response_cache
+from app.db_routing import read_only
+from app.utils.lazy import Lazy
+from app.utils.conditional import collection_etag, not_modified, set_validators
+from app.utils.pagination import (
+    PaginationError, decode_cursor, encode_cursor, parse_datetime, parse_limit
+)
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import joinedload
 
 ticket_bp = Blueprint('ticket', __name__, url_prefix='/tickets')
 
-ticket_schema = TicketSchema()
-tickets_schema = TicketSchema(many=True)
+# GET /tickets ?sort= values: column and cursor type; always descending, newest id first on ties
+TICKET_SORTS = {
+    "created_at": (Ticket.created_at, datetime),
+    "last_activity_at": (Ticket.last_activity_at, datetime),
+    "comment_count": (Ticket.comment_count, int),
+}
+
+# Built on first use (see app/utils/lazy.py)
+ticket_schema = Lazy(TicketSchema)
+tickets_bulk_schema = Lazy(lambda: TicketSchema(many=True))
+tickets_patch_schema = Lazy(lambda: TicketSchema(many=True, partial=True))
+comment_schema = Lazy(CommentSchema)
+comments_schema = Lazy(lambda: CommentSchema(many=True))
+
+# Fields PATCH /tickets/bulk may change; status is free-form as in update_ticket
+BULK_UPDATE_FIELDS = ("title", "description", "priority", "status")
+
+def _ticket_list_scope():
+    # Admins list everyone's tickets, users only their own
+    if current_user.role == 'admin':
+        return "admin", ["tickets"]
+    user_id = int(get_jwt_identity())
+    return f"user:{user_id}", [f"tickets:user:{user_id}"]
+
+
+def _invalidate_ticket_lists(*owner_ids):
+    """Drop cached ticket lists that may show tickets of these owners; call after commit."""
+    response_cache.invalidate("tickets", *{f"tickets:user:{int(i)}" for i in owner_ids})
+
 
 # Role-based access decorator
 def role_required(allowed_roles):
@@ -17,8 +61,7 @@ def role_required(allowed_roles):
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            claims = get_jwt()
-            user_role = claims.get("role", None)
+            user_role = current_user.role
             if user_role not in allowed_roles:
                 return jsonify(msg="Forbidden: You do not have access to this resource"), 403
             return fn(*args, **kwargs)
@@ -43,14 +86,10 @@ def create_ticket():
     db.session.add(ticket)
     db.session.flush()  # To get ticket.id before commit
 
-    audit = AuditLog(
-        action="create_ticket",
-        timestamp=datetime.utcnow(),
-        actor_id=ticket.user_id,
-        ticket_id=ticket.id
-    )
-    db.session.add(audit)
+    record_audit("create_ticket", actor_id=ticket.user_id, ticket_id=ticket.id)
+    record_ticket_event("created", ticket)
     db.session.commit()
+    _invalidate_ticket_lists(ticket.user_id)
 
     result = ticket_schema.dump(ticket)
     return jsonify(result), 201
@@ -58,25 +97,369 @@ def create_ticket():
 # GET Tickets
 @ticket_bp.route('', methods=['GET'])
 @jwt_required()
+@read_only
+@response_cache.cached(_ticket_list_scope)
 def get_tickets():
     user_id = get_jwt_identity()
-    claims = get_jwt()
-    user_role = claims.get("role", None)
+    user_role = current_user.role
+
+    try:
+        filters = _ticket_filters(request.args, user_id, user_role)
+        limit = parse_limit(
+            request.args.get("limit"),
+            current_app.config["TICKETS_PAGE_SIZE"],
+            current_app.config["TICKETS_MAX_PAGE_SIZE"],
+        )
+        sort = request.args.get("sort", "created_at")
+        if sort not in TICKET_SORTS:
+            raise PaginationError(f"sort must be one of: {', '.join(TICKET_SORTS)}")
+        column, value_type = TICKET_SORTS[sort]
+        cursor = request.args.get("cursor")
+        if cursor:
+            # The cursor names its sort, so it can't be replayed against another order
+            cursor_sort, value, last_id = decode_cursor(cursor, str, value_type, int)
+            if cursor_sort != sort:
+                raise PaginationError("Invalid cursor")
+            filters.append(tuple_(column, Ticket.id) < tuple_(value, last_id))
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    # Polling clients revalidate with one aggregate over the same rows: any
+    # update moves max(updated_at), a comment moves max(last_activity_at), a
+    # delete changes the count
+    last_updated, last_activity, count = db.session.execute(
+        select(func.max(Ticket.updated_at), func.max(Ticket.last_activity_at), func.count())
+        .where(*filters)
+    ).one()
+    last_modified = max(filter(None, (last_updated, last_activity)), default=None)
+    etag = collection_etag(
+        user_role == 'admin' or user_id,
+        sorted(request.args.items(multi=True)),
+        last_updated and last_updated.isoformat(),
+        last_activity and last_activity.isoformat(),
+        count,
+    )
+    response = not_modified(etag, last_modified)
+    if response is not None:
+        return response
+
+    # Highest first; (sort column, id) is unique so pages never overlap.
+    # Plain column rows skip ORM hydration and go straight to the row serializer.
+    rows = db.session.execute(
+        select(*ticket_row_serializer.columns)
+        .where(*filters)
+        .order_by(column.desc(), Ticket.id.desc())
+        .limit(limit + 1)
+    ).all()
+
+    response = jsonify(ticket_row_serializer.dump(rows[:limit]))
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        response.headers["X-Next-Cursor"] = encode_cursor(sort, getattr(last, sort), last.id)
+    return set_validators(response, etag, last_modified), 200
+
+
+# Stream ticket changes as server-sent events instead of polling GET /tickets
+@ticket_bp.route('/events', methods=['GET'])
+@jwt_required()
+def ticket_events():
+    config = current_app.config
+    owner = None if current_user.role == 'admin' else int(get_jwt_identity())
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        return jsonify({"msg": "Last-Event-ID must be an integer"}), 400
+
+    broker = get_ticket_broker(current_app._get_current_object())
+    subscription = broker.subscribe(owner)
+    # Subscribed first, so nothing committed meanwhile falls between the replay and the stream
+    replay, sent = [], last_id or 0
+    if last_id is not None:
+        limit = config["TICKET_EVENTS_REPLAY_LIMIT"]
+        events = load_events(db.session, last_id, limit + 1, owner)
+        if len(events) > limit or pruned_since(db.session, last_id):
+            # Too far behind: the client should reload its list instead
+            replay = ["event: reset\ndata: {}\n\n"]
+        elif events:
+            replay = [text for _, _, text in events]
+            sent = events[-1][0]
+
+    heartbeat = config["TICKET_EVENTS_HEARTBEAT"]
+    duration = config["TICKET_EVENTS_STREAM_SECONDS"]
+
+    def stream():
+        # Runs after the request context is gone; only reads the subscription queue
+        last_sent = sent
+        try:
+            yield f"retry: {config['TICKET_EVENTS_RETRY_MS']}\n\n"
+            yield from replay
+            deadline = time.monotonic() + duration
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    seq, text = subscription.queue.get(timeout=min(heartbeat, remaining))
+                except Empty:
+                    if subscription.closed:
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                if seq > last_sent:
+                    last_sent = seq
+                    yield text
+        finally:
+            broker.unsubscribe(subscription)
+
+    return Response(stream(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        # Stop proxies such as nginx from buffering the stream
+        "X-Accel-Buffering": "no",
+    })
+
+
+# Tickets changed since a sync token, with tombstones for deleted ones
+@ticket_bp.route('/changes', methods=['GET'])
+@jwt_required()
+def ticket_changes():
+    owner = None if current_user.role == 'admin' else int(get_jwt_identity())
+    since = request.args.get("since")
+    if not since:
+        # Start of a sync: take the token first, then load GET /tickets
+        return jsonify({"changed": [], "deleted": [], "next": encode_cursor(head_seq(db.session)),
+                        "has_more": False}), 200
+    try:
+        since = decode_cursor(since, int)[0]
+        limit = parse_limit(
+            request.args.get("limit"),
+            current_app.config["TICKET_CHANGES_PAGE_SIZE"],
+            current_app.config["TICKET_CHANGES_MAX_PAGE_SIZE"],
+        )
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+    if pruned_since(db.session, since):
+        return jsonify({"msg": "Sync token expired; reload the ticket list"}), 410
+
+    # Cost follows the number of events after the token, not the number of tickets
+    stmt = select(TicketEvent.seq, TicketEvent.ticket_id).where(TicketEvent.seq > since)
+    if owner is not None:
+        stmt = stmt.where(TicketEvent.user_id == owner)
+    events = db.session.execute(stmt.order_by(TicketEvent.seq).limit(limit + 1)).all()
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    ids = {e.ticket_id for e in events}
+    rows = db.session.execute(
+        select(*ticket_row_serializer.columns).where(Ticket.id.in_(ids))
+    ).all() if ids else []
+    changed = ticket_row_serializer.dump(rows)
+    # Whatever no longer exists was deleted, whichever event came last
+    deleted = sorted(ids - {ticket["id"] for ticket in changed})
+    return jsonify({
+        "changed": changed,
+        "deleted": deleted,
+        "next": encode_cursor(events[-1].seq if events else since),
+        "has_more": has_more,
+    }), 200
+
 
+def _ticket_filters(args, user_id, user_role):
     if user_role == 'admin':
-        tickets = Ticket.query.all()
+        filters = []
+        if args.get("user_id"):
+            try:
+                filters.append(Ticket.user_id == int(args["user_id"]))
+            except ValueError:
+                raise PaginationError("user_id must be an integer")
     else:
-        tickets = Ticket.query.filter_by(user_id=user_id).all()
+        filters = [Ticket.user_id == int(user_id)]
+
+    statuses = args.getlist("status")
+    if statuses:
+        filters.append(Ticket.status.in_(statuses))
+    priorities = args.getlist("priority")
+    if priorities:
+        filters.append(Ticket.priority.in_(priorities))
+    if args.get("created_after"):
+        filters.append(Ticket.created_at >= parse_datetime(args["created_after"], "created_after"))
+    if args.get("created_before"):
+        filters.append(Ticket.created_at < parse_datetime(args["created_before"], "created_before"))
+    return filters
+
+# Search tickets by title, description and comments, best matches first
+@ticket_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_tickets():
+    user_id = get_jwt_identity()
+    user_role = current_user.role
+
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"msg": "Missing search query (q)"}), 400
+
+    try:
+        filters = _ticket_filters(request.args, user_id, user_role)
+        limit = parse_limit(
+            request.args.get("limit"),
+            current_app.config["TICKETS_PAGE_SIZE"],
+            current_app.config["TICKETS_MAX_PAGE_SIZE"],
+        )
+        cursor = request.args.get("cursor")
+        offset = decode_cursor(cursor, int)[0] if cursor else 0
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    stmt = search_statement(db.engine.dialect.name, q, ticket_row_serializer.columns)
+    if stmt is None:
+        return jsonify([]), 200
+
+    # Ranked results page by offset; the cursor keeps that an implementation detail
+    rows = db.session.execute(
+        stmt.where(*filters).limit(limit + 1).offset(offset)
+    ).all()
+
+    response = jsonify(ticket_row_serializer.dump(rows[:limit]))
+    if len(rows) > limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(offset + limit)
+    return response, 200
+
+# GET Ticket statistics (own tickets, or everyone's for admins)
+@ticket_bp.route('/stats', methods=['GET'])
+@jwt_required()
+def get_ticket_stats():
+    user_id = int(get_jwt_identity())
+    user_role = current_user.role
+
+    scope = user_id
+    if user_role == 'admin':
+        scope = request.args.get("user_id", ALL_USERS, type=int)
+
+    rows = TicketStat.query.filter(TicketStat.user_id == scope, TicketStat.count > 0).all()
+
+    by_status, by_priority, by_status_priority = {}, {}, {}
+    for row in rows:
+        by_status[row.status] = by_status.get(row.status, 0) + row.count
+        by_priority[row.priority] = by_priority.get(row.priority, 0) + row.count
+        by_status_priority.setdefault(row.status, {})[row.priority] = row.count
+
+    return jsonify({
+        "user_id": scope if scope != ALL_USERS else None,
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "by_status_priority": by_status_priority,
+    }), 200
+
+def _visible_ticket(ticket_id):
+    """Load a ticket the caller may see, or return an error response."""
+    user_id = int(get_jwt_identity())
+    user_role = current_user.role
+
+    ticket = db.session.get(Ticket, ticket_id)
+    if not ticket:
+        return None, (jsonify({"msg": "Ticket not found"}), 404)
+    if ticket.user_id != user_id and user_role != 'admin':
+        return None, (jsonify({"msg": "Forbidden: You can only view your own tickets"}), 403)
+    return ticket, None
+
+
+def _comment_page(ticket_id, args):
+    """One page of a ticket's comments, oldest first, with authors in the same query."""
+    limit = parse_limit(
+        args.get("limit"),
+        current_app.config["TICKETS_PAGE_SIZE"],
+        current_app.config["TICKETS_MAX_PAGE_SIZE"],
+    )
+    stmt = (
+        select(Comment)
+        .options(joinedload(Comment.user))
+        .where(Comment.ticket_id == ticket_id)
+        .order_by(Comment.timestamp, Comment.id)
+        .limit(limit + 1)
+    )
+    cursor = args.get("cursor")
+    if cursor:
+        timestamp, last_id = decode_cursor(cursor, datetime, int)
+        stmt = stmt.where(tuple_(Comment.timestamp, Comment.id) > tuple_(timestamp, last_id))
 
-    return jsonify(tickets_schema.dump(tickets)), 200
+    comments = db.session.execute(stmt).scalars().all()
+    next_cursor = None
+    if len(comments) > limit:
+        last = comments[limit - 1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+    return comments[:limit], next_cursor
+
+
+# GET Ticket with the first page of its comments
+@ticket_bp.route('/<int:ticket_id>', methods=['GET'])
+@jwt_required()
+def get_ticket(ticket_id):
+    ticket, error = _visible_ticket(ticket_id)
+    if error:
+        return error
+
+    try:
+        comments, next_cursor = _comment_page(ticket.id, request.args)
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    result = ticket_schema.dump(ticket)
+    result["comments"] = comments_schema.dump(comments)
+    result["comments_next_cursor"] = next_cursor
+    return jsonify(result), 200
+
+# GET Ticket comments
+@ticket_bp.route('/<int:ticket_id>/comments', methods=['GET'])
+@jwt_required()
+def get_comments(ticket_id):
+    ticket, error = _visible_ticket(ticket_id)
+    if error:
+        return error
+
+    try:
+        comments, next_cursor = _comment_page(ticket.id, request.args)
+    except PaginationError as err:
+        return jsonify({"msg": str(err)}), 400
+
+    response = jsonify(comments_schema.dump(comments))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
+
+# CREATE Comment
+@ticket_bp.route('/<int:ticket_id>/comments', methods=['POST'])
+@jwt_required()
+def create_comment(ticket_id):
+    ticket, error = _visible_ticket(ticket_id)
+    if error:
+        return error
+
+    json_data = request.get_json()
+    if not json_data:
+        return jsonify({"msg": "No input data provided"}), 400
+
+    errors = comment_schema.validate(json_data)
+    if errors:
+        return jsonify({"errors": errors}), 422
+
+    comment = comment_schema.load(json_data)
+    comment.user_id = int(get_jwt_identity())
+    comment.ticket_id = ticket.id
+    db.session.add(comment)
+    db.session.flush()
+
+    record_audit("create_comment", actor_id=comment.user_id, ticket_id=ticket.id)
+    # The ticket's comment_count and last_activity_at changed with it
+    record_ticket_event("updated", ticket)
+    db.session.commit()
+    _invalidate_ticket_lists(ticket.user_id)
+
+    return jsonify(comment_schema.dump(comment)), 201
 
 # UPDATE Ticket
 @ticket_bp.route('/<int:ticket_id>', methods=['PUT'])
 @jwt_required()
 def update_ticket(ticket_id):
     user_id = int(get_jwt_identity())  
-    claims = get_jwt()
-    user_role = claims.get("role", None)
+    user_role = current_user.role
 
     ticket = db.session.get(Ticket, ticket_id)
     if not ticket:
@@ -96,14 +479,10 @@ def update_ticket(ticket_id):
     if "status" in data:
         ticket.status = data["status"]
 
-    audit = AuditLog(
-        action="update_ticket",
-        timestamp=datetime.utcnow(),
-        actor_id=user_id,
-        ticket_id=ticket.id
-    )
-    db.session.add(audit)
+    record_audit("update_ticket", actor_id=user_id, ticket_id=ticket.id)
+    record_ticket_event("updated", ticket)
     db.session.commit()
+    _invalidate_ticket_lists(ticket.user_id)
 
     return jsonify({"msg": "Ticket updated successfully", "id": ticket.id}), 200
 
@@ -112,20 +491,126 @@ def update_ticket(ticket_id):
 @jwt_required()
 @role_required(['admin'])
 def delete_ticket(ticket_id):
-    ticket = Ticket.query.get(ticket_id)
+    ticket = db.session.get(Ticket, ticket_id)
     if not ticket:
         return jsonify({"msg": "Ticket not found"}), 404
 
     db.session.delete(ticket)
 
     user_id = get_jwt_identity()
-    audit = AuditLog(
-        action="delete_ticket",
-        timestamp=datetime.utcnow(),
-        actor_id=user_id,
-        ticket_id=ticket.id
-    )
-    db.session.add(audit)
+    record_audit("delete_ticket", actor_id=user_id, ticket_id=ticket.id)
+    record_ticket_event("deleted", ticket)
     db.session.commit()
+    _invalidate_ticket_lists(ticket.user_id)
 
     return jsonify({"msg": "Ticket deleted successfully", "id": ticket.id}), 200
+
+
+def _bulk_items():
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({"msg": "Expected a non-empty JSON list"}), 400)
+    limit = current_app.config["TICKETS_BULK_MAX"]
+    if len(items) > limit:
+        return None, (jsonify({"msg": f"At most {limit} items per request"}), 413)
+    return items, None
+
+
+def _bulk_response(results):
+    failed = sum(1 for r in results if r["status"] >= 400)
+    if not failed:
+        code = 201 if request.method == "POST" else 200
+    else:
+        code = 207 if failed < len(results) else 422
+    return jsonify(results), code
+
+
+# Bulk CREATE Tickets: one validation pass, one batched INSERT, one commit
+@ticket_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_tickets():
+    items, error = _bulk_items()
+    if error:
+        return error
+
+    user_id = int(get_jwt_identity())
+    errors = tickets_bulk_schema.validate(items)
+    valid = [i for i in range(len(items)) if i not in errors]
+
+    # One flush for the whole list: SQLAlchemy batches the INSERTs where the
+    # driver can return ids in order (PostgreSQL), and the stats and search
+    # flush hooks run once for the batch
+    tickets = tickets_bulk_schema.load([items[i] for i in valid]) if valid else []
+    for ticket in tickets:
+        ticket.user_id = user_id
+    db.session.add_all(tickets)
+    db.session.flush()
+
+    for ticket in tickets:
+        record_audit("create_ticket", actor_id=user_id, ticket_id=ticket.id)
+        record_ticket_event("created", ticket)
+    db.session.commit()
+    if tickets:
+        _invalidate_ticket_lists(user_id)
+
+    results = [{"index": i, "status": 422, "errors": errors[i]} for i in errors]
+    results += [
+        {"index": i, "status": 201, "id": ticket.id}
+        for i, ticket in zip(valid, tickets)
+    ]
+    results.sort(key=lambda r: r["index"])
+    return _bulk_response(results)
+
+
+# Bulk UPDATE Tickets: one SELECT for all ids, batched UPDATEs, one commit
+@ticket_bp.route('/bulk', methods=['PATCH'])
+@jwt_required()
+def bulk_update_tickets():
+    items, error = _bulk_items()
+    if error:
+        return error
+
+    user_id = int(get_jwt_identity())
+    user_role = current_user.role
+
+    results = [None] * len(items)
+    changes = {}
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+            results[i] = {"index": i, "status": 400, "msg": "Each item needs an integer id"}
+            continue
+        changes[i] = {k: item[k] for k in BULK_UPDATE_FIELDS if k in item}
+
+    errors = tickets_patch_schema.validate([
+        {k: v for k, v in changes.get(i, {}).items() if k != "status"}
+        for i in range(len(items))
+    ])
+
+    ids = {items[i]["id"] for i in changes}
+    tickets = {
+        ticket.id: ticket
+        for ticket in db.session.execute(select(Ticket).where(Ticket.id.in_(ids))).scalars()
+    }
+
+    for i, data in changes.items():
+        ticket = tickets.get(items[i]["id"])
+        if i in errors:
+            results[i] = {"index": i, "status": 422, "errors": errors[i]}
+        elif ticket is None:
+            results[i] = {"index": i, "status": 404, "msg": "Ticket not found"}
+        elif ticket.user_id != user_id and user_role != 'admin':
+            results[i] = {"index": i, "status": 403,
+                          "msg": "Forbidden: You can only update your own tickets"}
+        else:
+            for field, value in data.items():
+                setattr(ticket, field, value)
+            record_audit("update_ticket", actor_id=user_id, ticket_id=ticket.id)
+            record_ticket_event("updated", ticket)
+            results[i] = {"index": i, "status": 200, "id": ticket.id}
+
+    owners = {tickets[r["id"]].user_id for r in results if r["status"] == 200}
+    # Rows with the same changed columns go out as one executemany UPDATE
+    db.session.commit()
+    if owners:
+        _invalidate_ticket_lists(*owners)
+    return _bulk_response(results)
@@ -0,0 +1,26 @@
+from app.extensions import ma
+from app.models import Comment, User
+from marshmallow import validate
+
+
+class CommentAuthorSchema(ma.SQLAlchemySchema):
+    class Meta:
+        model = User
+
+    id = ma.auto_field()
+    username = ma.auto_field()
+
+
+class CommentSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = Comment
+        load_instance = True
+        include_fk = True
+
+    id = ma.auto_field(dump_only=True)
+    message = ma.auto_field(required=True, validate=validate.Length(min=1, max=5000))
+    timestamp = ma.auto_field(dump_only=True)
+    user_id = ma.auto_field(dump_only=True)
+    ticket_id = ma.auto_field(dump_only=True)
+    # Comment.user must be loaded eagerly (see app/routes/ticket.py) to avoid N+1 queries
+    author = ma.Nested(CommentAuthorSchema, attribute="user", dump_only=True)
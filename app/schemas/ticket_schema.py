@@ -1,6 +1,8 @@
 from app.extensions import ma
 from app.models import Ticket
 from marshmallow import validate
+from app.schemas.row_serializer import RowSerializer
+from app.utils.lazy import Lazy
 
 class TicketSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
@@ -15,4 +17,10 @@ class TicketSchema(ma.SQLAlchemyAutoSchema):
     status = ma.auto_field(dump_only=True)
     created_at = ma.auto_field(dump_only=True)
     updated_at = ma.auto_field(dump_only=True)
+    comment_count = ma.auto_field(dump_only=True)
+    last_activity_at = ma.auto_field(dump_only=True)
     user_id = ma.auto_field(dump_only=True)
+
+
+# Fast path for list responses: select(*ticket_row_serializer.columns) and dump the rows
+ticket_row_serializer = Lazy(lambda: RowSerializer(TicketSchema(), Ticket))
@@ -0,0 +1,141 @@
+import re
+
+from sqlalchemy import (
+    DDL, Column, Integer, MetaData, Table, Text, bindparam, event, exists, func, inspect,
+    literal_column, or_, select, text
+)
+from sqlalchemy.orm import Session
+from app.models import Comment, Ticket
+
+# SQLite keeps one FTS5 row per ticket (rowid = ticket.id) with the ticket's
+# comments concatenated. It is not part of db.metadata: create_all/drop_all
+# manage it through the DDL hooks below and migrations create it explicitly.
+SEARCH_TABLE = "ticket_search"
+ticket_search = Table(
+    SEARCH_TABLE, MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", Text),
+    Column("description", Text),
+    Column("comments", Text),
+)
+
+CREATE_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+    "USING fts5(title, description, comments, tokenize = 'porter unicode61')"
+)
+REINDEX_SQL = (
+    f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, comments) "
+    "SELECT t.id, t.title, t.description, "
+    "(SELECT group_concat(c.message, ' ') FROM comment c WHERE c.ticket_id = t.id) "
+    "FROM ticket t"
+)
+
+event.listen(Ticket.__table__, "after_create",
+             DDL(CREATE_SEARCH_TABLE).execute_if(dialect="sqlite"))
+event.listen(Ticket.__table__, "before_drop",
+             DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}").execute_if(dialect="sqlite"))
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Keep Alembic autogenerate away from the FTS5 table and its shadow tables."""
+    return not (type_ == "table" and name.startswith(SEARCH_TABLE))
+
+
+def fts_query(q):
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix."""
+    words = _WORD.findall(q)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def reindex_tickets(connection, ticket_ids=None):
+    if connection.dialect.name != "sqlite":
+        return
+    if ticket_ids is None:
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        connection.execute(text(REINDEX_SQL))
+        return
+    ids = sorted(ticket_ids)
+    connection.execute(ticket_search.delete().where(ticket_search.c.rowid.in_(ids)))
+    connection.execute(
+        text(REINDEX_SQL + " WHERE t.id IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": ids},
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session, flush_context):
+    connection = session.connection()
+    if connection.dialect.name != "sqlite":
+        return
+    ticket_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Ticket):
+            ticket_ids.add(obj.id)
+        elif isinstance(obj, Comment):
+            ticket_ids.add(obj.ticket_id)
+    for obj in session.dirty:
+        if isinstance(obj, Ticket) and (
+            _changed(obj, "title") or _changed(obj, "description")
+        ):
+            ticket_ids.add(obj.id)
+        elif isinstance(obj, Comment) and session.is_modified(obj):
+            ticket_ids.add(obj.ticket_id)
+    for obj in session.deleted:
+        if isinstance(obj, Ticket):
+            ticket_ids.add(obj.id)
+        elif isinstance(obj, Comment):
+            ticket_ids.add(obj.ticket_id)
+    ticket_ids.discard(None)
+    if ticket_ids:
+        # Deleted tickets are simply not re-inserted
+        reindex_tickets(connection, ticket_ids)
+
+
+def _changed(obj, attr):
+    return inspect(obj).attrs[attr].history.has_changes()
+
+
+def search_statement(dialect, q, columns):
+    """Ranked select of ``columns`` for tickets matching ``q``, or None if q has no words."""
+    if dialect == "sqlite":
+        match = fts_query(q)
+        if match is None:
+            return None
+        table = literal_column(SEARCH_TABLE)
+        return (
+            select(*columns)
+            .join(ticket_search, ticket_search.c.rowid == Ticket.id)
+            .where(table.op("MATCH")(match))
+            .order_by(func.bm25(table), Ticket.id)
+        )
+
+    if not _WORD.search(q):
+        return None
+
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery("english", q)
+        document = func.to_tsvector("english", Ticket.title + " " + Ticket.description)
+        comment_match = exists().where(
+            Comment.ticket_id == Ticket.id,
+            func.to_tsvector("english", Comment.message).op("@@")(query),
+        )
+        return (
+            select(*columns)
+            .where(or_(document.op("@@")(query), comment_match))
+            .order_by(func.ts_rank(document, query).desc(), Ticket.id)
+        )
+
+    # Other databases: unranked substring match
+    pattern = f"%{q}%"
+    comment_match = exists().where(Comment.ticket_id == Ticket.id, Comment.message.ilike(pattern))
+    return (
+        select(*columns)
+        .where(or_(Ticket.title.ilike(pattern), Ticket.description.ilike(pattern), comment_match))
+        .order_by(Ticket.id)
+    )
@@ -0,0 +1,72 @@
+import threading
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.metrics import timed
+
+
+class HashPoolBusy(Exception):
+    """Raised when too many password hashes are already queued."""
+
+
+class PasswordHasher:
+    """Admission limit for password hashing and verification.
+
+    The hash runs on the calling request thread; this only bounds how many
+    run at once. At most ``workers`` hash concurrently (more would just
+    compete for the same cores). At most ``max_pending`` may run or wait;
+    beyond that, callers get HashPoolBusy instead of piling up behind a
+    login storm.
+
+    The request thread is busy for the whole hash. A sync worker serves
+    nothing else meanwhile. In threads and asgi modes the other threads
+    keep serving, because hashlib's scrypt and pbkdf2 release the GIL.
+    """
+
+    def __init__(self, workers, max_pending):
+        self._running = threading.Semaphore(workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashPoolBusy()
+        try:
+            with self._running:
+                return fn(*args)
+        finally:
+            self._slots.release()
+
+
+def _get_hasher():
+    app = current_app._get_current_object()
+    hasher = app.extensions.get("password_hasher")
+    if hasher is None:
+        hasher = app.extensions["password_hasher"] = PasswordHasher(
+            app.config["PASSWORD_HASH_WORKERS"], app.config["PASSWORD_HASH_MAX_PENDING"])
+    return hasher
+
+
+@lru_cache(maxsize=8)
+def _canonical_method(method):
+    # werkzeug stores the fully expanded method, e.g. "scrypt" -> "scrypt:32768:8:1"
+    return generate_password_hash("", method, salt_length=1).split("$", 1)[0]
+
+
+def hash_password(password):
+    config = current_app.config
+    with timed("password_hash_duration_seconds", "hash"):
+        return _get_hasher().run(
+            generate_password_hash, password,
+            config["PASSWORD_HASH_METHOD"], config["PASSWORD_SALT_LENGTH"])
+
+
+def verify_password(pwhash, password):
+    with timed("password_hash_duration_seconds", "verify"):
+        return _get_hasher().run(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash):
+    method = pwhash.split("$", 1)[0]
+    return method != _canonical_method(current_app.config["PASSWORD_HASH_METHOD"])
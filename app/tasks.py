@@ -0,0 +1,34 @@
+"""Built-in jobs; handlers and admins enqueue them with app.jobs.enqueue."""
+from datetime import datetime, timedelta
+
+from flask import current_app
+from app.audit_archive import archive_audit, archive_dir
+from app.extensions import db
+from app.jobs import job
+from app.models.ticket_stat import rebuild_ticket_stats
+from app.search import reindex_tickets
+
+
+@job("search.reindex", concurrency=1)
+def reindex_search():
+    """Rebuild the whole full-text search index."""
+    reindex_tickets(db.session.connection())
+
+
+@job("tickets.rebuild_stats", concurrency=1)
+def rebuild_stats():
+    rebuild_ticket_stats(db.session)
+
+
+@job("audit.archive", concurrency=1)
+def archive_audit_log(older_than_days=None):
+    """Archive old audit rows.
+
+    archive_audit commits each batch itself, so batches already moved stay
+    archived if the job later fails or loses its lease; the "done" mark is a
+    separate commit, and a retry just carries on with the rows that are left.
+    """
+    config = current_app.config
+    days = config["AUDIT_RETENTION_DAYS"] if older_than_days is None else older_than_days
+    archive_audit(db.session, archive_dir(current_app),
+                  datetime.utcnow() - timedelta(days=days), config["AUDIT_ARCHIVE_BATCH_SIZE"])
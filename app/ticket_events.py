@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import queue
+import threading
+
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models import Ticket, TicketEvent
+from app.schemas.ticket_schema import ticket_row_serializer
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_ticket_events"
+
+
+def record_ticket_event(kind, ticket):
+    """Log a ticket change ("created", "updated" or "deleted") in the current transaction.
+
+    Streams on every worker pick the event up from the log once the
+    transaction commits; this worker's broker is woken right away.
+    """
+    session = db.session()
+    session.add(TicketEvent(kind=kind, ticket_id=ticket.id, user_id=int(ticket.user_id)))
+    session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_broker(session):
+    if session.info.pop(_PENDING_KEY, None):
+        broker = current_app.extensions.get("ticket_broker")
+        if broker is not None:
+            broker.wake()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def head_seq(session):
+    """Sequence number of the newest event (0 when the log is empty)."""
+    return session.scalar(select(func.max(TicketEvent.seq))) or 0
+
+
+def pruned_since(session, seq):
+    """True when events after ``seq`` have been pruned from the log.
+
+    Sequence numbers start at 1 and are never reused, so a gap below the
+    oldest remaining event can only come from pruning.
+    """
+    oldest = session.scalar(select(func.min(TicketEvent.seq)))
+    return oldest is not None and seq < oldest - 1
+
+
+def prune_events(session, before, batch_size=5000):
+    """Delete events older than ``before`` in batches; returns the number deleted.
+
+    The newest event is always kept, so the log still shows how far it has
+    been pruned.
+    """
+    table = TicketEvent.__table__
+    head = head_seq(session)
+    deleted = 0
+    while True:
+        batch = select(table.c.seq).where(
+            table.c.created_at < before, table.c.seq < head
+        ).order_by(table.c.seq).limit(batch_size).scalar_subquery()
+        count = session.execute(table.delete().where(table.c.seq.in_(batch))).rowcount
+        session.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def format_event(seq, kind, ticket_id, ticket):
+    data = json.dumps({"seq": seq, "type": kind, "ticket_id": ticket_id, "ticket": ticket},
+                      separators=(",", ":"))
+    return f"id: {seq}\nevent: {kind}\ndata: {data}\n\n"
+
+
+def load_events(session, after, limit, user_id=None):
+    """Events after ``after`` as (seq, owner, SSE text), oldest first.
+
+    Events carry the ticket as it is now (one query per batch, not per
+    event or per listener); deleted tickets are sent as null.
+    """
+    stmt = select(TicketEvent).where(TicketEvent.seq > after)
+    if user_id is not None:
+        stmt = stmt.where(TicketEvent.user_id == user_id)
+    events = session.execute(stmt.order_by(TicketEvent.seq).limit(limit)).scalars().all()
+
+    ids = {e.ticket_id for e in events if e.kind != "deleted"}
+    tickets = {}
+    if ids:
+        rows = session.execute(
+            select(*ticket_row_serializer.columns).where(Ticket.id.in_(ids))).all()
+        tickets = {ticket["id"]: ticket for ticket in ticket_row_serializer.dump(rows)}
+    return [
+        (e.seq, e.user_id, format_event(e.seq, e.kind, e.ticket_id,
+                                        tickets.get(e.ticket_id) if e.kind != "deleted" else None))
+        for e in events
+    ]
+
+
+def get_ticket_broker(app):
+    broker = app.extensions.get("ticket_broker")
+    if broker is None:
+        broker = app.extensions["ticket_broker"] = TicketEventBroker(
+            app,
+            poll_interval=app.config["TICKET_EVENTS_POLL_INTERVAL"],
+            queue_size=app.config["TICKET_EVENTS_QUEUE_SIZE"],
+        )
+    return broker
+
+
+class Subscription:
+    def __init__(self, user_id, queue_size):
+        # None: every ticket (admins)
+        self.user_id = user_id
+        self.queue = queue.Queue(queue_size)
+        self.closed = False
+
+
+class TicketEventBroker:
+    """Fans the ticket event log out to this worker's event streams.
+
+    One thread tails the TicketEvent table for the whole worker, so N open
+    streams cost one query every ``poll_interval`` seconds instead of N
+    list requests. Commits on this worker wake the thread at once; commits
+    on other workers are seen within ``poll_interval``. A listener whose
+    queue fills up is dropped and resumes from the log when it reconnects.
+
+    On SQLite writes are serialized, so events commit in ``seq`` order. The
+    thread is started on first use (after any gunicorn fork) and idles
+    while nobody listens.
+    """
+
+    def __init__(self, app, poll_interval=1.0, queue_size=256, batch_size=500):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.last_seq = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def subscribe(self, user_id):
+        """Listen for events after the newest committed one; call inside a request."""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            if self.last_seq is None:
+                self.last_seq = head_seq(db.session)
+            self._subscribers.add(subscription)
+            self._ensure_started()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def wake(self):
+        self._wake.set()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="ticket-events", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._lock:
+                if not self._subscribers:
+                    # Nobody to catch up for; the next subscriber starts from the head
+                    self.last_seq = None
+                    continue
+                after = self.last_seq
+            try:
+                with self.app.app_context():
+                    try:
+                        events = load_events(db.session, after, self.batch_size)
+                    finally:
+                        db.session.remove()
+            except Exception:
+                logger.exception("Reading the ticket event log failed")
+                continue
+            if not events:
+                continue
+            with self._lock:
+                self.last_seq = events[-1][0]
+                subscribers = list(self._subscribers)
+            self._publish(subscribers, events)
+            if len(events) == self.batch_size:
+                self._wake.set()
+
+    def _publish(self, subscribers, events):
+        for subscription in subscribers:
+            for seq, user_id, text in events:
+                if subscription.user_id is not None and subscription.user_id != user_id:
+                    continue
+                try:
+                    subscription.queue.put_nowait((seq, text))
+                except queue.Full:
+                    subscription.closed = True
+                    self.unsubscribe(subscription)
+                    break
@@ -0,0 +1,39 @@
+from collections import namedtuple
+
+from flask import current_app
+
+from app.utils.lru import TTLCache
+
+UserProfile = namedtuple("UserProfile", ["id", "username", "email", "role"])
+
+
+class UserCache:
+    """Per-app cache of the user fields authenticated endpoints need.
+
+    Entries are dropped by ``invalidate`` when an admin edits or deletes a
+    user, and expire after USER_CACHE_TTL seconds so other workers pick up
+    the change too.
+    """
+
+    def init_app(self, app):
+        app.extensions["user_cache"] = TTLCache(
+            maxsize=app.config["USER_CACHE_SIZE"], ttl=app.config["USER_CACHE_TTL"])
+
+    @property
+    def _cache(self):
+        return current_app.extensions["user_cache"]
+
+    def get(self, user_id):
+        profile = self._cache.get(user_id)
+        if profile is None:
+            from app.models import db, User
+
+            user = db.session.get(User, user_id)
+            if user is None:
+                return None
+            profile = UserProfile(user.id, user.username, user.email, user.role)
+            self._cache.set(user_id, profile)
+        return profile
+
+    def invalidate(self, user_id):
+        self._cache.delete(user_id)
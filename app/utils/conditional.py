@@ -0,0 +1,30 @@
+import hashlib
+
+from flask import current_app, request
+from werkzeug.http import is_resource_modified
+
+
+def collection_etag(*parts):
+    """Derive an ETag from whatever identifies a collection's current state."""
+    raw = "\x1f".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def set_validators(response, etag, last_modified=None):
+    # Weak: the tag describes the rows, not the exact bytes of the body
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Clients and shared caches may store the body but must revalidate it
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified(etag, last_modified=None):
+    """Return a 304 response if the request's validators still match, else None.
+
+    If-None-Match wins over If-Modified-Since, as RFC 9110 requires.
+    """
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return set_validators(current_app.response_class(status=304), etag, last_modified)
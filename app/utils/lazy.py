@@ -0,0 +1,19 @@
+class Lazy:
+    """Stand-in for an object that is built on first attribute access.
+
+    Marshmallow schemas resolve their fields when instantiated (and the row
+    serializer compiles its dump function), so module-level instances make
+    every process that imports the routes pay for schemas it may never use.
+    Concurrent first uses may build the object twice; one of them is kept.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._obj = None
+
+    def __getattr__(self, name):
+        # Only reached for names the proxy itself does not define
+        obj = self._obj
+        if obj is None:
+            obj = self._obj = self._factory()
+        return getattr(obj, name)
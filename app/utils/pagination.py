@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def encode_cursor(*values):
+    """Pack the sort key of the last row on a page into an opaque token."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, *types):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return [datetime.fromisoformat(v) if t is datetime else t(v)
+                for v, t in zip(values, types)]
+    except (ValueError, TypeError):
+        raise PaginationError("Invalid cursor")
+
+
+def parse_limit(raw, default, maximum):
+    if raw is None:
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be positive")
+    return min(limit, maximum)
+
+
+def parse_datetime(raw, name):
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise PaginationError(f"{name} must be an ISO 8601 datetime")
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
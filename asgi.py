@@ -0,0 +1,22 @@
+"""ASGI entry point: the Flask app behind a2wsgi's thread pool adapter.
+
+    SERVER_MODE=asgi gunicorn      # uvicorn workers, see gunicorn.conf.py
+    uvicorn asgi:asgi_app          # single process, for local use
+
+The views stay synchronous (Flask-SQLAlchemy sessions are not async); the
+event loop owns the connections and hands each request to one of
+ASGI_THREADS threads, so slow clients and keep-alive connections do not tie
+up a thread. Needs the packages in requirements-asgi.txt.
+"""
+import os
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    raise ImportError(
+        "ASGI mode needs the optional dependencies: pip install -r requirements-asgi.txt"
+    ) from None
+
+from run import app
+
+asgi_app = WSGIMiddleware(app, workers=int(os.getenv("ASGI_THREADS", "16")))
@@ -0,0 +1,79 @@
+"""Compare POST /tickets latency with synchronous and batched audit writes.
+
+    python -m benchmarks.bench_audit --requests 2000 --concurrency 8
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_db_dir = tempfile.mkdtemp(prefix="bench-audit-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("FLASK_CONFIG", "ProductionConfig")
+
+from app import create_app  # noqa: E402
+from app.audit import get_audit_writer  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import AuditLog  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(app, mode, requests, concurrency):
+    app.config["AUDIT_MODE"] = mode
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench", "email": "bench@example.com", "password": "benchpass", "role": "user"
+    })
+    token = client.post("/auth/login", json={
+        "username": "bench", "password": "benchpass"
+    }).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def create(i):
+        start = time.perf_counter()
+        resp = app.test_client().post("/tickets", json={
+            "title": f"Benchmark ticket {i}",
+            "description": "Benchmark ticket description",
+        }, headers=headers)
+        assert resp.status_code == 201, resp.get_data(as_text=True)
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies = list(pool.map(create, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    if mode == "async":
+        get_audit_writer(app).flush()
+    with app.app_context():
+        assert AuditLog.query.count() == requests
+
+    ms = [latency * 1000 for latency in latencies]
+    print(f"{mode:>5}: {requests / elapsed:8.1f} req/s  "
+          f"p50 {statistics.median(ms):6.2f} ms  "
+          f"p95 {percentile(ms, 95):6.2f} ms  p99 {percentile(ms, 99):6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    app = create_app()
+    for mode in ("sync", "async"):
+        run(app, mode, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
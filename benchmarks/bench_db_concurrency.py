@@ -0,0 +1,103 @@
+"""Concurrent write load against one SQLite file, default vs tuned engine settings.
+
+Each process stands in for a gunicorn worker and creates/updates tickets
+through the Flask test client with several threads.
+
+    python -m benchmarks.bench_db_concurrency --processes 4 --threads 4 --requests 200
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def worker(config_name, db_url, token, requests, threads, results):
+    os.environ["FLASK_CONFIG"] = config_name
+    os.environ["DATABASE_URL"] = db_url
+    from app import create_app
+
+    app = create_app()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def write(i):
+        client = app.test_client()
+        try:
+            resp = client.post("/tickets", json={
+                "title": f"Load ticket {i}", "description": "Concurrent write test"
+            }, headers=headers)
+            if resp.status_code != 201:
+                return False
+            resp = client.put(f"/tickets/{resp.get_json()['id']}", json={"status": "resolved"},
+                              headers=headers)
+            return resp.status_code == 200
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(threads) as pool:
+        outcomes = list(pool.map(write, range(requests)))
+    results.put((outcomes.count(True), outcomes.count(False)))
+
+
+def setup(config_name, db_url, results):
+    os.environ["FLASK_CONFIG"] = config_name
+    os.environ["DATABASE_URL"] = db_url
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench", "email": "bench@example.com", "password": "benchpass", "role": "user"
+    })
+    results.put(client.post("/auth/login", json={
+        "username": "bench", "password": "benchpass"
+    }).get_json()["access_token"])
+
+
+def run(config_name, processes, threads, requests):
+    # Config classes read the environment at import time, so every app is
+    # built in a fresh process
+    db_dir = tempfile.mkdtemp(prefix="bench-db-")
+    db_url = f"sqlite:///{db_dir}/bench.db"
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=setup, args=(config_name, db_url, results))
+    proc.start()
+    token = results.get()
+    proc.join()
+
+    procs = [ctx.Process(target=worker,
+                         args=(config_name, db_url, token, requests, threads, results))
+             for _ in range(processes)]
+    started = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    totals = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - started
+
+    ok = sum(t[0] for t in totals)
+    failed = sum(t[1] for t in totals)
+    print(f"{config_name:<18} {ok * 2 / elapsed:8.1f} writes/s  "
+          f"{ok} ok  {failed} failed (locked/errors)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200, help="per process")
+    args = parser.parse_args()
+
+    for config_name in ("DevelopmentConfig", "ProductionConfig"):
+        run(config_name, args.processes, args.threads, args.requests)
+
+
+if __name__ == "__main__":
+    main()
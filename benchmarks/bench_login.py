@@ -0,0 +1,62 @@
+"""Measure /auth/login throughput for different password hash settings.
+
+    python -m benchmarks.bench_login --logins 200 --concurrency 4 \
+        --method scrypt:32768:8:1 --method pbkdf2:sha256:600000
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_db_dir = tempfile.mkdtemp(prefix="bench-login-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("FLASK_CONFIG", "ProductionConfig")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+def run(app, method, logins, concurrency):
+    app.config["PASSWORD_HASH_METHOD"] = method
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    username = "bench"
+    app.test_client().post("/auth/register", json={
+        "username": username, "email": "bench@example.com", "password": "benchpass", "role": "user"
+    })
+
+    def login(_):
+        resp = app.test_client().post("/auth/login", json={
+            "username": username, "password": "benchpass"
+        })
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    cores = min(concurrency, app.config["PASSWORD_HASH_WORKERS"], os.cpu_count() or 1)
+    rate = logins / elapsed
+    print(f"{method:<28} {rate:8.1f} logins/s  {rate / cores:8.1f} logins/s/core "
+          f"({cores} cores busy)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--method", action="append",
+                        help="werkzeug hash method (repeatable); defaults to the configured one")
+    args = parser.parse_args()
+
+    app = create_app()
+    for method in args.method or [app.config["PASSWORD_HASH_METHOD"]]:
+        run(app, method, args.logins, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Ticket latency during a login flood, with and without rate limiting.
+
+A gunicorn server (threads mode) serves GET /tickets to a steady set of
+clients while other threads flood POST /auth/login with bad passwords at a
+fixed rate. Without
+admission control every flood request costs a password hash and the ticket
+traffic queues behind them; with RATE_LIMIT_ENABLED the flood is answered
+with 429 before any view code runs. The cost of a single bucket check is
+measured in-process for both backends.
+
+    python -m benchmarks.bench_rate_limit --workers 2 --flooders 16 --flood-rate 200 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import timeit
+from collections import Counter
+
+from benchmarks.suite import HttpDriver, free_port, percentile, start_gunicorn
+
+
+def bucket_cost():
+    from app.rate_limit import MemoryBuckets, SQLiteBuckets
+
+    path = os.path.join(tempfile.mkdtemp(), "ratelimit.db")
+    for name, buckets in (("memory", MemoryBuckets()), ("sqlite", SQLiteBuckets(path))):
+        # A drained bucket: every call after the first is a rejection
+        runs = 20000
+        seconds = timeit.timeit(lambda: buckets.take("auth:ip:127.0.0.1", 0.001, 1, time.time()),
+                                number=runs)
+        print(f"{name:<7} bucket check {seconds / runs * 1e6:6.1f} us")
+
+
+def measure(port, tokens, seconds, readers, flooders, flood_rate, users):
+    driver = HttpDriver(port)
+    stop = threading.Event()
+    latencies, flood = [], Counter()
+
+    def read(i):
+        n = 0
+        while not stop.is_set():
+            # Spread over all users so no one exceeds their own ticket budget
+            n += 1
+            headers = {"Authorization": f"Bearer {tokens[(i * 7919 + n) % users + 1]}"}
+            start = time.perf_counter()
+            status = driver.request("GET", "/tickets?limit=50", None, headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert status == 200, status
+
+    def login(i):
+        # Open loop: an attacker sends at its own pace, however slow the answers
+        interval = flooders / flood_rate
+        n = 0
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            n += 1
+            body = {"username": f"user{(i * 7919 + n) % users + 1}", "password": "wrong"}
+            flood[driver.request("POST", "/auth/login", body, {})] += 1
+            next_at += interval
+            time.sleep(max(0, next_at - time.perf_counter()))
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=login, args=(i,)) for i in range(flooders)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return len(latencies) / seconds, percentile(latencies, 0.5), percentile(latencies, 0.95), flood
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--flooders", type=int, default=16)
+    parser.add_argument("--flood-rate", type=float, default=200, help="login attempts/s")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=20000)
+    args = parser.parse_args()
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from benchmarks.seed import seed
+
+    bucket_cost()
+
+    app = create_app()
+    seed(app, args.users, args.tickets, comments=0, audit=0)
+    with app.app_context():
+        tokens = {user: create_access_token(identity=str(user), additional_claims={"role": "user"})
+                  for user in range(1, args.users + 1)}
+
+    for label, flooders, env in (
+            ("no flood", 0, {"RATE_LIMIT_ENABLED": "0"}),
+            ("flood, unlimited", args.flooders, {"RATE_LIMIT_ENABLED": "0"}),
+            ("flood, memory", args.flooders, {"RATE_LIMIT_ENABLED": "1",
+                                              "RATE_LIMIT_BACKEND": "memory"}),
+            ("flood, sqlite", args.flooders, {"RATE_LIMIT_ENABLED": "1",
+                                              "RATE_LIMIT_BACKEND": "sqlite"})):
+        port = free_port()
+        proc = start_gunicorn(port, "--workers", str(args.workers), SERVER_MODE="threads",
+                              GUNICORN_THREADS=str(args.threads), METRICS_ENABLED="0",
+                              RESPONSE_CACHE_BACKEND="none",
+                              RATE_LIMIT_SQLITE_PATH=os.path.join(tempfile.mkdtemp(), "rl.db"),
+                              RATE_LIMIT_REQUIRE_PROXY="0", **env)
+        try:
+            throughput, p50, p95, flood = measure(port, tokens, args.seconds, args.readers,
+                                                  flooders, args.flood_rate, args.users)
+        finally:
+            proc.terminate()
+            proc.wait()
+        logins = ", ".join(f"{count} x {status}" for status, count in sorted(flood.items()))
+        print(f"{label:<17} tickets {throughput:7.1f} req/s  p50 {p50:8.2f} ms  "
+              f"p95 {p95:8.2f} ms  logins: {logins or '-'}")
+
+
+if __name__ == "__main__":
+    main()
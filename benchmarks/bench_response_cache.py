@@ -0,0 +1,86 @@
+"""Compare GET /tickets and GET /admin/users latency with and without the response cache.
+
+    python -m benchmarks.bench_response_cache --tickets 100000 --requests 500
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="bench-response-cache-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("FLASK_CONFIG", "ProductionConfig")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Ticket, User  # noqa: E402
+
+
+def seed(app, tickets, users, batch=10000):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        with db.engine.begin() as connection:
+            connection.execute(User.__table__.insert(), [
+                {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x"}
+                for i in range(users)
+            ])
+            now = datetime.utcnow()
+            for start in range(0, tickets, batch):
+                connection.execute(Ticket.__table__.insert(), [{
+                    "title": f"Ticket {n}",
+                    "description": "Seeded for the response cache benchmark",
+                    "status": "open",
+                    "priority": "medium",
+                    "created_at": now - timedelta(seconds=n),
+                    "updated_at": now,
+                    "last_activity_at": now - timedelta(seconds=n),
+                    "user_id": n % users + 1,
+                } for n in range(start, min(start + batch, tickets))])
+
+
+def admin_headers(client):
+    client.post("/auth/register", json={
+        "username": "benchadmin", "email": "benchadmin@example.com",
+        "password": "benchpass", "role": "admin",
+    })
+    token = client.post("/auth/login", json={
+        "username": "benchadmin", "password": "benchpass"
+    }).get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def measure(client, path, headers, requests):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        resp = client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert resp.status_code == 200
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    seed(create_app(), args.tickets, args.users)
+    paths = (f"/tickets?limit={args.limit}", "/admin/users")
+    headers = None
+    for backend in ("none", "memory"):
+        client = create_app({"RESPONSE_CACHE_BACKEND": backend}).test_client()
+        headers = headers or admin_headers(client)
+        for path in paths:
+            p50, p95 = measure(client, path, headers, args.requests)
+            print(f"{backend:>6} {path:<22} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure /tickets/search latency against a large seeded ticket table.
+
+    python -m benchmarks.bench_search --tickets 1000000 --queries 200
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="bench-search-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("FLASK_CONFIG", "ProductionConfig")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Ticket, User  # noqa: E402
+from app.search import reindex_tickets  # noqa: E402
+
+WORDS = (
+    "printer network laptop password vpn email outlook monitor keyboard mouse server "
+    "database backup restore license install update crash freeze slow error timeout "
+    "access denied account locked reset wifi router cable battery screen audio camera"
+).split()
+
+
+def seed(app, tickets, batch=10000):
+    rng = random.Random(42)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="bench", email="bench@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+
+        now = datetime.utcnow()
+        with db.engine.begin() as connection:
+            for start in range(0, tickets, batch):
+                connection.execute(Ticket.__table__.insert(), [{
+                    "title": " ".join(rng.choices(WORDS, k=4)),
+                    "description": " ".join(rng.choices(WORDS, k=20)),
+                    "status": "open",
+                    "priority": "medium",
+                    "created_at": now,
+                    "updated_at": now,
+                    "last_activity_at": now,
+                    "user_id": user.id,
+                } for _ in range(min(batch, tickets - start))])
+            reindex_tickets(connection)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    started = time.perf_counter()
+    seed(app, args.tickets)
+    print(f"seeded {args.tickets} tickets in {time.perf_counter() - started:.1f}s")
+
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "benchadmin", "email": "benchadmin@example.com",
+        "password": "benchpass", "role": "admin",
+    })
+    token = client.post("/auth/login", json={
+        "username": "benchadmin", "password": "benchpass"
+    }).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    rng = random.Random(7)
+    for words in (1, 2, 3):
+        latencies = []
+        for _ in range(args.queries):
+            q = " ".join(rng.sample(WORDS, words))
+            start = time.perf_counter()
+            resp = client.get("/tickets/search", query_string={"q": q, "limit": args.limit},
+                              headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert resp.status_code == 200
+        latencies.sort()
+        print(f"{words}-word queries: p50 {statistics.median(latencies):7.2f} ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
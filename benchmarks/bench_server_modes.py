@@ -0,0 +1,108 @@
+"""Compare gunicorn's sync, threads and asgi server modes under many concurrent connections.
+
+Each mode runs the same number of worker processes against one seeded
+database. The benchmark reports throughput and latency for list and login
+traffic, plus the resident memory of the whole server (master and workers).
+asgi mode is skipped when requirements-asgi.txt is not installed.
+
+    python -m benchmarks.bench_server_modes --workers 2 --connections 32 --requests 2000
+"""
+import argparse
+import importlib.util
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.suite import HttpDriver, free_port, percentile, start_gunicorn
+
+MODES = ("sync", "threads", "asgi")
+
+
+def rss_kb(pid):
+    """Resident memory of a process and all its descendants, in kB."""
+    total = 0
+    status = Path(f"/proc/{pid}/status").read_text()
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            total += int(line.split()[1])
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        for child in (task / "children").read_text().split():
+            total += rss_kb(int(child))
+    return total
+
+
+def load(driver, requests, connections, make_request):
+    latencies = []
+
+    def one(i):
+        method, path, body, headers = make_request(random.Random(i))
+        start = time.perf_counter()
+        status = driver.request(method, path, body, headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        return status < 400
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(connections) as pool:
+        ok = sum(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return requests / wall, percentile(latencies, 0.5), percentile(latencies, 0.95), ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8, help="threads mode, per worker")
+    parser.add_argument("--asgi-threads", type=int, default=8, help="asgi mode, per worker")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=20000)
+    args = parser.parse_args()
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from benchmarks.seed import seed
+
+    app = create_app()
+    seed(app, args.users, args.tickets, comments=0, audit=0)
+    with app.app_context():
+        tokens = {user: create_access_token(identity=str(user), additional_claims={"role": "user"})
+                  for user in range(1, args.users + 1)}
+
+    def list_tickets(rng):
+        headers = {"Authorization": f"Bearer {tokens[rng.randrange(args.users) + 1]}"}
+        return "GET", "/tickets?limit=50", None, headers
+
+    def login(rng):
+        user = rng.randrange(args.users) + 1
+        return "POST", "/auth/login", {"username": f"user{user}", "password": "benchpass"}, {}
+
+    for mode in MODES:
+        if mode == "asgi" and not (importlib.util.find_spec("a2wsgi")
+                                   and importlib.util.find_spec("uvicorn_worker")):
+            print(f"{mode:<8} skipped: pip install -r requirements-asgi.txt")
+            continue
+        port = free_port()
+        proc = start_gunicorn(port, "--workers", str(args.workers), SERVER_MODE=mode,
+                              GUNICORN_THREADS=str(args.threads),
+                              ASGI_THREADS=str(args.asgi_threads), METRICS_ENABLED="0")
+        try:
+            driver = HttpDriver(port)
+            idle = rss_kb(proc.pid)
+            for name, make_request, requests in (("list", list_tickets, args.requests),
+                                                  ("login", login, args.logins)):
+                throughput, p50, p95, ok = load(driver, requests, args.connections, make_request)
+                print(f"{mode:<8} {name:<6} {throughput:8.1f} req/s  p50 {p50:8.2f} ms  "
+                      f"p95 {p95:8.2f} ms  {requests - ok} failed")
+            print(f"{mode:<8} memory {idle / 1024:6.1f} MB idle, "
+                  f"{rss_kb(proc.pid) / 1024:6.1f} MB after load")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure worker startup: import time, create_app(), schema creation and first requests.
+
+Each sample runs in a fresh interpreter, like a newly booted worker. The
+gunicorn part times how long a server takes to answer its first request
+with and without --preload.
+
+    python -m benchmarks.bench_startup --runs 5 --workers 4
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.suite import free_port, start_gunicorn
+
+# Runs in the fresh interpreter; prints one JSON line of timings in ms
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+import run
+booted = time.perf_counter()
+from flask_jwt_extended import create_access_token
+with run.app.app_context():
+    token = create_access_token(identity="1", additional_claims={"role": "user"})
+client = run.app.test_client()
+timings = {"import_app": imported - start, "run_py": booted - imported}
+for name in ("first_request", "second_request"):
+    begin = time.perf_counter()
+    assert client.get("/tickets", headers={"Authorization": "Bearer " + token}).status_code == 200
+    timings[name] = time.perf_counter() - begin
+print(json.dumps({k: v * 1000 for k, v in timings.items()}))
+"""
+
+
+def probe(runs, **env):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], env={**os.environ, **env},
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+def time_to_first_response(workers, preload):
+    started = time.perf_counter()
+    proc = start_gunicorn(free_port(), "--workers", str(workers),
+                          GUNICORN_PRELOAD="1" if preload else "0", METRICS_ENABLED="0")
+    elapsed = time.perf_counter() - started
+    proc.terminate()
+    proc.wait()
+    return elapsed * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tickets", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app import create_app
+    from benchmarks.seed import seed
+
+    seed(create_app(), users=10, tickets=args.tickets, comments=0, audit=0)
+
+    for auto_create in ("1", "0"):
+        timings = probe(args.runs, AUTO_CREATE_SCHEMA=auto_create)
+        print(f"AUTO_CREATE_SCHEMA={auto_create}  " + "  ".join(
+            f"{key} {value:7.1f} ms" for key, value in timings.items()))
+
+    for preload in (False, True):
+        elapsed = statistics.median(
+            time_to_first_response(args.workers, preload) for _ in range(args.runs))
+        print(f"gunicorn --workers {args.workers} preload={str(preload):<5} "
+              f"first response after {elapsed:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
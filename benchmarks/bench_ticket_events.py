@@ -0,0 +1,141 @@
+"""Database load of N dashboards on GET /tickets/events versus N dashboards polling GET /tickets.
+
+One gunicorn worker (threads mode, one thread per dashboard plus spare)
+serves an admin writer that updates tickets at a steady rate, and either N
+pollers (GET /tickets every --interval seconds with If-None-Match) or N
+open event streams. SQL statements are counted from /metrics; the writer's
+own statements are measured alone first and subtracted. The response cache
+is off (RESPONSE_CACHE_BACKEND=none) unless --response-cache is given.
+
+    python -m benchmarks.bench_ticket_events --dashboards 50 --interval 2 --seconds 20
+"""
+import argparse
+import http.client
+import random
+import re
+import threading
+import time
+
+from benchmarks.suite import METRICS_HEADERS, HttpDriver, free_port, start_gunicorn
+
+
+def statements(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", "/metrics", headers=METRICS_HEADERS)
+    text = conn.getresponse().read().decode()
+    return float(re.search(r"^db_query_duration_seconds_count (\S+)$", text, re.M).group(1))
+
+
+def writer(driver, token, tickets, rate, stop):
+    # Unseeded: repeating an earlier phase's writes would change nothing
+    rng = random.Random()
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.wait(1 / rate):
+        driver.request("PUT", f"/tickets/{rng.randrange(tickets) + 1}",
+                       {"priority": rng.choice(("low", "medium", "high"))}, headers)
+
+
+def poller(driver, token, interval, stop, counts):
+    headers = {"Authorization": f"Bearer {token}"}
+    conn = None
+    etag = None
+    # Dashboards open at different moments
+    stop.wait(random.random() * interval)
+    while not stop.is_set():
+        if conn is None:
+            conn = http.client.HTTPConnection("127.0.0.1", driver.port)
+        try:
+            conn.request("GET", "/tickets?limit=50",
+                         headers={**headers, **({"If-None-Match": etag} if etag else {})})
+            resp = conn.getresponse()
+            resp.read()
+        except (http.client.HTTPException, OSError):
+            # gunicorn closes keep-alive connections idle for longer than --keep-alive
+            conn.close()
+            conn = None
+            continue
+        etag = resp.getheader("ETag") or etag
+        counts["requests"] += 1
+        counts["changed"] += resp.status == 200
+        stop.wait(interval)
+
+
+def listener(port, token, stop, counts):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("GET", "/tickets/events", headers={"Authorization": f"Bearer {token}"})
+    resp = conn.getresponse()
+    counts["requests"] += 1
+    # Heartbeats arrive every second, so this notices `stop` promptly
+    while not stop.is_set():
+        line = resp.readline()
+        if not line:
+            break
+        if line.startswith(b"event: "):
+            counts["changed"] += 1
+    conn.close()
+
+
+def phase(port, admin, args, target=None):
+    driver = HttpDriver(port)
+    stop = threading.Event()
+    counts = {"requests": 0, "changed": 0}
+    threads = [threading.Thread(target=writer,
+                                args=(driver, admin, args.tickets, args.writes, stop))]
+    for _ in range(args.dashboards if target else 0):
+        if target is poller:
+            threads.append(threading.Thread(
+                target=poller, args=(driver, admin, args.interval, stop, counts)))
+        else:
+            threads.append(threading.Thread(target=listener, args=(port, admin, stop, counts)))
+    for thread in threads:
+        thread.start()
+    # Let connections settle before counting
+    time.sleep(1)
+    before = statements(port)
+    time.sleep(args.seconds)
+    used = statements(port) - before
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return used / args.seconds, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dashboards", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=2.0, help="poll interval, seconds")
+    parser.add_argument("--writes", type=float, default=2.0, help="ticket updates per second")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--response-cache", action="store_true")
+    args = parser.parse_args()
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from benchmarks.seed import seed
+
+    app = create_app()
+    admin_id = seed(app, args.users, args.tickets, comments=0, audit=0)
+    with app.app_context():
+        admin = create_access_token(identity=str(admin_id), additional_claims={"role": "admin"})
+
+    port = free_port()
+    proc = start_gunicorn(port, "--workers", "1", SERVER_MODE="threads",
+                          GUNICORN_THREADS=str(args.dashboards + 8),
+                          RESPONSE_CACHE_BACKEND="memory" if args.response_cache else "none",
+                          RATE_LIMIT_ENABLED="0", TICKET_EVENTS_HEARTBEAT="1")
+    try:
+        baseline, _ = phase(port, admin, args)
+        print(f"writer alone        {baseline:8.1f} statements/s")
+        for name, target in (("pollers", poller), ("event streams", listener)):
+            used, counts = phase(port, admin, args, target)
+            print(f"{args.dashboards} {name:<16} {used - baseline:8.1f} statements/s over the "
+                  f"writer  ({counts['requests']} requests, {counts['changed']} updates seen)")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
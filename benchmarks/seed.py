@@ -0,0 +1,109 @@
+"""Seed a database with synthetic users, tickets, comments and audit rows.
+
+Uses DATABASE_URL / FLASK_CONFIG like the app. Every user's password is
+"benchpass" and user i (1-based) is "user<i>". Ticket n (1-based) belongs to
+user (n - 1) % users + 1, who also writes its comments. An admin
+"benchadmin" is added last.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.seed --tickets 100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import AuditLog, Comment, Ticket, User
+from app.models.comment import refresh_ticket_activity
+from app.models.ticket_stat import rebuild_ticket_stats
+from app.search import reindex_tickets
+from app.security import hash_password
+
+PASSWORD = "benchpass"
+STATUSES = ("open", "open", "open", "in_progress", "resolved")
+PRIORITIES = ("low", "medium", "medium", "high")
+WORDS = (
+    "printer network laptop password vpn email outlook monitor keyboard mouse server "
+    "database backup restore license install update crash freeze slow error timeout "
+    "access denied account locked reset wifi router cable battery screen audio camera"
+).split()
+
+
+def _batches(total, batch):
+    for start in range(0, total, batch):
+        yield range(start, min(start + batch, total))
+
+
+def seed(app, users=200, tickets=20000, comments=40000, audit=40000, batch=10000):
+    """Recreate the schema and fill it; returns the admin's user id."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        password_hash = hash_password(PASSWORD)
+
+        with db.engine.begin() as connection:
+            connection.execute(User.__table__.insert(), [
+                {"username": f"user{i}", "email": f"user{i}@example.com",
+                 "password_hash": password_hash, "role": "user"}
+                for i in range(1, users + 1)
+            ] + [{"username": "benchadmin", "email": "benchadmin@example.com",
+                  "password_hash": password_hash, "role": "admin"}])
+
+            for rows in _batches(tickets, batch):
+                connection.execute(Ticket.__table__.insert(), [{
+                    "title": " ".join(rng.choices(WORDS, k=4)),
+                    "description": " ".join(rng.choices(WORDS, k=20)),
+                    "status": rng.choice(STATUSES),
+                    "priority": rng.choice(PRIORITIES),
+                    "created_at": now - timedelta(minutes=tickets - n),
+                    "updated_at": now - timedelta(minutes=tickets - n),
+                    "last_activity_at": now - timedelta(minutes=tickets - n),
+                    "user_id": n % users + 1,
+                } for n in rows])
+
+            for rows in _batches(comments if tickets else 0, batch):
+                ticket_ids = [rng.randrange(tickets) + 1 for _ in rows]
+                connection.execute(Comment.__table__.insert(), [{
+                    "message": " ".join(rng.choices(WORDS, k=12)),
+                    "timestamp": now - timedelta(seconds=comments - n),
+                    "ticket_id": ticket_id,
+                    "user_id": (ticket_id - 1) % users + 1,
+                } for n, ticket_id in zip(rows, ticket_ids)])
+
+            for rows in _batches(audit, batch):
+                connection.execute(AuditLog.__table__.insert(), [{
+                    "action": rng.choice(("create_ticket", "update_ticket", "create_comment")),
+                    "timestamp": now - timedelta(seconds=audit - n),
+                    "actor_id": rng.randrange(users) + 1,
+                    "ticket_id": rng.randrange(tickets) + 1 if tickets else None,
+                } for n in rows])
+
+            # Core inserts skip the ORM flush hooks, so derived tables are rebuilt here
+            reindex_tickets(connection)
+            refresh_ticket_activity(connection)
+
+        rebuild_ticket_stats(db.session)
+        db.session.commit()
+        return users + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--comments", type=int, default=40000)
+    parser.add_argument("--audit", type=int, default=40000)
+    args = parser.parse_args()
+
+    from app import create_app
+
+    started = time.perf_counter()
+    seed(create_app(), args.users, args.tickets, args.comments, args.audit)
+    print(f"seeded {args.users} users, {args.tickets} tickets, {args.comments} comments, "
+          f"{args.audit} audit rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Benchmark the API's hot paths and compare them against stored baselines.
+
+Seeds a fresh database, then drives each scenario with concurrent clients,
+either in-process through the Flask test client or over HTTP against a real
+gunicorn server, and reports throughput, p50/p95/p99 latency and SQL
+statements per request.
+
+    python -m benchmarks.suite --mode client
+    python -m benchmarks.suite --mode gunicorn --workers 2 --threads 4
+    python -m benchmarks.suite --mode client --save-baseline
+    python -m benchmarks.suite --mode client --check --threshold 0.2
+
+--check exits with status 1 when a scenario's throughput drops by more than
+--threshold, its p50 or p95 latency grows by more than --latency-threshold
+(percentiles of concurrent clients are noisy, throughput much less so), it
+runs more SQL statements per request than the baseline did, or more of its
+requests fail. Throughput, latency and statements per request only count
+requests that succeeded; a fast 4xx would otherwise pass for an improvement.
+Timings only compare meaningfully on the machine that recorded the baseline.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp(prefix="bench-suite-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("FLASK_CONFIG", "ProductionConfig")
+# Measure the uncached paths unless --response-cache is given (set in main)
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+# All clients log in from 127.0.0.1; the limiter would reject most of them
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+# Statement counts are near-deterministic; the slack absorbs user-cache miss races
+QUERY_SLACK = 0.25
+# The suite runs ProductionConfig, which only serves /metrics with a token
+METRICS_TOKEN = "benchmark-metrics"
+METRICS_HEADERS = {"Authorization": f"Bearer {METRICS_TOKEN}"}
+# How often gunicorn workers publish their metrics to the other workers
+METRICS_SYNC_INTERVAL = 0.2
+
+
+class Scenario:
+    """One endpoint under load; ``request(rng)`` returns (method, path, body, user_id)."""
+
+    def __init__(self, name, endpoint, request):
+        self.name = name
+        self.endpoint = endpoint
+        self.request = request
+
+
+def scenarios(users, tickets):
+    def login(rng):
+        user = rng.randrange(users) + 1
+        return "POST", "/auth/login", {"username": f"user{user}", "password": "benchpass"}, None
+
+    def create_ticket(rng):
+        user = rng.randrange(users) + 1
+        return "POST", "/tickets", {
+            "title": "Benchmark ticket", "description": "Created by the benchmark suite",
+        }, user
+
+    def list_tickets(rng):
+        return "GET", "/tickets?limit=50", None, rng.randrange(users) + 1
+
+    def ticket_detail(rng):
+        ticket = rng.randrange(tickets) + 1
+        return "GET", f"/tickets/{ticket}", None, (ticket - 1) % users + 1
+
+    return [
+        Scenario("login", "auth.login", login),
+        Scenario("create_ticket", "ticket.create_ticket", create_ticket),
+        Scenario("list_tickets", "ticket.get_tickets", list_tickets),
+        Scenario("ticket_detail", "ticket.get_ticket", ticket_detail),
+    ]
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class ClientDriver:
+    """Requests through the Flask test client; counts SQL statements in-process.
+
+    Like /metrics, only statements run by the request's own thread count,
+    and only for requests that succeeded.
+    """
+
+    def __init__(self, app):
+        from sqlalchemy import event
+        from app.extensions import db
+
+        self.app = app
+        self._statements = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        if getattr(self._local, "counting", False):
+            self._local.statements += 1
+
+    def request(self, method, path, body, headers):
+        self._local.counting, self._local.statements = True, 0
+        try:
+            resp = self.app.test_client().open(path, method=method, json=body, headers=headers)
+        finally:
+            self._local.counting = False
+        if resp.status_code < 400:
+            with self._lock:
+                self._statements += self._local.statements
+        return resp.status_code
+
+    def statements(self, endpoint):
+        return self._statements
+
+
+class HttpDriver:
+    """Requests over keep-alive HTTP connections, one per client thread."""
+
+    def __init__(self, port):
+        self.port = port
+        self._local = threading.local()
+
+    def request(self, method, path, body, headers):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection("127.0.0.1", self.port)
+        headers = dict(headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        conn.request(method, path, body=payload, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status
+
+    def statements(self, endpoint):
+        # Needs METRICS_ENABLED; wait until every worker has published its numbers
+        time.sleep(2 * METRICS_SYNC_INTERVAL)
+        conn = http.client.HTTPConnection("127.0.0.1", self.port)
+        conn.request("GET", "/metrics", headers=METRICS_HEADERS)
+        text = conn.getresponse().read().decode()
+        # Successful requests only, as in ClientDriver
+        return sum(float(value) for status, value in re.findall(
+            rf'^http_request_db_queries_sum{{endpoint="{re.escape(endpoint)}",'
+            rf'status="(\d+)"}} (\S+)$', text, re.M) if int(status) < 400)
+
+
+def run_scenario(driver, scenario, tokens, requests, concurrency):
+    before = driver.statements(scenario.endpoint)
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal failures
+        method, path, body, user = scenario.request(random.Random(i))
+        headers = {"Authorization": f"Bearer {tokens[user]}"} if user else {}
+        start = time.perf_counter()
+        status = driver.request(method, path, body, headers)
+        elapsed = time.perf_counter() - start
+        with lock:
+            if status >= 400:
+                failures += 1
+            else:
+                latencies.append(elapsed * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    succeeded = len(latencies)
+    latencies = sorted(latencies) or [float("nan")]
+    return {
+        "throughput": round(succeeded / wall, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "queries_per_request": round(
+            (driver.statements(scenario.endpoint) - before) / max(succeeded, 1), 2),
+        "failures": failures,
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(port, *options, **env):
+    """Start gunicorn (settings from gunicorn.conf.py plus ``options``) and wait for it."""
+    # Metrics supply the statement counts; lock waits are expected, not worth logging
+    env = {**os.environ, "METRICS_ENABLED": "1", "METRICS_TOKEN": METRICS_TOKEN,
+           "METRICS_SYNC_INTERVAL": str(METRICS_SYNC_INTERVAL), "SLOW_QUERY_MS": "60000", **env}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}",
+         "--log-level", "warning", *options],
+        env=env, stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def compare(results, baseline, threshold, latency_threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if result[key] > base[key] * (1 + latency_threshold):
+                regressions.append(f"{name}: {key[:3]} {result[key]} ms "
+                                   f"vs baseline {base[key]} ms")
+        if result["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['throughput']} req/s vs baseline {base['throughput']} req/s")
+        if result["queries_per_request"] > base["queries_per_request"] + QUERY_SLACK:
+            regressions.append(f"{name}: {result['queries_per_request']} queries/request "
+                               f"vs baseline {base['queries_per_request']}")
+        if result["failures"] > base.get("failures", 0):
+            regressions.append(f"{name}: {result['failures']} failed requests "
+                               f"vs baseline {base.get('failures', 0)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("client", "gunicorn"), default="client")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--comments", type=int, default=40000)
+    parser.add_argument("--audit", type=int, default=40000)
+    parser.add_argument("--requests", type=int, default=300, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--scenario", action="append", help="run only these scenarios")
+    parser.add_argument("--response-cache", action="store_true")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--latency-threshold", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.response_cache:
+        os.environ["RESPONSE_CACHE_BACKEND"] = "memory"
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from benchmarks.seed import seed
+
+    app = create_app()
+    admin_id = seed(app, args.users, args.tickets, args.comments, args.audit)
+    with app.app_context():
+        tokens = {
+            user: create_access_token(identity=str(user), additional_claims={
+                "role": "admin" if user == admin_id else "user"})
+            for user in range(1, admin_id + 1)
+        }
+
+    proc = None
+    if args.mode == "gunicorn":
+        port = free_port()
+        proc = start_gunicorn(port, "--workers", str(args.workers),
+                              "--threads", str(args.threads), "run:app")
+        driver = HttpDriver(port)
+    else:
+        driver = ClientDriver(app)
+
+    results = {}
+    try:
+        for scenario in scenarios(args.users, args.tickets):
+            if args.scenario and scenario.name not in args.scenario:
+                continue
+            result = run_scenario(driver, scenario, tokens, args.requests, args.concurrency)
+            results[scenario.name] = result
+            print(f"{scenario.name:<14} {result['throughput']:8.1f} req/s  "
+                  f"p50 {result['p50_ms']:7.2f}  p95 {result['p95_ms']:7.2f}  "
+                  f"p99 {result['p99_ms']:7.2f} ms  "
+                  f"{result['queries_per_request']:5.2f} queries/req  "
+                  f"{result['failures']} failed")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save_baseline:
+        baselines.setdefault(args.mode, {}).update(results)
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"saved {args.mode} baseline to {args.baseline}")
+    if args.check:
+        regressions = compare(results, baselines.get(args.mode, {}), args.threshold,
+                              args.latency_threshold)
+        for line in regressions:
+            print("REGRESSION " + line)
+        if regressions:
+            sys.exit(1)
+        print("no regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
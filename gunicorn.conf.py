@@ -0,0 +1,63 @@
+"""Gunicorn settings, read automatically by `gunicorn` (see Procfile).
+
+SERVER_MODE picks the worker model:
+- sync (default): one request per worker process at a time
+- threads: gthread workers with GUNICORN_THREADS threads each
+- asgi: uvicorn workers serving asgi:asgi_app (requirements-asgi.txt)
+
+Worker count comes from WEB_CONCURRENCY and the port from PORT, as before.
+The app is imported once in the master and forked into the workers
+(GUNICORN_PRELOAD=0 turns that off). With METRICS_ENABLED the workers share
+their metrics through METRICS_MULTIPROC_DIR (a fresh temporary directory
+unless set), so /metrics adds up all of them.
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+SERVER_MODES = {
+    "sync": ("sync", "run:app"),
+    "threads": ("gthread", "run:app"),
+    "asgi": ("uvicorn_worker.UvicornWorker", "asgi:asgi_app"),
+}
+
+server_mode = os.getenv("SERVER_MODE", "sync")
+if server_mode not in SERVER_MODES:
+    raise ValueError(f"SERVER_MODE must be one of: {', '.join(SERVER_MODES)}")
+
+worker_class, wsgi_app = SERVER_MODES[server_mode]
+if server_mode == "threads":
+    threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1").lower() in ("1", "true", "yes")
+
+# Must be in the environment before the app (and its config) is imported
+_own_metrics_dir = not os.getenv("METRICS_MULTIPROC_DIR")
+if _own_metrics_dir:
+    os.environ["METRICS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+
+
+def on_starting(server):
+    # Files left by a previous run would be added to this run's numbers
+    for path in glob.glob(os.path.join(os.environ["METRICS_MULTIPROC_DIR"], "metrics-*.json*")):
+        os.remove(path)
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["METRICS_MULTIPROC_DIR"], ignore_errors=True)
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared with the
+    # workers; drop them without closing the master's sockets
+    run = sys.modules.get("run")
+    if run is None:
+        return
+    from app.extensions import db
+
+    with run.app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,49 @@
+"""add ticket full text search
+
+Revision ID: cdd342732a85
+Revises: a04a5af14c15
+Create Date: 2026-10-18 07:52:23.520695
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'cdd342732a85'
+down_revision = 'a04a5af14c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS ticket_search "
+            "USING fts5(title, description, comments, tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO ticket_search (rowid, title, description, comments) "
+            "SELECT t.id, t.title, t.description, "
+            "(SELECT group_concat(c.message, ' ') FROM comment c WHERE c.ticket_id = t.id) "
+            "FROM ticket t"
+        )
+    elif dialect == 'postgresql':
+        # Expression indexes matching the to_tsvector() calls in app/search.py
+        op.execute(
+            "CREATE INDEX ix_ticket_search_document ON ticket USING gin "
+            "(to_tsvector('english', title || ' ' || description))"
+        )
+        op.execute(
+            "CREATE INDEX ix_comment_search_document ON comment USING gin "
+            "(to_tsvector('english', message))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS ticket_search")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_comment_search_document")
+        op.execute("DROP INDEX IF EXISTS ix_ticket_search_document")
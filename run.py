@@ -5,9 +5,10 @@ from app.extensions import db
 app = create_app()
 
 
-with app.app_context():
-    db.create_all()
-    print(" Database tables created successfully.")
+if app.config["AUTO_CREATE_SCHEMA"]:
+    with app.app_context():
+        db.create_all()
+        print(" Database tables created successfully.")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,17 @@
+import os
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event
 from app import create_app
 from app.extensions import db
 from app.models import User, Ticket
 
+# The engine is built inside create_app(), so the test database has to be
+# selected before that call rather than patched into app.config afterwards.
+os.environ["FLASK_CONFIG"] = "TestingConfig"
+
+
 @pytest.fixture
 def app():
     app = create_app()
@@ -61,3 +70,38 @@ def login_user(client, register_user):
         assert token is not None, "No access_token in login response"
         return token
     return _login
+
+
+@pytest.fixture
+def query_budget(app):
+    """Fail if the wrapped block runs more SQL statements than allowed.
+
+        with query_budget(2):
+            client.get(...)
+    """
+    @contextmanager
+    def _budget(max_queries):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} queries exceeded the budget of {max_queries}:\n"
+            + "\n".join(statements)
+        )
+    return _budget
+
+
+@pytest.fixture
+def run_jobs(app):
+    """Run the queued background jobs that are due, in this thread; returns how many ran."""
+    from app.jobs import Worker
+
+    worker = Worker(app, concurrency=1, name="test-worker")
+    return worker.run_pending
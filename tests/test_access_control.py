@@ -142,3 +142,26 @@ def test_delete_ticket_forbidden(client, login_user, register_user):
     resp = client.delete(f"/tickets/{ticket_id}", headers={"Authorization": f"Bearer {admin_token}"})
     assert resp.status_code == 200
     assert resp.get_json()["msg"].startswith("Ticket deleted successfully")
+
+
+def test_demoted_admin_loses_access_with_the_same_token(client, login_user, register_user):
+    register_user("headadmin", "headadmin@example.com", "adminpass", role="admin")
+    token = login_user("headadmin", "headadmin@example.com", "adminpass")
+    head = {"Authorization": f"Bearer {token}"}
+    register_user("demoted", "demoted@example.com", "adminpass", role="admin")
+    token = login_user("demoted", "demoted@example.com", "adminpass")
+    demoted = {"Authorization": f"Bearer {token}"}
+    assert client.get("/admin/users", headers=demoted).status_code == 200
+    assert client.get("/tickets/changes", headers=demoted).status_code == 200
+
+    user_id = next(u["id"] for u in client.get("/admin/users", headers=head).get_json()
+                   if u["username"] == "demoted")
+    assert client.put(f"/admin/users/{user_id}", json={"role": "user"},
+                      headers=head).status_code == 200
+
+    # The token still says admin; the user row decides
+    assert client.get("/admin/users", headers=demoted).status_code == 403
+    resp = client.post("/tickets", json={
+        "title": "Someone else's", "description": "Created by the head admin"
+    }, headers=head)
+    assert client.get(f"/tickets/{resp.get_json()['id']}", headers=demoted).status_code == 403
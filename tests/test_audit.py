@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from app.audit import AuditWriter, get_audit_writer, load_spill, record_audit
+from app.extensions import db
+from app.models import AuditLog
+
+
+def _create_ticket(client, token):
+    resp = client.post("/tickets", json={
+        "title": "Audited ticket",
+        "description": "Description long enough"
+    }, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+    return resp.get_json()["id"]
+
+
+def test_sync_audit_is_written_with_the_request(client, login_user):
+    token = login_user()
+    ticket_id = _create_ticket(client, token)
+
+    entries = AuditLog.query.filter_by(ticket_id=ticket_id).all()
+    assert [e.action for e in entries] == ["create_ticket"]
+
+
+def test_async_audit_is_batched_after_commit(app, client, login_user):
+    app.config["AUDIT_MODE"] = "async"
+    token = login_user()
+    ticket_id = _create_ticket(client, token)
+    client.put(f"/tickets/{ticket_id}", json={"status": "resolved"},
+               headers={"Authorization": f"Bearer {token}"})
+
+    writer = get_audit_writer(app)
+    try:
+        writer.flush()
+        actions = [e.action for e in AuditLog.query.filter_by(ticket_id=ticket_id)
+                   .order_by(AuditLog.id)]
+        assert actions == ["create_ticket", "update_ticket"]
+    finally:
+        writer.close()
+
+
+def test_async_audit_dropped_on_rollback(app):
+    app.config["AUDIT_MODE"] = "async"
+    record_audit("create_ticket", actor_id=1, ticket_id=1)
+    db.session.rollback()
+    db.session.commit()
+
+    assert "audit_writer" not in app.extensions
+    assert AuditLog.query.count() == 0
+
+
+def test_full_queue_falls_back_to_inline_writes(app, monkeypatch):
+    writer = AuditWriter(app, max_queue=1, enqueue_timeout=0)
+    # No consumer thread: the first entry fills the queue, the rest must not be lost
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+
+    writer.submit([{"action": f"a{i}", "timestamp": None, "details": None,
+                    "actor_id": 1, "ticket_id": None} for i in range(3)])
+
+    assert [e.action for e in AuditLog.query.order_by(AuditLog.id)] == ["a1", "a2"]
+
+
+def test_failed_writes_are_retried_then_spilled(app, tmp_path, monkeypatch):
+    spill = str(tmp_path / "spill.ndjson")
+    writer = AuditWriter(app, write_retries=2, spill_path=spill, retry_delay=0)
+    entries = [{"action": f"a{i}", "timestamp": datetime(2026, 1, 1), "details": None,
+                "actor_id": 1, "ticket_id": None} for i in range(2)]
+
+    # A transient failure is retried
+    real_begin, failures = db.engine.begin, [1]
+
+    def flaky_begin():
+        if failures:
+            failures.pop()
+            raise RuntimeError("database unavailable")
+        return real_begin()
+
+    monkeypatch.setattr(type(db.engine), "begin", lambda engine: flaky_begin())
+    writer._write(entries[:1])
+    assert AuditLog.query.count() == 1
+
+    # A lasting one spills the entries, and they can be loaded later
+    failures.extend([1] * 3)
+    writer._write(entries[1:])
+    assert (writer.spilled, writer.dropped) == (1, 0)
+    monkeypatch.undo()
+    assert load_spill(db.session, spill) == 1
+    assert [(e.action, e.timestamp) for e in AuditLog.query.order_by(AuditLog.id)] == [
+        ("a0", datetime(2026, 1, 1)), ("a1", datetime(2026, 1, 1))]
+    assert load_spill(db.session, spill) == 0
+
+    # Nowhere to spill: counted as lost
+    writer.spill_path = str(tmp_path / "missing" / "dir" / "\0")
+    failures.extend([1] * 3)
+    monkeypatch.setattr(type(db.engine), "begin", lambda engine: flaky_begin())
+    writer._write(entries[:1])
+    assert writer.dropped == 1
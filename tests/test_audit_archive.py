@@ -0,0 +1,93 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from app.audit_archive import archive_audit, segments
+from app.commands import archive
+from app.extensions import db
+from app.models import AuditLog
+
+TIMESTAMPS = [
+    datetime(2025, 1, 5, 10, 0), datetime(2025, 1, 20, 9, 30), datetime(2025, 1, 20, 9, 30),
+    datetime(2025, 2, 1, 0, 0), datetime(2025, 3, 15, 12, 0),
+]
+
+
+@pytest.fixture
+def audit_rows(app, tmp_path):
+    app.config["AUDIT_ARCHIVE_DIR"] = str(tmp_path / "archive")
+    for i, timestamp in enumerate(TIMESTAMPS):
+        db.session.add(AuditLog(action="update_ticket", timestamp=timestamp,
+                                actor_id=1, ticket_id=i % 2 + 1))
+    # Recent enough to stay live
+    db.session.add(AuditLog(action="create_ticket", timestamp=datetime.utcnow(),
+                            actor_id=2, ticket_id=1))
+    db.session.commit()
+    return str(tmp_path / "archive")
+
+
+def test_archive_command_moves_aged_rows_into_monthly_segments(app, audit_rows):
+    result = app.test_cli_runner().invoke(archive, ["--older-than-days", "30",
+                                                    "--batch-size", "2"])
+    assert result.exit_code == 0, result.output
+    assert "Archived 5 audit rows" in result.output
+
+    assert [os.path.basename(p) for p in segments(audit_rows)] == [
+        "audit-2025-01.ndjson.gz", "audit-2025-02.ndjson.gz", "audit-2025-03.ndjson.gz"]
+    # January was written by two batches, i.e. two gzip members
+    with gzip.open(segments(audit_rows)[0], "rt") as lines:
+        january = [json.loads(line) for line in lines]
+    assert [e["timestamp"] for e in january] == [t.isoformat() for t in TIMESTAMPS[:3]]
+    assert [e.action for e in AuditLog.query.all()] == ["create_ticket"]
+
+    # Nothing left to move
+    result = app.test_cli_runner().invoke(archive, ["--older-than-days", "30"])
+    assert "Archived 0 audit rows" in result.output
+
+
+def test_failed_batch_leaves_rows_live_and_segments_unchanged(app, audit_rows, monkeypatch):
+    archive_audit(db.session, audit_rows, datetime(2025, 2, 1))
+    sizes = [os.path.getsize(p) for p in segments(audit_rows)]
+
+    def fail():
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(db.session, "commit", fail)
+    with pytest.raises(RuntimeError):
+        archive_audit(db.session, audit_rows, datetime(2025, 4, 1))
+    monkeypatch.undo()
+
+    assert [os.path.getsize(p) for p in segments(audit_rows)] == sizes
+    assert AuditLog.query.count() == 3
+
+
+def test_admin_audit_reads_archived_and_live_rows(app, client, register_user, login_user,
+                                                  audit_rows):
+    archive_audit(db.session, audit_rows, datetime(2025, 3, 1), batch_size=2)
+    register_user("auditadmin", "auditadmin@example.com", "adminpass", role="admin")
+    headers = {"Authorization": f"Bearer {login_user('auditadmin', 'auditadmin@example.com', 'adminpass')}"}
+
+    # Pages run oldest first across the archive and then the live table
+    seen, url = [], "/admin/audit?limit=2"
+    while url:
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200
+        seen += resp.get_json()
+        cursor = resp.headers.get("X-Next-Cursor")
+        url = f"/admin/audit?limit=2&cursor={cursor}" if cursor else None
+    assert [e["timestamp"][:10] for e in seen] == [
+        "2025-01-05", "2025-01-20", "2025-01-20", "2025-02-01", "2025-03-15",
+        datetime.utcnow().date().isoformat()]
+    assert len({e["id"] for e in seen}) == 6
+
+    resp = client.get("/admin/audit?since=2025-01-10T00:00:00&until=2025-03-20T00:00:00"
+                      "&ticket_id=1", headers=headers)
+    assert [e["timestamp"] for e in resp.get_json()] == [
+        "2025-01-20T09:30:00", "2025-03-15T12:00:00"]
+
+    assert client.get("/admin/audit?cursor=junk", headers=headers).status_code == 400
+    assert client.get("/admin/audit", headers={
+        "Authorization": f"Bearer {login_user()}"}).status_code == 403
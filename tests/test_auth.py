@@ -1,5 +1,13 @@
+import threading
 import uuid
 
+import pytest
+
+from app.extensions import db
+from app.models import User
+from app.security import HashPoolBusy, PasswordHasher
+
+
 def test_register_and_login(client, register_user):
     unique_id = uuid.uuid4().hex[:6]
     username = f"testuser_{unique_id}"
@@ -27,3 +35,84 @@ def test_register_and_login(client, register_user):
     # Login failure with wrong password
     resp = client.post("/auth/login", json={"username": username, "password": "wrong"})
     assert resp.status_code == 401
+
+
+def test_login_rehashes_password_when_method_changes(app, client, register_user):
+    register_user(username="rehashuser", email="rehash@example.com", password="testpass")
+    old_hash = User.query.filter_by(username="rehashuser").one().password_hash
+    assert old_hash.startswith("pbkdf2:sha256:1000$")
+
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"
+    resp = client.post("/auth/login", json={"username": "rehashuser", "password": "testpass"})
+    assert resp.status_code == 200
+
+    new_hash = User.query.filter_by(username="rehashuser").one().password_hash
+    assert new_hash.startswith("pbkdf2:sha256:2000$")
+
+    # The rehashed password still works and is not rehashed again
+    resp = client.post("/auth/login", json={"username": "rehashuser", "password": "testpass"})
+    assert resp.status_code == 200
+    assert User.query.filter_by(username="rehashuser").one().password_hash == new_hash
+
+
+def test_login_rejected_when_hash_pool_is_full(app, client, register_user, monkeypatch):
+    register_user(username="busyuser", email="busy@example.com", password="testpass")
+
+    def busy(self, fn, *args):
+        raise HashPoolBusy()
+
+    monkeypatch.setattr(PasswordHasher, "run", busy)
+    resp = client.post("/auth/login", json={"username": "busyuser", "password": "testpass"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+
+def test_password_hasher_admits_a_bounded_number_of_hashes():
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return threading.current_thread()
+
+    first = threading.Thread(target=hasher.run, args=(slow,))
+    first.start()
+    started.wait(5)
+    with pytest.raises(HashPoolBusy):
+        hasher.run(lambda: None)
+    release.set()
+    first.join()
+    # Hashes run on the caller's thread
+    assert hasher.run(slow) is threading.current_thread()
+
+
+def test_me_is_served_from_cache_and_invalidated_by_admin(app, client, login_user, register_user):
+    register_user("cacheadmin", "cacheadmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("cacheadmin", "cacheadmin@example.com", "adminpass")
+    token = login_user("cacheduser", "cached@example.com", "testpass")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.get("/auth/me", headers=headers)
+    assert resp.status_code == 200
+    user_id = resp.get_json()["id"]
+
+    # A change behind the cache's back is not visible until the entry expires...
+    User.query.filter_by(id=user_id).update({"email": "direct@example.com"})
+    db.session.commit()
+    assert client.get("/auth/me", headers=headers).get_json()["email"] == "cached@example.com"
+
+    # ...but admin edits invalidate it immediately
+    resp = client.put(f"/admin/users/{user_id}", json={"role": "admin"},
+                      headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.status_code == 200
+    profile = client.get("/auth/me", headers=headers).get_json()
+    assert profile["role"] == "admin"
+    assert profile["email"] == "direct@example.com"
+
+    resp = client.delete(f"/admin/users/{user_id}",
+                         headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.status_code == 200
+    resp = client.get("/auth/me", headers=headers)
+    assert resp.status_code == 401
+    assert resp.get_json()["msg"] == "User not found"
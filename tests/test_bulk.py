@@ -0,0 +1,69 @@
+from app.extensions import db
+from app.models import AuditLog, Ticket
+from app.models.ticket_stat import compute_ticket_stats, stored_ticket_stats
+
+
+def test_bulk_create_reports_per_item_results(client, login_user):
+    token = login_user()
+    items = [
+        {"title": "Bulk ticket one", "description": "Imported from email"},
+        {"title": "Bad", "description": "Too short title"},
+        {"title": "Bulk ticket two", "description": "Imported from email", "priority": "high"},
+    ]
+
+    resp = client.post("/tickets/bulk", json=items,
+                       headers={"Authorization": f"Bearer {token}"})
+
+    assert resp.status_code == 207
+    results = resp.get_json()
+    assert [r["status"] for r in results] == [201, 422, 201]
+    assert "title" in results[1]["errors"]
+
+    created = [db.session.get(Ticket, r["id"]) for r in results if r["status"] == 201]
+    assert [t.priority for t in created] == ["medium", "high"]
+    assert AuditLog.query.filter_by(action="create_ticket").count() == 2
+    # Bulk writes go through the same flush hooks as single-ticket writes
+    assert stored_ticket_stats(db.session) == compute_ticket_stats(db.session)
+
+
+def test_bulk_update_checks_each_item(client, login_user):
+    token = login_user()
+    other_token = login_user("bulkother", "bulkother@example.com", "testpass")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.post("/tickets/bulk", json=[
+        {"title": "Mine to close", "description": "Incident follow-up"},
+        {"title": "Also mine to close", "description": "Incident follow-up"},
+    ], headers=headers)
+    assert resp.status_code == 201
+    mine = [r["id"] for r in resp.get_json()]
+    resp = client.post("/tickets/bulk", json=[
+        {"title": "Somebody else's", "description": "Not yours to touch"},
+    ], headers={"Authorization": f"Bearer {other_token}"})
+    theirs = resp.get_json()[0]["id"]
+
+    resp = client.patch("/tickets/bulk", json=[
+        {"id": mine[0], "status": "resolved"},
+        {"id": mine[1], "status": "resolved", "priority": "urgent"},
+        {"id": theirs, "status": "resolved"},
+        {"id": 999999, "status": "resolved"},
+        {"status": "resolved"},
+    ], headers=headers)
+    assert resp.status_code == 207
+    assert [r["status"] for r in resp.get_json()] == [200, 422, 403, 404, 400]
+
+    assert db.session.get(Ticket, mine[0]).status == "resolved"
+    assert db.session.get(Ticket, mine[1]).status == "open"
+    assert db.session.get(Ticket, theirs).status == "open"
+
+
+def test_bulk_rejects_bad_payloads(app, client, login_user):
+    token = login_user()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.post("/tickets/bulk", json={"title": "x"}, headers=headers).status_code == 400
+    assert client.patch("/tickets/bulk", json=[], headers=headers).status_code == 400
+
+    app.config["TICKETS_BULK_MAX"] = 1
+    resp = client.post("/tickets/bulk", json=[{}, {}], headers=headers)
+    assert resp.status_code == 413
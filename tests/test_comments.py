@@ -0,0 +1,149 @@
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models import Comment, Ticket, TicketEvent
+
+
+def _ticket(client, token):
+    resp = client.post("/tickets", json={
+        "title": "Ticket with thread",
+        "description": "Conversation happens below"
+    }, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+    return resp.get_json()["id"]
+
+
+def test_comment_thread(client, login_user, register_user):
+    register_user("threadadmin", "threadadmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("threadadmin", "threadadmin@example.com", "adminpass")
+    token = login_user()
+    other_token = login_user("outsider", "outsider@example.com", "testpass")
+    ticket_id = _ticket(client, token)
+
+    for author, message in ((token, "First reply"), (admin_token, "Looking into it"),
+                            (token, "Thanks!")):
+        resp = client.post(f"/tickets/{ticket_id}/comments", json={"message": message},
+                           headers={"Authorization": f"Bearer {author}"})
+        assert resp.status_code == 201, resp.get_data(as_text=True)
+    assert resp.get_json()["author"]["username"] == "testuser"
+
+    resp = client.get(f"/tickets/{ticket_id}?limit=2", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    detail = resp.get_json()
+    assert detail["id"] == ticket_id
+    assert [c["message"] for c in detail["comments"]] == ["First reply", "Looking into it"]
+    assert detail["comments"][1]["author"]["username"] == "threadadmin"
+
+    resp = client.get(f"/tickets/{ticket_id}/comments?limit=2&cursor={detail['comments_next_cursor']}",
+                      headers={"Authorization": f"Bearer {token}"})
+    assert [c["message"] for c in resp.get_json()] == ["Thanks!"]
+    assert "X-Next-Cursor" not in resp.headers
+
+    # Only the owner and admins can read or post
+    resp = client.get(f"/tickets/{ticket_id}", headers={"Authorization": f"Bearer {other_token}"})
+    assert resp.status_code == 403
+    resp = client.post(f"/tickets/{ticket_id}/comments", json={"message": "Hi"},
+                       headers={"Authorization": f"Bearer {other_token}"})
+    assert resp.status_code == 403
+    resp = client.post(f"/tickets/{ticket_id}/comments", json={"message": ""},
+                       headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 422
+    assert client.get("/tickets/999999", headers={"Authorization": f"Bearer {token}"}).status_code == 404
+
+
+def test_ticket_detail_query_budget(client, login_user, register_user, query_budget):
+    token = login_user()
+    ticket_id = _ticket(client, token)
+
+    # Several distinct authors, so lazy-loading authors would cost one query each
+    authors = [token]
+    for i in range(4):
+        register_user(f"agent{i}", f"agent{i}@example.com", "agentpass", role="admin")
+        authors.append(login_user(f"agent{i}", f"agent{i}@example.com", "agentpass"))
+    for author in authors:
+        resp = client.post(f"/tickets/{ticket_id}/comments", json={"message": "Update"},
+                           headers={"Authorization": f"Bearer {author}"})
+        assert resp.status_code == 201
+
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/auth/me", headers=headers)  # warm the user cache
+
+    # The ticket, then its comments joined with their authors
+    with query_budget(2):
+        resp = client.get(f"/tickets/{ticket_id}", headers=headers)
+    assert len({c["author"]["id"] for c in resp.get_json()["comments"]}) == 5
+
+    with query_budget(2):
+        resp = client.get(f"/tickets/{ticket_id}/comments", headers=headers)
+    assert len(resp.get_json()) == 5
+
+
+def test_comment_counters_sort_ticket_lists(app, client, login_user):
+    token = login_user()
+    headers = {"Authorization": f"Bearer {token}"}
+    quiet, busy, recent = (_ticket(client, token) for _ in range(3))
+    created = db.session.get(Ticket, busy)
+    assert created.last_activity_at == created.created_at
+    edited = created.updated_at
+    for ticket_id, replies in ((busy, 3), (recent, 1)):
+        for _ in range(replies):
+            client.post(f"/tickets/{ticket_id}/comments", json={"message": "Reply"},
+                        headers=headers)
+
+    # Comments are activity, not edits
+    db.session.expire_all()
+    assert db.session.get(Ticket, busy).updated_at == edited
+
+    resp = client.get("/tickets", headers=headers)
+    etag = resp.headers["ETag"]
+    counts = {t["id"]: (t["comment_count"], t["last_activity_at"]) for t in resp.get_json()}
+    assert [counts[i][0] for i in (quiet, busy, recent)] == [0, 3, 1]
+    assert counts[recent][1] > counts[busy][1] > counts[quiet][1]
+
+    # Paging through the most active tickets
+    seen, url = [], "/tickets?sort=comment_count&limit=2"
+    while url:
+        resp = client.get(url, headers=headers)
+        seen += [t["id"] for t in resp.get_json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        url = cursor and f"/tickets?sort=comment_count&limit=2&cursor={cursor}"
+    assert seen == [busy, recent, quiet]
+    resp = client.get("/tickets?sort=last_activity_at", headers=headers)
+    assert [t["id"] for t in resp.get_json()] == [recent, busy, quiet]
+
+    # A cursor only continues the order it came from
+    cursor = client.get("/tickets?sort=comment_count&limit=1",
+                        headers=headers).headers["X-Next-Cursor"]
+    assert client.get(f"/tickets?cursor={cursor}", headers=headers).status_code == 400
+    assert client.get("/tickets?sort=title", headers=headers).status_code == 400
+
+    # A new comment changes the list, so a polling client gets it
+    client.post(f"/tickets/{quiet}/comments", json={"message": "Finally"}, headers=headers)
+    assert client.get("/tickets", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+    # Removing comments recomputes from what is left
+    for comment in Comment.query.filter_by(ticket_id=busy).order_by(Comment.id.desc()).limit(2):
+        db.session.delete(comment)
+    db.session.commit()
+    ticket = db.session.get(Ticket, busy)
+    first = Comment.query.filter_by(ticket_id=busy).one()
+    assert (ticket.comment_count, ticket.last_activity_at) == (1, first.timestamp)
+
+
+def test_deleting_a_ticket_deletes_its_comments(client, login_user, register_user):
+    register_user("deleteadmin", "deleteadmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("deleteadmin", "deleteadmin@example.com", "adminpass")
+    admin = {"Authorization": f"Bearer {admin_token}"}
+    token = login_user()
+    ticket_id = _ticket(client, token)
+    for message in ("First reply", "Second reply"):
+        client.post(f"/tickets/{ticket_id}/comments", json={"message": message},
+                    headers={"Authorization": f"Bearer {token}"})
+
+    resp = client.delete(f"/tickets/{ticket_id}", headers=admin)
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    assert Comment.query.filter_by(ticket_id=ticket_id).count() == 0
+    assert TicketEvent.query.filter_by(ticket_id=ticket_id, kind="deleted").count() == 1
+    assert db.session.execute(text("SELECT count(*) FROM ticket_search WHERE rowid = :id"),
+                              {"id": ticket_id}).scalar() == 0
+    assert client.get("/tickets/search?q=reply", headers=admin).get_json() == []
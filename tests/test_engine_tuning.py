@@ -0,0 +1,37 @@
+from sqlalchemy import event, text
+
+from app.engine_tuning import configure_engines
+from app.extensions import db
+
+
+def _tune(app, **config):
+    app.config.update(config)
+    configure_engines(app)
+    # Only new connections run the connect hook
+    db.engine.dispose()
+
+
+def test_sqlite_pragmas_applied_on_connect(app):
+    _tune(app, SQLITE_PRAGMAS={"synchronous": "NORMAL", "busy_timeout": 1234})
+
+    with db.engine.connect() as connection:
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+
+def test_write_requests_begin_immediate(app):
+    _tune(app, SQLITE_IMMEDIATE_WRITES=True)
+    db.create_all()
+
+    statements = []
+    event.listen(db.engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    with app.test_request_context("/tickets", method="POST"):
+        db.session.execute(text("SELECT 1"))
+        db.session.rollback()
+    with app.test_request_context("/tickets", method="GET"):
+        db.session.execute(text("SELECT 1"))
+        db.session.rollback()
+
+    assert [s for s in statements if s.startswith("BEGIN")] == ["BEGIN IMMEDIATE", "BEGIN"]
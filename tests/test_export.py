@@ -0,0 +1,55 @@
+import json
+
+
+def _create_tickets(client, token, count):
+    for i in range(count):
+        resp = client.post("/tickets", json={
+            "title": f"Export ticket {i}",
+            "description": "Description long enough"
+        }, headers={"Authorization": f"Bearer {token}"})
+        assert resp.status_code == 201
+
+
+def test_export_tickets_ndjson_and_json(client, login_user, register_user):
+    register_user("exportadmin", "exportadmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("exportadmin", "exportadmin@example.com", "adminpass")
+    _create_tickets(client, admin_token, 3)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    resp = client.get("/admin/export/tickets", headers=headers)
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    assert resp.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [r["title"] for r in rows] == [f"Export ticket {i}" for i in range(3)]
+
+    resp = client.get("/admin/export/tickets?format=json", headers=headers)
+    assert resp.mimetype == "application/json"
+    assert [r["id"] for r in resp.get_json()] == [r["id"] for r in rows]
+
+    resp = client.get("/admin/export/tickets?format=xml", headers=headers)
+    assert resp.status_code == 400
+
+
+def test_export_audit(client, login_user, register_user):
+    register_user("auditadmin", "auditadmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("auditadmin", "auditadmin@example.com", "adminpass")
+    user_token = login_user("audituser", "audituser@example.com", "userpass")
+    _create_tickets(client, user_token, 2)
+
+    resp = client.get("/admin/export/audit?format=json",
+                      headers={"Authorization": f"Bearer {admin_token}"})
+    entries = resp.get_json()
+    assert [e["action"] for e in entries] == ["create_ticket", "create_ticket"]
+
+    resp = client.get(f"/admin/export/audit?ticket_id={entries[0]['ticket_id']}",
+                      headers={"Authorization": f"Bearer {admin_token}"})
+    assert len(resp.get_data(as_text=True).splitlines()) == 1
+
+    resp = client.get("/admin/export/audit", headers={"Authorization": f"Bearer {user_token}"})
+    assert resp.status_code == 403
+
+    # An empty export is still a valid JSON document
+    resp = client.get("/admin/export/audit?format=json&since=2999-01-01T00:00:00",
+                      headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.get_json() == []
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import inspect, text
+
+from app.extensions import db
+
+
+def query_plan(sql, **params):
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("sql, params, index", [
+    # Owner's ticket list, newest first
+    ("SELECT * FROM ticket WHERE user_id = :uid ORDER BY created_at DESC, id DESC LIMIT 50",
+     {"uid": 1}, "ix_ticket_user_id_created_at"),
+    # Admin ticket list, newest first
+    ("SELECT * FROM ticket ORDER BY created_at DESC, id DESC LIMIT 50",
+     {}, "ix_ticket_created_at"),
+    # Admin triage view
+    ("SELECT * FROM ticket WHERE status = :status AND priority = :priority "
+     "ORDER BY created_at DESC LIMIT 50",
+     {"status": "open", "priority": "high"}, "ix_ticket_status_priority_created_at"),
+    # Most active tickets, per owner and across all tickets
+    ("SELECT * FROM ticket WHERE user_id = :uid ORDER BY comment_count DESC, id DESC LIMIT 50",
+     {"uid": 1}, "ix_ticket_user_id_comment_count"),
+    ("SELECT * FROM ticket ORDER BY last_activity_at DESC, id DESC LIMIT 50",
+     {}, "ix_ticket_last_activity_at"),
+    ("SELECT * FROM comment WHERE ticket_id = :tid ORDER BY timestamp",
+     {"tid": 1}, "ix_comment_ticket_id_timestamp"),
+    ("SELECT * FROM audit_log WHERE ticket_id = :tid ORDER BY timestamp",
+     {"tid": 1}, "ix_audit_log_ticket_id_timestamp"),
+    ("SELECT * FROM audit_log WHERE actor_id = :uid AND timestamp >= :since",
+     {"uid": 1, "since": datetime(2024, 1, 1)}, "ix_audit_log_actor_id_timestamp"),
+])
+def test_hot_queries_use_indexes(app, sql, params, index):
+    plan = query_plan(sql, **params)
+    assert index in plan, plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan, plan
+
+
+def test_migrations_create_model_indexes(app):
+    db.drop_all()
+    upgrade()
+
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        declared = {index.name for index in table.indexes}
+        migrated = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert declared <= migrated, f"{table.name} missing {declared - migrated}"
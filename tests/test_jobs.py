@@ -0,0 +1,182 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.commands import prune_jobs
+from app.extensions import db
+from app.jobs import Worker, enqueue, job
+from app.models import Job
+
+calls = []
+
+
+@job("test.record", max_attempts=3)
+def record(value):
+    calls.append(value)
+
+
+@job("test.flaky", max_attempts=2)
+def flaky(fail_times):
+    calls.append("attempt")
+    if calls.count("attempt") <= fail_times:
+        raise RuntimeError("temporary failure")
+
+
+@job("test.single", concurrency=1)
+def single():
+    calls.append("single")
+
+
+@job("test.chain")
+def chain(value):
+    enqueue("test.record", {"value": value})
+
+
+release = threading.Event()
+
+
+@job("test.slow", concurrency=1)
+def slow():
+    release.wait(5)
+
+
+def _job(job_id):
+    db.session.expire_all()
+    return db.session.get(Job, job_id)
+
+
+def test_enqueued_jobs_run_once_committed(app, run_jobs):
+    calls.clear()
+    job_id = enqueue("test.record", {"value": 42})
+    db.session.rollback()
+    assert run_jobs() == 0
+
+    job_id = enqueue("test.record", {"value": 42})
+    db.session.commit()
+    assert run_jobs() == 1
+    assert calls == [42]
+    job = _job(job_id)
+    assert (job.status, job.attempts, job.locked_by) == ("done", 1, None)
+    assert run_jobs() == 0
+
+
+def test_idempotency_key_returns_the_existing_job(app, run_jobs):
+    first = enqueue("test.record", {"value": 1}, idempotency_key="once")
+    second = enqueue("test.record", {"value": 2}, idempotency_key="once")
+    db.session.commit()
+    assert first == second
+    assert Job.query.count() == 1
+
+
+def test_failures_are_retried_with_backoff_then_marked_failed(app, run_jobs):
+    calls.clear()
+    retried = enqueue("test.flaky", {"fail_times": 1})
+    db.session.commit()
+
+    assert run_jobs() == 1
+    job = _job(retried)
+    assert job.status == "queued" and "temporary failure" in job.last_error
+    # Not due until the backoff has passed
+    assert job.run_at >= datetime.utcnow() + timedelta(seconds=app.config["JOBS_BACKOFF_BASE"] - 1)
+    assert run_jobs() == 0
+
+    job.run_at = datetime.utcnow()
+    db.session.commit()
+    assert run_jobs() == 1
+    assert (_job(retried).status, _job(retried).attempts) == ("done", 2)
+
+    calls.clear()
+    failing = enqueue("test.flaky", {"fail_times": 5})
+    db.session.commit()
+    run_jobs()
+    _job(failing).run_at = datetime.utcnow()
+    db.session.commit()
+    run_jobs()
+    job = _job(failing)
+    assert (job.status, job.attempts) == ("failed", 2)
+    assert job.finished_at is not None
+
+
+def test_concurrency_limit_and_expired_leases(app, run_jobs):
+    calls.clear()
+    running = enqueue("test.single")
+    waiting = enqueue("test.single")
+    db.session.commit()
+
+    # Another worker holds the first one
+    other = Worker(app, name="other-worker")
+    stale = other.claim()
+    assert stale[0] == running
+    assert run_jobs() == 0
+    assert _job(waiting).status == "queued"
+
+    # That worker died: once its lease expires the job is claimed again
+    lease = timedelta(seconds=app.config["JOBS_LEASE_SECONDS"])
+    _job(running).locked_at = datetime.utcnow() - lease - timedelta(seconds=1)
+    db.session.commit()
+    assert run_jobs() == 2
+    assert calls == ["single", "single"]
+    assert _job(running).attempts == 2
+    # The dead worker's late result does not overwrite ours
+    other.execute(stale)
+    assert _job(running).status == "done"
+
+    result = app.test_cli_runner().invoke(prune_jobs, ["--older-than-days", "-1"])
+    assert "Deleted 2 finished jobs" in result.output
+
+
+def test_work_of_a_run_that_lost_its_lease_is_rolled_back(app):
+    job_id = enqueue("test.chain", {"value": 7})
+    db.session.commit()
+    stale = Worker(app, name="other-worker").claim()
+    # Its lease expired and another worker claimed the job meanwhile
+    _job(job_id).locked_by = "new-worker:1"
+    db.session.commit()
+
+    assert Worker(app, name="other-worker").execute(stale) is False
+    assert (_job(job_id).status, _job(job_id).locked_by) == ("running", "new-worker:1")
+    assert Job.query.filter_by(name="test.record").count() == 0
+
+
+def test_admin_queues_maintenance_jobs(app, client, register_user, login_user, run_jobs):
+    register_user("jobadmin", "jobadmin@example.com", "adminpass", role="admin")
+    token = login_user("jobadmin", "jobadmin@example.com", "adminpass")
+    admin = {"Authorization": f"Bearer {token}"}
+
+    resp = client.post("/admin/jobs", json={"name": "search.reindex"},
+                       headers={**admin, "Idempotency-Key": "reindex-1"})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["id"]
+    assert resp.get_json()["status"] == "queued"
+    assert client.post("/admin/jobs", json={"name": "search.reindex"},
+                       headers={**admin, "Idempotency-Key": "reindex-1"}).get_json()["id"] == job_id
+
+    run_jobs()
+    assert client.get(f"/admin/jobs/{job_id}", headers=admin).get_json()["status"] == "done"
+
+    assert client.post("/admin/jobs", json={"name": "nope"}, headers=admin).status_code == 400
+    assert client.get("/admin/jobs/999", headers=admin).status_code == 404
+    assert client.post("/admin/jobs", json={"name": "search.reindex"}, headers={
+        "Authorization": f"Bearer {login_user()}"}).status_code == 403
+
+
+def test_running_jobs_keep_their_lease(app):
+    app.config["JOBS_LEASE_SECONDS"] = 0.3
+    release.clear()
+    job_id = enqueue("test.slow")
+    enqueue("test.slow")
+    db.session.commit()
+
+    worker, other = Worker(app, name="worker"), Worker(app, name="other-worker")
+    running = threading.Thread(target=worker.execute, args=(worker.claim(),))
+    running.start()
+    try:
+        # Well past the lease: the heartbeat keeps it, so the job is neither
+        # claimed again nor left out of the concurrency count
+        time.sleep(1)
+        assert other.claim() is None
+    finally:
+        release.set()
+        running.join()
+    job = _job(job_id)
+    assert (job.status, job.attempts) == ("done", 1)
@@ -0,0 +1,88 @@
+import logging
+import os
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.config import ProductionConfig
+from app.metrics import _before_cursor_execute
+
+
+@pytest.fixture
+def metrics_app():
+    app = create_app({"METRICS_ENABLED": True, "SLOW_QUERY_MS": 0})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_metrics_endpoint_reports_requests_queries_and_hashing(metrics_app, caplog, monkeypatch):
+    # The migrations' logging fileConfig disables loggers created before it ran
+    monkeypatch.setattr(logging.getLogger("app.metrics"), "disabled", False)
+    client = metrics_app.test_client()
+    client.post("/auth/register", json={
+        "username": "metricsuser", "email": "metrics@example.com",
+        "password": "secret-password", "role": "user"
+    })
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        token = client.post("/auth/login", json={
+            "username": "metricsuser", "password": "secret-password"
+        }).get_json()["access_token"]
+    client.get("/tickets", headers={"Authorization": f"Bearer {token}"})
+
+    # Every statement counts as slow here; its parameters are logged by type only
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert slow
+    assert not any("metricsuser" in message for message in slow)
+    assert any("['str', 'int'" in message for message in slow)
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert ('http_request_duration_seconds_count'
+            '{endpoint="ticket.get_tickets",method="GET",status="200"} 1') in body
+    assert 'http_request_db_queries_count{endpoint="auth.login",status="200"} 1' in body
+    assert 'password_hash_duration_seconds_count{operation="verify"} 1' in body
+    assert 'password_hash_duration_seconds_count{operation="hash"} 1' in body
+    assert "serialization_duration_seconds_count" in body
+    assert 'response_cache_requests_total{result="miss"} 1' in body
+
+
+def test_metrics_disabled_installs_nothing(app, client):
+    assert "metrics" not in app.extensions
+    assert client.get("/metrics").status_code == 404
+    assert not event.contains(db.engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def test_metrics_needs_the_token_when_one_is_set():
+    app = create_app({"METRICS_ENABLED": True, "METRICS_TOKEN": "scrape-secret"})
+    client = app.test_client()
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+
+
+def test_production_refuses_metrics_without_a_token(monkeypatch):
+    monkeypatch.setenv("FLASK_CONFIG", "ProductionConfig")
+    monkeypatch.setattr(ProductionConfig, "METRICS_TOKEN", None)
+    with pytest.raises(RuntimeError, match="METRICS_TOKEN"):
+        create_app({"METRICS_ENABLED": True})
+
+
+def test_metrics_add_up_all_workers(tmp_path):
+    apps = [create_app({"METRICS_ENABLED": True, "METRICS_MULTIPROC_DIR": str(tmp_path)})
+            for _ in range(2)]
+    for app in apps:
+        with app.app_context():
+            db.create_all()
+        app.test_client().get("/tickets")
+    # Stand-in for another worker process: its snapshot lands under another pid
+    apps[1].extensions["metrics_files"].write()
+    (tmp_path / f"metrics-{os.getpid()}.json").rename(tmp_path / "metrics-1.json")
+
+    body = apps[0].test_client().get("/metrics").get_data(as_text=True)
+    assert ('http_request_duration_seconds_count'
+            '{endpoint="ticket.get_tickets",method="GET",status="401"} 2') in body
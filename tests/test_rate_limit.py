@@ -0,0 +1,96 @@
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.rate_limit import MemoryBuckets, SQLiteBuckets
+from app.user_cache import UserCache
+
+
+@pytest.fixture
+def limited_app(tmp_path):
+    app = create_app({
+        "RATE_LIMIT_ENABLED": True,
+        "RATE_LIMITS": {
+            "auth": {"ip": (0.01, 20), "identity": (0.01, 3)},
+            "ticket": {"identity": (0.01, 4)},
+        },
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.mark.parametrize("make", [MemoryBuckets, lambda: SQLiteBuckets(":memory:")])
+def test_token_bucket_refills_at_rate_up_to_burst(make):
+    buckets = make()
+    assert [buckets.take("k", 2, 3, 100.0)[0] for _ in range(4)] == [True, True, True, False]
+    allowed, tokens = buckets.take("k", 2, 3, 100.0)
+    assert not allowed and tokens == pytest.approx(0)
+    # Half a second at 2 tokens/s buys one request
+    assert buckets.take("k", 2, 3, 100.5)[0]
+    assert not buckets.take("k", 2, 3, 100.5)[0]
+    # Idle time never banks more than the burst
+    assert [buckets.take("k", 2, 3, 200.0)[0] for _ in range(4)] == [True, True, True, False]
+    assert buckets.take("other", 2, 3, 200.0)[0]
+
+
+def test_sqlite_buckets_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first, second = SQLiteBuckets(path), SQLiteBuckets(path)
+    assert first.take("k", 1, 2, 10.0)[0]
+    assert second.take("k", 1, 2, 10.0)[0]
+    assert not first.take("k", 1, 2, 10.0)[0]
+
+
+def test_login_flood_gets_429_without_touching_other_blueprints(limited_app, monkeypatch):
+    client = limited_app.test_client()
+    client.post("/auth/register", json={
+        "username": "flooded", "email": "flooded@example.com",
+        "password": "testpass", "role": "user"
+    })
+    token = client.post("/auth/login", json={
+        "username": "flooded", "password": "testpass"
+    }).get_json()["access_token"]
+
+    # Per-identity budget on the account being tried (register + login used 2)
+    assert client.post("/auth/login", json={
+        "username": "Flooded", "password": "wrong"
+    }).status_code == 401
+    resp = client.post("/auth/login", json={"username": "flooded", "password": "testpass"})
+    assert resp.status_code == 429
+    assert resp.get_json() == {"msg": "Too many requests"}
+    assert int(resp.headers["Retry-After"]) > 0
+    # Other accounts still have their own budget
+    assert client.post("/auth/login", json={
+        "username": "someoneelse", "password": "x"
+    }).status_code == 401
+    # The flood can't lock the account owner out from their own address
+    resp = limited_app.test_client().post(
+        "/auth/login", json={"username": "flooded", "password": "testpass"},
+        environ_base={"REMOTE_ADDR": "10.0.0.2"})
+    assert resp.status_code == 200
+
+    # Ticket budgets are per user and independent of the auth flood
+    headers = {"Authorization": f"Bearer {token}"}
+    assert [client.get("/tickets", headers=headers).status_code for _ in range(4)] == [200] * 4
+    # Refused before the token's user is looked up
+    monkeypatch.setattr(UserCache, "get", lambda self, user_id: pytest.fail("user lookup"))
+    assert client.get("/tickets", headers=headers).status_code == 429
+    # Bad tokens are still reported by the view, not the limiter
+    assert client.get("/tickets", headers={"Authorization": "Bearer junk"}).status_code == 422
+
+
+def test_rate_limit_disabled_by_default(app, client):
+    assert "rate_limit" not in app.extensions
+    assert all(client.post("/auth/login", json={"username": "x", "password": "y"}).status_code == 401
+               for _ in range(30))
+
+
+def test_rate_limiting_without_proxy_hops_refuses_to_start():
+    with pytest.raises(RuntimeError, match="PROXY_FIX_X_FOR"):
+        create_app({"RATE_LIMIT_ENABLED": True, "RATE_LIMIT_REQUIRE_PROXY": True})
+    app = create_app({"RATE_LIMIT_ENABLED": True, "RATE_LIMIT_REQUIRE_PROXY": True,
+                      "PROXY_FIX_X_FOR": 1})
+    assert "rate_limit" in app.extensions
@@ -0,0 +1,65 @@
+import pytest
+
+from app import create_app
+from app.extensions import db
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+        "SQLALCHEMY_BINDS": {"replica": f"sqlite:///{tmp_path / 'replica.db'}"},
+        "REPLICA_STICKY_SECONDS": 60,
+        "RESPONSE_CACHE_BACKEND": "none",
+    })
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines["replica"])
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_reads_go_to_replica_except_right_after_own_writes(replica_app):
+    client = replica_app.test_client()
+    client.post("/auth/register", json={
+        "username": "replicauser", "email": "replica@example.com",
+        "password": "testpass", "role": "user"
+    })
+    token = client.post("/auth/login", json={
+        "username": "replicauser", "password": "testpass"
+    }).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.post("/tickets", json={
+        "title": "Written to primary", "description": "Replica has not seen this yet"
+    }, headers=headers)
+    assert resp.status_code == 201
+
+    # Sticky window after our own write: served by the primary
+    assert len(client.get("/tickets", headers=headers).get_json()) == 1
+
+    # Another worker (no entry in its process cache) sees the window in the cookie
+    replica_app.extensions["replica_sticky"].clear()
+    assert len(client.get("/tickets", headers=headers).get_json()) == 1
+
+    # Once the window has passed the (never replicated) replica answers
+    client.delete_cookie("replica_sticky")
+    assert client.get("/tickets", headers=headers).get_json() == []
+    client.set_cookie("replica_sticky", "forged")
+    assert client.get("/tickets", headers=headers).get_json() == []
+
+    # Writes always go to the primary
+    with db.engines["replica"].connect() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM ticket").scalar() == 0
+    with db.engines[None].connect() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM ticket").scalar() == 1
+
+
+def test_without_replica_everything_uses_primary(app, client, login_user):
+    assert "replica_sticky" not in app.extensions
+    token = login_user()
+    client.post("/tickets", json={"title": "Primary only", "description": "No replica here"},
+                headers={"Authorization": f"Bearer {token}"})
+    assert len(client.get("/tickets", headers={"Authorization": f"Bearer {token}"}).get_json()) == 1
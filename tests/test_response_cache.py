@@ -0,0 +1,92 @@
+from app.extensions import response_cache
+from app.response_cache import MemoryBackend
+
+
+def test_ticket_list_is_cached_per_scope_and_invalidated_by_writes(
+        app, client, register_user, login_user, query_budget):
+    register_user("cacheadmin", "cacheadmin@example.com", "adminpass", role="admin")
+    admin = {"Authorization": f"Bearer {login_user('cacheadmin', 'cacheadmin@example.com', 'adminpass')}"}
+    user = {"Authorization": f"Bearer {login_user()}"}
+
+    resp = client.post("/tickets", json={
+        "title": "Cached ticket", "description": "Listed from the cache"
+    }, headers=user)
+    ticket_id = resp.get_json()["id"]
+
+    first = client.get("/tickets", headers=user)
+    assert first.headers["X-Cache"] == "MISS"
+    with query_budget(0):
+        second = client.get("/tickets", headers=user)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    # Cached 304s need no queries either
+    with query_budget(0):
+        resp = client.get("/tickets", headers={**user, "If-None-Match": first.headers["ETag"]})
+    assert resp.status_code == 304
+
+    # Query parameters and callers get their own entries
+    assert client.get("/tickets?status=open", headers=user).headers["X-Cache"] == "MISS"
+    assert client.get("/tickets", headers=admin).headers["X-Cache"] == "MISS"
+    assert client.get("/tickets", headers=admin).headers["X-Cache"] == "HIT"
+
+    # An admin's update drops the owner's and the admin's lists
+    client.put(f"/tickets/{ticket_id}", json={"status": "closed"}, headers=admin)
+    resp = client.get("/tickets", headers=user)
+    assert resp.headers["X-Cache"] == "MISS"
+    assert resp.get_json()[0]["status"] == "closed"
+    assert client.get("/tickets", headers=admin).headers["X-Cache"] == "MISS"
+
+    client.delete(f"/tickets/{ticket_id}", headers=admin)
+    assert client.get("/tickets", headers=user).get_json() == []
+
+    with app.app_context():
+        stats = response_cache.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 6
+
+
+def test_escaped_query_values_do_not_share_entries(client, login_user):
+    user = {"Authorization": f"Bearer {login_user()}"}
+    client.post("/tickets", json={
+        "title": "Urgent ticket", "description": "Listed by two queries", "priority": "high"
+    }, headers=user)
+
+    # One filter value that merely looks like two parameters matches nothing
+    resp = client.get("/tickets?priority=high%26status%3Dopen", headers=user)
+    assert resp.get_json() == []
+    resp = client.get("/tickets?priority=high&status=open", headers=user)
+    assert resp.headers["X-Cache"] == "MISS"
+    assert len(resp.get_json()) == 1
+
+
+def test_user_list_is_invalidated_by_user_changes(client, register_user, login_user):
+    register_user("cacheadmin", "cacheadmin@example.com", "adminpass", role="admin")
+    admin = {"Authorization": f"Bearer {login_user('cacheadmin', 'cacheadmin@example.com', 'adminpass')}"}
+
+    client.get("/admin/users", headers=admin)
+    assert client.get("/admin/users", headers=admin).headers["X-Cache"] == "HIT"
+
+    register_user("newcomer", "newcomer@example.com", "password1")
+    users = client.get("/admin/users", headers=admin).get_json()
+    newcomer = next(u for u in users if u["username"] == "newcomer")
+
+    client.put(f"/admin/users/{newcomer['id']}", json={"role": "agent"}, headers=admin)
+    users = client.get("/admin/users", headers=admin).get_json()
+    assert next(u for u in users if u["id"] == newcomer["id"])["role"] == "agent"
+
+    client.delete(f"/admin/users/{newcomer['id']}", headers=admin)
+    users = client.get("/admin/users", headers=admin).get_json()
+    assert all(u["id"] != newcomer["id"] for u in users)
+
+
+def test_memory_backend_generations_outlive_evicted_entries():
+    backend = MemoryBackend(maxsize=1, ttl=60)
+    backend.bump("tickets")
+    backend.set("a", {"body": "1"}, ttl=60)
+    backend.set("b", {"body": "2"}, ttl=60)
+    assert backend.get("a") is None
+    assert backend.get("b") == {"body": "2"}
+    assert backend.generation("tickets") == 1
+    assert backend.generation("users") == 0
@@ -0,0 +1,50 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Ticket, User
+from app.schemas.ticket_schema import TicketSchema, ticket_row_serializer
+
+
+def _seed_tickets():
+    user = User(username="serializer", email="serializer@example.com")
+    user.set_password("secret")
+    db.session.add(user)
+    db.session.flush()
+
+    db.session.add_all([
+        Ticket(title="Plain ticket", description="Nothing special here", user_id=user.id),
+        Ticket(title="Unicode ✓ ticket", description="Ümlauts, \"quotes\" and\nnewlines",
+               priority="high", status="resolved", user_id=user.id,
+               created_at=datetime(2024, 2, 29, 23, 59, 59, 999999),
+               updated_at=datetime(2024, 3, 1)),
+        Ticket(title="Null priority", description="Priority left empty",
+               priority=None, user_id=user.id),
+    ])
+    db.session.commit()
+
+
+def test_row_serializer_matches_schema_dump(app):
+    _seed_tickets()
+
+    tickets = Ticket.query.order_by(Ticket.id).all()
+    rows = db.session.execute(
+        select(*ticket_row_serializer.columns).order_by(Ticket.id)
+    ).all()
+
+    expected = TicketSchema(many=True).dump(tickets)
+    actual = ticket_row_serializer.dump(rows)
+
+    assert json.dumps(actual) == json.dumps(expected)
+    assert app.json.dumps(actual) == app.json.dumps(expected)
+
+
+def test_row_serializer_covers_every_dump_field():
+    schema_fields = list(TicketSchema().dump_fields)
+    assert [column.key for column in ticket_row_serializer.columns] == schema_fields
+
+
+def test_row_serializer_empty():
+    assert ticket_row_serializer.dump([]) == []
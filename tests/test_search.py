@@ -0,0 +1,72 @@
+from app.extensions import db
+from app.models import Comment
+from app.search import fts_query
+
+
+def _create(client, token, title, description):
+    resp = client.post("/tickets", json={"title": title, "description": description},
+                       headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+    return resp.get_json()
+
+
+def _search(client, token, query):
+    resp = client.get("/tickets/search", query_string={"q": query},
+                      headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    return [t["id"] for t in resp.get_json()]
+
+
+def test_search_matches_titles_descriptions_and_comments(client, login_user, register_user):
+    register_user("searchadmin", "searchadmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("searchadmin", "searchadmin@example.com", "adminpass")
+    token = login_user("searcher", "searcher@example.com", "testpass")
+    other_token = login_user("otherseeker", "otherseeker@example.com", "testpass")
+
+    printer = _create(client, token, "Printer jammed", "Paper stuck in tray two")
+    vpn = _create(client, token, "VPN drops", "Connection resets every hour")
+    other = _create(client, other_token, "Printer toner", "Toner cartridge is empty")
+
+    assert _search(client, token, "printer") == [printer["id"]]
+    assert _search(client, token, "connect") == [vpn["id"]]  # prefix match
+    assert sorted(_search(client, admin_token, "printer")) == sorted([printer["id"], other["id"]])
+
+    # Comments are indexed when they are added
+    db.session.add(Comment(message="Replaced the wireless router", user_id=vpn["user_id"],
+                           ticket_id=vpn["id"]))
+    db.session.commit()
+    assert _search(client, token, "wireless router") == [vpn["id"]]
+
+    # Edits and deletes keep the index in step
+    client.put(f"/tickets/{printer['id']}", json={"title": "Scanner offline"},
+               headers={"Authorization": f"Bearer {token}"})
+    assert _search(client, token, "scanner") == [printer["id"]]
+    assert _search(client, token, "printer") == []
+
+    client.delete(f"/tickets/{other['id']}", headers={"Authorization": f"Bearer {admin_token}"})
+    assert _search(client, admin_token, "toner") == []
+
+
+def test_search_pagination_and_validation(client, login_user):
+    token = login_user()
+    for i in range(3):
+        _create(client, token, f"Laptop issue {i}", "Laptop will not boot")
+
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = client.get("/tickets/search?q=laptop&limit=2", headers=headers)
+    first_page = [t["id"] for t in resp.get_json()]
+    cursor = resp.headers["X-Next-Cursor"]
+    resp = client.get(f"/tickets/search?q=laptop&limit=2&cursor={cursor}", headers=headers)
+    second_page = [t["id"] for t in resp.get_json()]
+    assert len(first_page) == 2 and len(second_page) == 1
+    assert not set(first_page) & set(second_page)
+
+    assert client.get("/tickets/search", headers=headers).status_code == 400
+    # Query syntax characters are treated as plain text
+    assert len(_search(client, token, 'laptop" (')) == 3
+    assert _search(client, token, "***") == []
+
+
+def test_fts_query_quotes_words():
+    assert fts_query('foo "bar" baz') == '"foo" "bar" "baz"*'
+    assert fts_query("?!") is None
@@ -70,3 +70,103 @@ def test_delete_ticket_forbidden(client, login_user, register_user):
     resp = client.delete(f"/tickets/{ticket_id}", headers={"Authorization": f"Bearer {admin_token}"})
     assert resp.status_code == 200
     assert resp.get_json()["msg"].startswith("Ticket deleted successfully")
+
+
+def test_get_tickets_cursor_pagination(client, login_user):
+    token = login_user()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    created = []
+    for i in range(5):
+        resp = client.post("/tickets", json={
+            "title": f"Paged ticket {i}",
+            "description": "Description long enough"
+        }, headers=headers)
+        assert resp.status_code == 201, resp.get_data(as_text=True)
+        created.append(resp.get_json()["id"])
+
+    # Walk the pages and make sure every ticket is seen exactly once, newest first
+    seen = []
+    url = "/tickets?limit=2"
+    while True:
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200
+        page = resp.get_json()
+        assert len(page) <= 2
+        seen.extend(t["id"] for t in page)
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        url = f"/tickets?limit=2&cursor={cursor}"
+
+    assert seen == sorted(created, reverse=True)
+
+    resp = client.get("/tickets?cursor=not-a-cursor", headers=headers)
+    assert resp.status_code == 400
+
+
+def test_get_tickets_filters(client, login_user, register_user):
+    register_user("filteradmin", "filteradmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("filteradmin", "filteradmin@example.com", "adminpass")
+    user_token = login_user("filteruser", "filteruser@example.com", "userpass")
+
+    for priority in ("low", "high"):
+        resp = client.post("/tickets", json={
+            "title": f"Filter {priority}",
+            "description": "Description long enough",
+            "priority": priority
+        }, headers={"Authorization": f"Bearer {user_token}"})
+        assert resp.status_code == 201
+    owner_id = resp.get_json()["user_id"]
+
+    resp = client.get("/tickets?priority=high", headers={"Authorization": f"Bearer {user_token}"})
+    assert [t["priority"] for t in resp.get_json()] == ["high"]
+
+    resp = client.get(f"/tickets?user_id={owner_id}&status=open",
+                      headers={"Authorization": f"Bearer {admin_token}"})
+    tickets = resp.get_json()
+    assert len(tickets) == 2
+    assert all(int(t["user_id"]) == int(owner_id) for t in tickets)
+
+    resp = client.get("/tickets?created_after=2999-01-01T00:00:00",
+                      headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.get_json() == []
+
+    resp = client.get("/tickets?created_after=yesterday",
+                      headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.status_code == 400
+
+
+def test_get_tickets_conditional_requests(client, login_user, query_budget):
+    token = login_user()
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = client.post("/tickets", json={
+        "title": "Polled ticket", "description": "Watched by a polling client"
+    }, headers=headers)
+    ticket_id = resp.get_json()["id"]
+
+    resp = client.get("/tickets", headers=headers)
+    etag = resp.headers["ETag"]
+    last_modified = resp.headers["Last-Modified"]
+    assert etag.startswith('W/"')
+
+    # Unchanged: 304 with no body, answered by the aggregate alone
+    with query_budget(1):
+        resp = client.get("/tickets", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+    assert resp.headers["ETag"] == etag
+
+    resp = client.get("/tickets", headers={
+        **headers, "If-Modified-Since": last_modified})
+    assert resp.status_code == 304
+
+    # Other query parameters describe a different representation
+    resp = client.get("/tickets?status=open", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+
+    client.put(f"/tickets/{ticket_id}", json={"status": "closed"}, headers=headers)
+    resp = client.get("/tickets", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.get_json()[0]["status"] == "closed"
+    assert resp.headers["ETag"] != etag
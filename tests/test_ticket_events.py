@@ -0,0 +1,152 @@
+import json
+
+from app.commands import prune_events_command
+from app.models import TicketEvent
+
+
+def _events(text):
+    """Parse an SSE body into (id, event, data) tuples, skipping comments and retry."""
+    events = []
+    for block in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines()
+                      if line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _headers(token, **extra):
+    return {"Authorization": f"Bearer {token}", **extra}
+
+
+def _create(client, token, title):
+    resp = client.post("/tickets", json={
+        "title": title, "description": "Description long enough"
+    }, headers=_headers(token))
+    assert resp.status_code == 201
+    return resp.get_json()["id"]
+
+
+def test_ticket_changes_are_logged_and_replayed_from_last_event_id(
+        app, client, register_user, login_user):
+    app.config["TICKET_EVENTS_STREAM_SECONDS"] = 0
+    register_user("eventadmin", "eventadmin@example.com", "adminpass", role="admin")
+    admin = login_user("eventadmin", "eventadmin@example.com", "adminpass")
+    user = login_user()
+    other = login_user("otheruser", "other@example.com", "otherpass")
+
+    first = _create(client, user, "First ticket")
+    _create(client, other, "Someone else's")
+    client.put(f"/tickets/{first}", json={"status": "resolved"}, headers=_headers(user))
+    client.delete(f"/tickets/{first}", headers=_headers(admin))
+    assert [e.kind for e in TicketEvent.query.order_by(TicketEvent.seq)] == [
+        "created", "created", "updated", "deleted"]
+
+    resp = client.get("/tickets/events", headers=_headers(user, **{"Last-Event-ID": "0"}))
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    body = resp.get_data(as_text=True)
+    assert body.startswith("retry: ")
+    events = _events(body)
+    # Only the user's own ticket; tickets are sent as they are now
+    assert [(e, d["ticket_id"]) for _, e, d in events] == [
+        ("created", first), ("updated", first), ("deleted", first)]
+    assert all(d["ticket"] is None for _, _, d in events)
+
+    # Admins see everything; resuming skips what was already delivered
+    resp = client.get(f"/tickets/events?last_event_id={events[0][0]}", headers=_headers(admin))
+    assert [e for _, e, _ in _events(resp.get_data(as_text=True))] == [
+        "created", "updated", "deleted"]
+
+    # No Last-Event-ID: live events only
+    assert _events(client.get("/tickets/events", headers=_headers(admin)).get_data(as_text=True)) == []
+
+    app.config["TICKET_EVENTS_REPLAY_LIMIT"] = 2
+    resp = client.get("/tickets/events", headers=_headers(admin, **{"Last-Event-ID": "0"}))
+    assert [e for _, e, _ in _events(resp.get_data(as_text=True))] == ["reset"]
+
+    assert client.get("/tickets/events", headers=_headers(user, **{"Last-Event-ID": "x"})
+                      ).status_code == 400
+
+
+def test_live_events_are_pushed_to_open_streams(app, client, login_user):
+    app.config.update(TICKET_EVENTS_STREAM_SECONDS=5, TICKET_EVENTS_HEARTBEAT=0.05)
+    token = login_user()
+
+    resp = client.get("/tickets/events", headers=_headers(token), buffered=False)
+    chunks = resp.response
+    try:
+        assert next(chunks).startswith(b"retry: ")
+        ticket_id = _create(client, token, "Pushed ticket")
+
+        # The commit wakes this worker's broker; heartbeats may come first
+        for chunk in chunks:
+            if not chunk.startswith(b":"):
+                break
+        [(seq, kind, data)] = _events(chunk.decode())
+        assert kind == "created"
+        assert data["ticket"]["id"] == ticket_id
+        assert data["ticket"]["title"] == "Pushed ticket"
+    finally:
+        resp.close()
+
+    assert not app.extensions["ticket_broker"]._subscribers
+
+
+def test_changes_since_token_returns_changed_tickets_and_tombstones(
+        app, client, register_user, login_user):
+    register_user("syncadmin", "syncadmin@example.com", "adminpass", role="admin")
+    admin = login_user("syncadmin", "syncadmin@example.com", "adminpass")
+    user = login_user()
+    other = login_user("otheruser", "other@example.com", "otherpass")
+
+    kept = _create(client, user, "Kept ticket")
+    token = client.get("/tickets/changes", headers=_headers(user)).get_json()["next"]
+    resp = client.get(f"/tickets/changes?since={token}", headers=_headers(user))
+    assert resp.get_json() == {"changed": [], "deleted": [], "next": token, "has_more": False}
+
+    gone = _create(client, user, "Short-lived")
+    _create(client, other, "Not visible")
+    client.put(f"/tickets/{kept}", json={"status": "resolved"}, headers=_headers(user))
+    client.put(f"/tickets/{kept}", json={"priority": "high"}, headers=_headers(user))
+    client.delete(f"/tickets/{gone}", headers=_headers(admin))
+
+    body = client.get(f"/tickets/changes?since={token}", headers=_headers(user)).get_json()
+    assert [(t["id"], t["status"], t["priority"]) for t in body["changed"]] == [
+        (kept, "resolved", "high")]
+    assert body["deleted"] == [gone]
+    assert not body["has_more"]
+
+    # Paging by events; the last page's token is where the next sync starts
+    seen, deleted, since = set(), set(), token
+    while True:
+        page = client.get(f"/tickets/changes?since={since}&limit=2",
+                          headers=_headers(admin)).get_json()
+        seen |= {t["id"] for t in page["changed"]}
+        deleted |= set(page["deleted"])
+        since = page["next"]
+        if not page["has_more"]:
+            break
+    assert len(seen) == 2 and kept in seen and deleted == {gone}
+    assert client.get(f"/tickets/changes?since={since}", headers=_headers(admin)
+                      ).get_json()["changed"] == []
+
+    assert client.get("/tickets/changes?since=junk", headers=_headers(user)).status_code == 400
+
+
+def test_pruned_log_expires_old_tokens(app, client, login_user):
+    app.config["TICKET_EVENTS_STREAM_SECONDS"] = 0
+    token = login_user()
+    first = client.get("/tickets/changes", headers=_headers(token)).get_json()["next"]
+    for i in range(3):
+        _create(client, token, f"Ticket number {i}")
+
+    result = app.test_cli_runner().invoke(prune_events_command, ["--older-than-days", "-1"])
+    assert "Deleted 2 ticket events" in result.output
+    # The newest event stays, so expired positions are still recognized
+    assert TicketEvent.query.count() == 1
+
+    resp = client.get(f"/tickets/changes?since={first}", headers=_headers(token))
+    assert resp.status_code == 410
+    resp = client.get("/tickets/events", headers=_headers(token, **{"Last-Event-ID": "0"}))
+    assert [e for _, e, _ in _events(resp.get_data(as_text=True))] == ["reset"]
@@ -0,0 +1,83 @@
+from app.commands import rebuild_stats
+from app.extensions import db
+from app.models import TicketStat
+from app.models.ticket_stat import compute_ticket_stats, stored_ticket_stats
+
+
+def _create(client, token, priority):
+    resp = client.post("/tickets", json={
+        "title": f"Stats {priority}",
+        "description": "Description long enough",
+        "priority": priority
+    }, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+    return resp.get_json()["id"]
+
+
+def test_stats_follow_ticket_mutations(client, login_user, register_user):
+    register_user("statsadmin", "statsadmin@example.com", "adminpass", role="admin")
+    admin_token = login_user("statsadmin", "statsadmin@example.com", "adminpass")
+    user_token = login_user("statsuser", "statsuser@example.com", "userpass")
+
+    high_id = _create(client, user_token, "high")
+    _create(client, user_token, "low")
+    _create(client, admin_token, "low")
+
+    resp = client.get("/tickets/stats", headers={"Authorization": f"Bearer {user_token}"})
+    stats = resp.get_json()
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"open": 2}
+    assert stats["by_priority"] == {"high": 1, "low": 1}
+
+    client.put(f"/tickets/{high_id}", json={"status": "resolved"},
+               headers={"Authorization": f"Bearer {user_token}"})
+    stats = client.get("/tickets/stats", headers={"Authorization": f"Bearer {user_token}"}).get_json()
+    assert stats["by_status_priority"] == {"open": {"low": 1}, "resolved": {"high": 1}}
+
+    client.delete(f"/tickets/{high_id}", headers={"Authorization": f"Bearer {admin_token}"})
+    stats = client.get("/tickets/stats", headers={"Authorization": f"Bearer {admin_token}"}).get_json()
+    assert stats["user_id"] is None
+    assert stats["total"] == 2
+    assert stats["by_priority"] == {"low": 2}
+
+    assert stored_ticket_stats(db.session) == compute_ticket_stats(db.session)
+
+
+def test_rebuild_stats_command(app, client, login_user):
+    token = login_user()
+    _create(client, token, "medium")
+
+    # Simulate drift, e.g. from a manual SQL fix
+    db.session.execute(TicketStat.__table__.update().values(count=TicketStat.count + 5))
+    db.session.commit()
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(rebuild_stats, ["--check"])
+    assert result.exit_code == 1
+    assert "out of date" in result.output
+
+    result = runner.invoke(rebuild_stats)
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(rebuild_stats, ["--check"])
+    assert result.exit_code == 0
+    assert stored_ticket_stats(db.session) == compute_ticket_stats(db.session)
+
+
+def test_stats_follow_changes_to_unloaded_tickets(app, client, login_user):
+    from app.models import Ticket
+
+    _create(client, login_user(), "low")
+    ticket_id = Ticket.query.one().id
+    # Expired attributes: the old values are only in the database
+    ticket = db.session.get(Ticket, ticket_id)
+    db.session.expire(ticket)
+    ticket.status = "resolved"
+    ticket.priority = "high"
+    db.session.commit()
+    assert stored_ticket_stats(db.session) == compute_ticket_stats(db.session)
+
+    db.session.expire(ticket)
+    db.session.delete(ticket)
+    db.session.commit()
+    assert stored_ticket_stats(db.session) == {}